@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+#===============================================================================
+# Domain Generation Benchmark
+#
+# Times every phase of create-domain.sh on synthetic configurations, from
+# 1 to 500 managed servers across 1 to 50 hosts, in MANUAL and AUTO mode.
+# Each run gets its own workspace with a copy of create-domain.sh and the
+# templates, a fake middleware home whose wlst.sh is the offline WLST stub
+# (wlst_stub.py) and a scratch domain home, so the whole script runs,
+# WLST phase included, without WebLogic. The phase times come from
+# create-domain.sh --timings.
+#
+# Results are written as JSON. Given an earlier result file as --baseline,
+# every phase is compared with it and the script exits 1 on a regression.
+# Every phase is also checked for growing faster than linearly with the
+# server count across the sweep (--max-exponent), which exits 1 as well.
+#
+# Usage: python3 benchmarks/benchmark_generation.py
+#        python3 benchmarks/benchmark_generation.py --output before.json
+#        python3 benchmarks/benchmark_generation.py --baseline before.json --output after.json
+#        python3 benchmarks/benchmark_generation.py --servers 100,500 --hosts 10,50 --grid --repeat 3
+#===============================================================================
+
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DOMAIN_DIR = os.path.dirname(BENCH_DIR)
+WLST_STUB = os.path.join(BENCH_DIR, 'wlst_stub.py')
+
+# Default cases: SERVERS[i] servers on HOSTS[i] hosts (--grid for every pair)
+SERVERS = [1, 10, 50, 100, 250, 500]
+HOSTS = [1, 2, 5, 10, 25, 50]
+MODES = ['manual', 'auto']
+CLUSTERS = 2
+REPEAT = 1
+
+# Baseline comparison
+REGRESSION_FACTOR = 1.25        # current/baseline median ratio flagged as a regression
+REGRESSION_MIN_SECONDS = 0.05   # ignore regressions smaller than this in absolute terms
+
+# Scaling check: time ~ servers ** exponent between server counts of a sweep
+SCALING_MAX_EXPONENT = 1.25     # 1.0 is linear; 2.0 is quadratic
+SCALING_MIN_RATIO = 8           # compare counts at least this far apart (noise)
+
+# Phases shown in the console table (all phases are in the JSON)
+DISPLAY_PHASES = [
+    ('load_config_file', 'load'),
+    ('generate_auto_servers', 'auto'),
+    ('compile_config_model', 'model'),
+    ('validate_configuration', 'validate'),
+    ('set_template_vars', 'vars'),
+    ('generate_wlst_script', 'wlst.py'),
+    ('render_templates', 'render'),
+    ('create_domain', 'wlst'),
+    ('create_boot_properties', 'boot'),
+    ('generate_phase1_config', 'phase1'),
+    ('total', 'total'),
+]
+
+
+def synthetic_config(case, workspace):
+    """A .conf for the case with all paths inside the workspace"""
+    servers, hosts, clusters = case['servers'], case['hosts'], case['clusters']
+    lines = [
+        '# Synthetic benchmark configuration: %s' % case['name'],
+        '[DOMAIN]',
+        'DOMAIN_NAME=bench_domain',
+        'DOMAIN_HOME=%s/domains/bench_domain' % workspace,
+        'ADMIN_SERVER_NAME=AdminServer',
+        'ADMIN_PORT=7001',
+        'ADMIN_USER=weblogic',
+        'ADMIN_PASSWORD=benchmark1',
+        'PRODUCTION_MODE=false',
+        'JAVA_HOME=%s/jdk' % workspace,
+        'WEBLOGIC_HOME=%s/mw/wlserver' % workspace,
+        'MIDDLEWARE_HOME=%s/mw' % workspace,
+        '',
+        '[ADMIN_SERVER]',
+        'LISTEN_ADDRESS=0.0.0.0',
+        'LISTEN_PORT=7001',
+        '',
+        '[CLUSTERS]',
+        'ENABLED=%s' % (clusters and 'true' or 'false'),
+        'CLUSTER_COUNT=%d' % clusters,
+    ]
+    for c in range(1, clusters + 1):
+        lines += [
+            'CLUSTER%d_NAME=Cluster%d' % (c, c),
+            'CLUSTER%d_MESSAGING_MODE=unicast' % c,
+            'CLUSTER%d_CLUSTER_ADDRESS=AUTO' % c,
+        ]
+        if case['replication']:
+            # Listen ports stay below 8501, so channels at +1000 never collide
+            lines += [
+                'CLUSTER%d_SESSION_REPLICATION=true' % c,
+                'CLUSTER%d_REPLICATION_CHANNEL=ReplicationChannel' % c,
+                'CLUSTER%d_REPLICATION_PORT_OFFSET=1000' % c,
+            ]
+
+    lines += ['', '[HOSTS]', 'HOST_COUNT=%d' % hosts]
+    lines += ['HOST%d=bench%02d' % (h, h) for h in range(1, hosts + 1)]
+    lines += ['', '[MACHINES]']
+    lines += ['MACHINE%d=machine-bench%02d:bench%02d:5556' % (h, h, h) for h in range(1, hosts + 1)]
+
+    lines += ['', '[MANAGED_SERVERS]']
+    if case['mode'] == 'auto':
+        lines += [
+            'MODE=AUTO',
+            'AUTO_SERVER_COUNT=%d' % servers,
+            'AUTO_SERVER_PREFIX=ms',
+            'AUTO_SERVER_SUFFIX_STYLE=NUMBER',
+            'AUTO_SERVER_START_PORT=8001',
+            'AUTO_PORT_INCREMENT=1',
+            'AUTO_DISTRIBUTE_ACROSS_MACHINES=true',
+            'AUTO_CLUSTER_ASSIGNMENT=%s' % (clusters and 'ROUND_ROBIN' or 'NONE'),
+        ]
+    else:
+        lines += ['MODE=MANUAL', 'SERVER_COUNT=%d' % servers]
+        for s in range(1, servers + 1):
+            machine = 'machine-bench%02d' % ((s - 1) % hosts + 1)
+            server = 'SERVER%d=ms%d:%d:%s' % (s, s, 8001 + (s - 1) // hosts, machine)
+            if clusters:
+                server += ':Cluster%d' % ((s - 1) % clusters + 1)
+            lines.append(server)
+
+    lines += [
+        '',
+        '[NODEMANAGER]',
+        'TYPE=PLAIN',
+        'LISTEN_ADDRESS=0.0.0.0',
+        'LISTEN_PORT=5556',
+        '',
+        '[OPTIONS]',
+        'CREATE_BOOT_PROPERTIES=true',
+        'GENERATE_AUTOSTART_CONFIG=true',
+        'DOMAIN_CACHE=false',
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+def write_file(path, content, mode=0o644):
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    with open(path, 'w') as f:
+        f.write(content)
+    os.chmod(path, mode)
+
+
+def prepare_workspace(case, workspace):
+    """Copy the generator into the workspace and fake the installation it checks"""
+    shutil.copy(os.path.join(DOMAIN_DIR, 'create-domain.sh'), workspace)
+    shutil.copytree(os.path.join(DOMAIN_DIR, 'templates'), os.path.join(workspace, 'templates'))
+
+    write_file(os.path.join(workspace, 'mw/oracle_common/common/bin/wlst.sh'),
+               '#!/bin/sh\nexec "%s" "%s" "$@"\n' % (sys.executable, WLST_STUB), 0o755)
+    write_file(os.path.join(workspace, 'mw/wlserver/common/templates/wls/wls.jar'), '')
+    write_file(os.path.join(workspace, 'jdk/bin/java'),
+               '#!/bin/sh\necho \'java version "11" (benchmark stub)\' >&2\n', 0o755)
+    os.makedirs(os.path.join(workspace, 'domains'))
+
+    config_file = os.path.join(workspace, 'bench.conf')
+    write_file(config_file, synthetic_config(case, workspace))
+    return config_file
+
+
+def read_timings(path):
+    """{phase: (seconds, exit code)} from a --timings file"""
+    timings = {}
+    if not os.path.exists(path):
+        return timings
+    with open(path) as f:
+        for line in f:
+            fields = line.rstrip('\n').split('\t')
+            if len(fields) == 3:
+                timings[fields[0]] = (float(fields[1]), int(fields[2]))
+    return timings
+
+
+def check_wlst(case, wlst):
+    """Differences between the WLST calls and the configuration, as messages"""
+    creates = wlst.get('creates', {})
+    expected = [
+        ('Server', case['servers']),
+        ('UnixMachine', case['hosts']),
+        ('Cluster', case['clusters']),
+    ]
+    if case['clusters'] and case['replication']:
+        expected.append(('NetworkAccessPoint', case['servers']))
+    return ['WLST created %d %s, expected %d' % (creates.get(bean_type, 0), bean_type, count)
+            for bean_type, count in expected if creates.get(bean_type, 0) != count]
+
+
+def run_case(case, keep_dir=None):
+    """One run of create-domain.sh; returns the phase timings and WLST summary"""
+    workspace = tempfile.mkdtemp(prefix='domain-bench-', dir=keep_dir)
+    try:
+        config_file = prepare_workspace(case, workspace)
+        timings_file = os.path.join(workspace, 'timings.tsv')
+        env = dict(os.environ, WLS_ADMIN_PASSWORD='benchmark1',
+                   WLST_STUB_RECORD=os.path.join(workspace, 'wlst.json'))
+        env.pop('PHASE_TIMINGS_FILE', None)
+
+        started = time.time()
+        with open(os.path.join(workspace, 'output.log'), 'w') as output:
+            exit_code = subprocess.call(['bash', os.path.join(workspace, 'create-domain.sh'),
+                                         '--config', config_file, '--timings', timings_file],
+                                        cwd=workspace, env=env, stdin=subprocess.DEVNULL,
+                                        stdout=output, stderr=subprocess.STDOUT)
+        process_seconds = time.time() - started
+
+        wlst = {}
+        if os.path.exists(env['WLST_STUB_RECORD']):
+            with open(env['WLST_STUB_RECORD']) as f:
+                wlst = json.load(f)
+
+        errors = []
+        if exit_code != 0:
+            errors.append('create-domain.sh exited %d (see %s/output.log)' % (exit_code, workspace))
+        elif wlst:
+            errors += check_wlst(case, wlst)
+        else:
+            errors.append('WLST stub was not run')
+
+        return {
+            'exit': exit_code,
+            'process': process_seconds,
+            'timings': read_timings(timings_file),
+            'wlst': wlst,
+            'errors': errors,
+        }
+    finally:
+        if keep_dir is None:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+
+def benchmark_case(case, repeat, keep_dir=None):
+    """Run a case repeat times; phase seconds are the median over the runs"""
+    runs = [run_case(case, keep_dir) for _ in range(repeat)]
+
+    phases = {}
+    for phase in sorted(set(phase for run in runs for phase in run['timings'])):
+        seconds = [run['timings'][phase][0] for run in runs if phase in run['timings']]
+        phases[phase] = {
+            'median': round(statistics.median(seconds), 6),
+            'min': round(min(seconds), 6),
+            'runs': [round(value, 6) for value in seconds],
+            'exit': max(run['timings'][phase][1] for run in runs if phase in run['timings']),
+        }
+    phases['process'] = {
+        'median': round(statistics.median(run['process'] for run in runs), 6),
+        'min': round(min(run['process'] for run in runs), 6),
+        'runs': [round(run['process'], 6) for run in runs],
+        'exit': max(run['exit'] for run in runs),
+    }
+
+    wlst = runs[-1]['wlst']
+    result = dict(case)
+    result.update({
+        'exit': max(run['exit'] for run in runs),
+        'phases': phases,
+        'wlst': {
+            'create_calls': wlst.get('create_calls'),
+            'set_calls': wlst.get('set_calls'),
+            'creates': wlst.get('creates', {}),
+            'seconds': wlst.get('seconds'),
+        },
+        'errors': sorted(set(error for run in runs for error in run['errors'])),
+    })
+    return result
+
+
+def build_cases(options):
+    if options.grid:
+        pairs = [(s, h) for s in options.servers for h in options.hosts if h <= s]
+    elif len(options.servers) != len(options.hosts):
+        raise SystemExit('--servers and --hosts need the same number of values (or --grid)')
+    else:
+        pairs = list(zip(options.servers, options.hosts))
+
+    cases = []
+    for mode in options.modes:
+        for servers, hosts in pairs:
+            clusters = min(options.clusters, servers)
+            cases.append({
+                'name': '%s-%ds-%dh' % (mode, servers, hosts),
+                'mode': mode,
+                'servers': servers,
+                'hosts': hosts,
+                'clusters': clusters,
+                'replication': bool(clusters) and options.replication,
+                'grid': options.grid,
+            })
+    return cases
+
+
+def compare(results, baseline, factor, min_seconds):
+    """One row per case and phase found in both result sets"""
+    previous = dict((case['name'], case) for case in baseline.get('cases', []))
+    rows = []
+    for case in results:
+        if case['name'] not in previous:
+            continue
+        before = previous[case['name']]['phases']
+        for phase, current in sorted(case['phases'].items()):
+            if phase not in before:
+                continue
+            base, latest = before[phase]['median'], current['median']
+            rows.append({
+                'case': case['name'],
+                'phase': phase,
+                'baseline': base,
+                'current': latest,
+                'change': base > 0 and latest / base or None,
+                'regression': latest >= base * factor and latest - base >= min_seconds,
+            })
+    return rows
+
+
+def scaling(results, max_exponent, min_seconds):
+    """One row per phase and step of each sweep.
+
+    A sweep is the cases of one mode (and, with --grid, one host count). For
+    each phase, a case is compared with the largest case that has at most
+    1/SCALING_MIN_RATIO of its servers and took at least min_seconds in that
+    phase, so run-to-run noise and start-up cost are small next to the
+    growth. The exponent is log(time ratio) / log(server ratio): about 1 for
+    a linear phase, about 2 for a quadratic one.
+    """
+    sweeps = {}
+    for case in results:
+        if case['errors']:
+            continue
+        sweeps.setdefault((case['mode'], case['hosts'] if case.get('grid') else None), []).append(case)
+
+    rows = []
+    for (mode, hosts), cases in sorted(sweeps.items(), key=lambda item: (item[0][0], item[0][1] or 0)):
+        cases.sort(key=lambda case: case['servers'])
+        for larger in cases:
+            for phase, current in sorted(larger['phases'].items()):
+                smaller = [case for case in cases
+                           if case['servers'] * SCALING_MIN_RATIO <= larger['servers']
+                           and case['phases'].get(phase, {}).get('median', 0) >= min_seconds]
+                if not smaller or current['median'] <= 0:
+                    continue
+                smaller = smaller[-1]
+                before, after = smaller['phases'][phase]['median'], current['median']
+                exponent = math.log(after / before) / math.log(float(larger['servers']) / smaller['servers'])
+                rows.append({
+                    'sweep': hosts and '%s-%dh' % (mode, hosts) or mode,
+                    'phase': phase,
+                    'from_servers': smaller['servers'],
+                    'to_servers': larger['servers'],
+                    'from_seconds': before,
+                    'to_seconds': after,
+                    'exponent': round(exponent, 3),
+                    'superlinear': exponent > max_exponent,
+                })
+    return rows
+
+
+def print_results(results):
+    print('%-22s %7s %7s' % ('Case', 'create', 'set') +
+          ''.join(' %9s' % heading for phase, heading in DISPLAY_PHASES))
+    for case in results:
+        cells = []
+        for phase, heading in DISPLAY_PHASES:
+            timing = case['phases'].get(phase)
+            cells.append(timing and '%9.3f' % timing['median'] or '%9s' % '-')
+        print('%-22s %7s %7s %s' % (case['name'], case['wlst']['create_calls'], case['wlst']['set_calls'],
+                                    ' '.join(cells)))
+        for error in case['errors']:
+            print('  ERROR: ' + error)
+
+
+def print_comparison(rows, options):
+    regressions = [row for row in rows if row['regression']]
+    print('')
+    if not rows:
+        print('No cases in common with the baseline')
+        return
+    for row in regressions:
+        print('REGRESSION %-22s %-24s %9.3fs -> %9.3fs (%+.0f%%)'
+              % (row['case'], row['phase'], row['baseline'], row['current'], (row['change'] - 1) * 100))
+    totals = [row for row in rows if row['phase'] == 'total' and row['change']]
+    if totals:
+        print('Total time against the baseline: %s'
+              % ', '.join('%s %+.0f%%' % (row['case'], (row['change'] - 1) * 100) for row in totals))
+    print('%d regression(s) (threshold %.2fx and %.3fs)' % (len(regressions), options.factor,
+                                                            options.min_seconds))
+
+
+def print_scaling(rows, options):
+    superlinear = [row for row in rows if row['superlinear']]
+    print('')
+    for row in superlinear:
+        print('SUPERLINEAR %-12s %-24s %4d -> %4d servers: %9.3fs -> %9.3fs (exponent %.2f)'
+              % (row['sweep'], row['phase'], row['from_servers'], row['to_servers'],
+                 row['from_seconds'], row['to_seconds'], row['exponent']))
+    print('%d phase(s) growing faster than linearly (exponent above %.2f over at least %dx the servers)'
+          % (len(superlinear), options.max_exponent, SCALING_MIN_RATIO))
+
+
+def number_list(text):
+    return [int(value) for value in text.split(',') if value.strip()]
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Benchmark the phases of create-domain.sh')
+    parser.add_argument('--servers', type=number_list, default=SERVERS,
+                        help='managed server counts (default %s)' % ','.join(map(str, SERVERS)))
+    parser.add_argument('--hosts', type=number_list, default=HOSTS,
+                        help='host counts, paired with --servers (default %s)' % ','.join(map(str, HOSTS)))
+    parser.add_argument('--grid', action='store_true', help='every server count with every host count')
+    parser.add_argument('--modes', type=lambda text: text.split(','), default=MODES,
+                        help='manual, auto or both (default manual,auto)')
+    parser.add_argument('--clusters', type=int, default=CLUSTERS, help='clusters (0 disables clustering)')
+    parser.add_argument('--no-replication', dest='replication', action='store_false',
+                        help='no session replication in the clusters')
+    parser.add_argument('--repeat', type=int, default=REPEAT, help='runs per case (median is reported)')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='compare with an earlier --output file')
+    parser.add_argument('--factor', type=float, default=REGRESSION_FACTOR,
+                        help='current/baseline ratio flagged as a regression')
+    parser.add_argument('--min-seconds', type=float, default=REGRESSION_MIN_SECONDS,
+                        help='smallest absolute slowdown flagged, and the shortest reference time of '
+                             'the scaling check')
+    parser.add_argument('--max-exponent', type=float, default=SCALING_MAX_EXPONENT,
+                        help='growth exponent in the server count above which a phase fails '
+                             '(default %.2f, 1.0 is linear)' % SCALING_MAX_EXPONENT)
+    parser.add_argument('--keep', metavar='DIR', help='keep each run\'s workspace under DIR')
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    options = parser.parse_args(argv)
+
+    for mode in options.modes:
+        if mode not in MODES:
+            parser.error('unknown mode: ' + mode)
+    if options.keep and not os.path.isdir(options.keep):
+        os.makedirs(options.keep)
+
+    cases = build_cases(options)
+    results = []
+    for case in cases:
+        if not options.json:
+            print('Running %s ...' % case['name'], file=sys.stderr)
+        results.append(benchmark_case(case, max(1, options.repeat), options.keep))
+
+    document = {
+        'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'host': socket.gethostname(),
+        'platform': platform.platform(),
+        'bash': subprocess.check_output(['bash', '-c', 'echo ${BASH_VERSION}']).decode().strip(),
+        'repeat': max(1, options.repeat),
+        'cases': results,
+    }
+
+    steps = scaling(results, options.max_exponent, options.min_seconds)
+    document['scaling'] = {'max_exponent': options.max_exponent, 'min_seconds': options.min_seconds,
+                           'steps': steps}
+
+    rows = []
+    if options.baseline:
+        with open(options.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline, options.factor, options.min_seconds)
+        document['baseline'] = {'file': os.path.abspath(options.baseline), 'generated': baseline.get('generated'),
+                                'factor': options.factor, 'min_seconds': options.min_seconds,
+                                'comparison': rows}
+
+    if options.output:
+        with open(options.output, 'w') as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    if options.json:
+        print(json.dumps(document, indent=2, sort_keys=True))
+    else:
+        print_results(results)
+        if steps:
+            print_scaling(steps, options)
+        if options.baseline:
+            print_comparison(rows, options)
+        if options.output:
+            print('')
+            print('Results: ' + options.output)
+
+    failed = [case for case in results if case['errors']]
+    if failed or [row for row in rows if row['regression']] or [row for row in steps if row['superlinear']]:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+#===============================================================================
+# Offline WLST Stub
+#
+# Runs a generated create-domain.py without WebLogic: readTemplate, cd,
+# create, set, getMBean, setOption and writeDomain work on an in-memory
+# MBean tree and every create() and set() call is recorded. The benchmark
+# installs it as the wlst.sh of a fake middleware home, so create-domain.sh
+# runs its real WLST phase against it.
+#
+# Usage: python3 wlst_stub.py create-domain.py
+#        WLST_STUB_RECORD=calls.json python3 wlst_stub.py create-domain.py
+#
+# The record (JSON) holds the call counts by MBean type and attribute, the
+# calls themselves, the script's exit code and its run time. Without
+# WLST_STUB_RECORD a summary is printed instead.
+#===============================================================================
+
+import json
+import os
+import re
+import sys
+import time
+
+# Generated scripts are Jython 2.7; this is their only Python 2 syntax
+PY2_EXCEPT = re.compile(r'^(\s*except\s+[\w.]+)\s*,\s*(\w+)\s*:', re.MULTILINE)
+
+
+# Types created under the directory of their base type
+DIRECTORIES = {'UnixMachine': 'Machine'}
+
+
+class WLSTException(Exception):
+    pass
+
+
+class MBean(object):
+    """One node of the offline tree: /Type/Name/Type/Name..."""
+
+    def __init__(self, name, bean_type, parent=None):
+        self.name = name
+        self.type = bean_type
+        self.parent = parent
+        self.attributes = {}
+        self.children = {}  # type -> {name: MBean}
+
+    def path(self):
+        if self.parent is None:
+            return '/'
+        parent = self.parent.path().rstrip('/')
+        return parent + '/' + self.type + '/' + self.name
+
+    def __repr__(self):
+        return '[MBean ' + self.path() + ']'
+
+
+class OfflineWLST(object):
+    """The WLST offline commands used by the domain scripts"""
+
+    def __init__(self):
+        self.root = None
+        self.cwd = None
+        self.options = {}
+        self.calls = []
+        self.creates = {}
+        self.sets = {}
+        self.written = None
+
+    # -- tree ----------------------------------------------------------------
+
+    def require_template(self):
+        if self.root is None:
+            raise WLSTException('No domain or domain template has been read.')
+
+    def resolve(self, path):
+        """(bean, type): the bean at path, with the type when path ends in a type directory"""
+        self.require_template()
+        node, bean_type = (self.root, None) if path.startswith('/') else self.cwd
+        for part in [part for part in path.split('/') if part and part != '.']:
+            if part == '..':
+                if bean_type is not None:
+                    bean_type = None
+                elif node.parent is not None:
+                    node, bean_type = node.parent, node.type
+            elif bean_type is None:
+                if part not in node.children:
+                    raise WLSTException('No such directory: ' + path)
+                bean_type = part
+            else:
+                if part not in node.children[bean_type]:
+                    raise WLSTException('No such directory: ' + path)
+                node, bean_type = node.children[bean_type][part], None
+        return node, bean_type
+
+    def _child(self, parent, bean_type, name):
+        bean = MBean(name, bean_type, parent)
+        parent.children.setdefault(bean_type, {})[name] = bean
+        return bean
+
+    def current(self):
+        """The bean of the current directory (not a type directory)"""
+        self.require_template()
+        node, bean_type = self.cwd
+        if bean_type is not None:
+            raise WLSTException('Not an MBean directory: ' + node.path() + '/' + bean_type)
+        return node
+
+    def readTemplate(self, template):
+        if not os.path.exists(template):
+            raise WLSTException('Template not found: ' + template)
+        self.root = MBean('base_domain', 'Domain')
+        self.cwd = (self.root, None)
+        self._child(self.root, 'Server', 'AdminServer')
+        security = self._child(self.root, 'Security', 'base_domain')
+        self._child(security, 'User', 'weblogic')
+        self.calls.append(['readTemplate', template])
+        return self.root
+
+    def cd(self, path):
+        self.cwd = self.resolve(path)
+        return self.cwd[0]
+
+    def create(self, name, bean_type):
+        node = self.current()
+        directory = DIRECTORIES.get(bean_type, bean_type)
+        if name in node.children.get(directory, {}):
+            raise WLSTException(bean_type + ' ' + name + ' already exists in ' + node.path())
+        self.creates[bean_type] = self.creates.get(bean_type, 0) + 1
+        self.calls.append(['create', node.path(), bean_type, name])
+        return self._child(node, directory, name)
+
+    def set(self, attribute, value):
+        node = self.current()
+        recorded = isinstance(value, MBean) and value.path() or value
+        self.sets[attribute] = self.sets.get(attribute, 0) + 1
+        self.calls.append(['set', node.path(), attribute, recorded])
+        if attribute == 'Name' and node.parent is not None:
+            # Renaming moves the bean, as in WLST
+            siblings = node.parent.children[node.type]
+            del siblings[node.name]
+            siblings[value] = node
+            node.name = value
+        node.attributes[attribute] = value
+
+    def get(self, attribute):
+        return self.current().attributes.get(attribute)
+
+    def getMBean(self, path):
+        try:
+            node, bean_type = self.resolve(path)
+        except WLSTException:
+            return None
+        return bean_type is None and node or None
+
+    def ls(self, path='', returnMap='false'):
+        node, bean_type = path and self.resolve(path) or self.cwd
+        if bean_type is None:
+            names = sorted(node.children)
+        else:
+            names = sorted(node.children[bean_type])
+        if returnMap == 'true':
+            return dict((name, None) for name in names)
+        for name in names:
+            print('dr--   ' + name)
+
+    def setOption(self, option, value):
+        self.options[option] = value
+        self.calls.append(['setOption', option, value])
+
+    def writeDomain(self, domain_home):
+        self.require_template()
+        if os.path.isdir(domain_home) and self.options.get('OverwriteDomain') != 'true':
+            raise WLSTException('Domain directory exists: ' + domain_home)
+        os.makedirs(domain_home, exist_ok=True)
+        self.written = domain_home
+        self.calls.append(['writeDomain', domain_home])
+
+    def closeTemplate(self):
+        self.require_template()
+        self.root = None
+        self.cwd = None
+        self.calls.append(['closeTemplate'])
+
+    def namespace(self):
+        commands = {}
+        for name in ('readTemplate', 'cd', 'create', 'set', 'get', 'getMBean', 'ls', 'setOption',
+                     'writeDomain', 'closeTemplate'):
+            commands[name] = getattr(self, name)
+        commands['WLSTException'] = WLSTException
+        return commands
+
+
+def run_script(script, argv):
+    """Execute a WLST script against the stub; returns (exit code, stub)"""
+    with open(script) as f:
+        source = PY2_EXCEPT.sub(r'\1 as \2:', f.read())
+
+    wlst = OfflineWLST()
+    namespace = {'__name__': '__main__', '__file__': script}
+    namespace.update(wlst.namespace())
+    sys.argv = [script] + list(argv)
+    try:
+        exec(compile(source, script, 'exec'), namespace)
+        status = 0
+    except SystemExit as e:
+        if e.code is None:
+            status = 0
+        elif isinstance(e.code, int):
+            status = e.code
+        else:
+            print(e.code)
+            status = 1
+    return status, wlst
+
+
+def main(argv):
+    if not argv:
+        print('Usage: wlst_stub.py script.py [argument ...]')
+        return 1
+
+    started = time.time()
+    status, wlst = run_script(argv[0], argv[1:])
+    record = {
+        'script': os.path.abspath(argv[0]),
+        'exit': status,
+        'seconds': round(time.time() - started, 6),
+        'domain_home': wlst.written,
+        'creates': wlst.creates,
+        'sets': wlst.sets,
+        'create_calls': sum(wlst.creates.values()),
+        'set_calls': sum(wlst.sets.values()),
+        'calls': wlst.calls
+    }
+
+    record_file = os.environ.get('WLST_STUB_RECORD')
+    if record_file:
+        with open(record_file, 'w') as f:
+            json.dump(record, f, indent=1, sort_keys=True)
+    else:
+        print('')
+        print('WLST stub: %d create() and %d set() calls, exit %d'
+              % (record['create_calls'], record['set_calls'], status))
+        for bean_type in sorted(wlst.creates):
+            print('  create %-28s %d' % (bean_type, wlst.creates[bean_type]))
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -42,9 +42,14 @@ VALIDATE_ONLY=false
 SKIP_VALIDATION=false
 DRY_RUN=false
 
+# Phase timings (--timings FILE or PHASE_TIMINGS_FILE)
+TIMINGS_FILE="${PHASE_TIMINGS_FILE:-}"
+NOW_US=0
+
 # Override values (from command line)
 OVERRIDE_DOMAIN_NAME=""
 OVERRIDE_ADMIN_PASSWORD=""
+declare -a UNPACK_TARGETS=()
 
 # Color codes for output
 RED='\033[0;31m'
@@ -106,6 +111,46 @@ log_section() {
     echo -e "${BLUE}========================================${NC}" | tee -a "${LOG_FILE}"
 }
 
+#===============================================================================
+# PHASE TIMINGS
+#===============================================================================
+
+# Wall clock in microseconds in NOW_US (EPOCHREALTIME needs bash 5)
+now_us() {
+    if [[ -n "${EPOCHREALTIME:-}" ]]; then
+        NOW_US=$((10#${EPOCHREALTIME/[.,]/}))
+    else
+        NOW_US=$(( $(date +%s%N) / 1000 ))
+    fi
+}
+
+# Append "phase<TAB>seconds<TAB>exit code" to TIMINGS_FILE
+record_timing() {
+    local phase="$1" started="$2" status="$3"
+    now_us
+    local elapsed=$((NOW_US - started))
+    printf '%s\t%d.%06d\t%d\n' "${phase}" $((elapsed / 1000000)) $((elapsed % 1000000)) "${status}" \
+        >> "${TIMINGS_FILE}"
+}
+
+# Run a phase in this shell (its globals are kept) and record its time.
+# Arguments: phase command [argument ...]
+timed() {
+    local phase="$1"
+    shift
+    if [[ -z "${TIMINGS_FILE}" ]]; then
+        "$@"
+        return
+    fi
+    
+    now_us
+    local started=${NOW_US}
+    "$@"
+    local status=$?
+    record_timing "${phase}" "${started}" "${status}"
+    return ${status}
+}
+
 #===============================================================================
 # USAGE AND HELP
 #===============================================================================
@@ -126,11 +171,16 @@ OPTIONS:
     --validate-only         Validate configuration without creating domain
     --skip-validation       Skip pre-flight validation checks
     --dry-run               Show what would be done without executing
+    --no-cache              Ignore cached configuration models and domain templates
+    --unpack-to TARGET      Unpack the managed server template to host[:domain_home]
+                            or to a local directory (repeatable)
+    --timings FILE          Write the wall time of every phase to FILE
     --verbose               Enable verbose output
     --help                  Show this help message
 
 ENVIRONMENT VARIABLES:
     WLS_ADMIN_PASSWORD      WebLogic admin password (preferred over config file)
+    PHASE_TIMINGS_FILE      Same as --timings
 
 EXAMPLES:
     # Create domain from configuration file
@@ -145,6 +195,9 @@ EXAMPLES:
     # Dry run to see what would happen
     ${SCRIPT_NAME} --config configs/two-host.conf --dry-run
 
+    # Create the domain and provision the second host from the packed template
+    ${SCRIPT_NAME} --config configs/two-host.conf --unpack-to weblogic02
+
 EXIT CODES:
     0 - Success
     1 - General error
@@ -237,6 +290,178 @@ apply_overrides() {
     fi
 }
 
+#===============================================================================
+# CONFIGURATION MODEL
+#===============================================================================
+
+# Hosts, machines, clusters and servers parsed once from CONFIG, so later
+# stages index arrays instead of forking get_config and re-splitting the
+# colon-separated MACHINE<N>/SERVER<N> strings. Element i of each array
+# belongs to HOST<i+1>, MACHINE<i+1>, CLUSTER<i+1> or SERVER<i+1>.
+MODEL_HASH=""
+MODEL_CACHE_DIR="${GENERATED_DIR}/cache"
+USE_CACHE=true
+declare -a MODEL_HOSTS=()
+declare -a MODEL_MACHINE_NAMES=() MODEL_MACHINE_HOSTS=() MODEL_MACHINE_PORTS=()
+declare -a MODEL_CLUSTER_NAMES=()
+declare -a MODEL_SERVER_NAMES=() MODEL_SERVER_PORTS=() MODEL_SERVER_MACHINES=() MODEL_SERVER_CLUSTERS=()
+declare -A MODEL_MACHINE_HOST=()      # machine name -> hostname
+declare -A MODEL_CLUSTER_PREFIX=()    # cluster name -> CLUSTERS_CLUSTER<N> config prefix
+MODEL_DYNAMIC_CLUSTER=""              # cluster whose servers come from a server template
+
+compile_config_model() {
+    local host_count="${CONFIG[HOSTS_HOST_COUNT]:-1}"
+    local cluster_count="${CONFIG[CLUSTERS_CLUSTER_COUNT]:-0}"
+    local server_count="${CONFIG[MANAGED_SERVERS_SERVER_COUNT]:-0}"
+    local name host port machine cluster
+
+    MODEL_HOSTS=() MODEL_MACHINE_NAMES=() MODEL_MACHINE_HOSTS=() MODEL_MACHINE_PORTS=()
+    MODEL_CLUSTER_NAMES=() MODEL_SERVER_NAMES=() MODEL_SERVER_PORTS=()
+    MODEL_SERVER_MACHINES=() MODEL_SERVER_CLUSTERS=() MODEL_MACHINE_HOST=() MODEL_CLUSTER_PREFIX=()
+    MODEL_DYNAMIC_CLUSTER=""
+    if [[ "${CONFIG[MANAGED_SERVERS_MODE]}" == "AUTO" && "${CONFIG[MANAGED_SERVERS_AUTO_DYNAMIC_CLUSTER]}" == "true" ]]; then
+        MODEL_DYNAMIC_CLUSTER="${CONFIG[MANAGED_SERVERS_AUTO_CLUSTER_NAME]}"
+    fi
+
+    for ((i=1; i<=host_count; i++)); do
+        MODEL_HOSTS+=("${CONFIG[HOSTS_HOST${i}]}")
+        IFS=':' read -r name host port <<< "${CONFIG[MACHINES_MACHINE${i}]}"
+        MODEL_MACHINE_NAMES+=("${name}")
+        MODEL_MACHINE_HOSTS+=("${host}")
+        MODEL_MACHINE_PORTS+=("${port:-5556}")
+        [[ -n "${name}" ]] && MODEL_MACHINE_HOST["${name}"]="${host}"
+    done
+
+    for ((i=1; i<=cluster_count; i++)); do
+        name="${CONFIG[CLUSTERS_CLUSTER${i}_NAME]}"
+        MODEL_CLUSTER_NAMES+=("${name}")
+        [[ -n "${name}" ]] && MODEL_CLUSTER_PREFIX["${name}"]="CLUSTERS_CLUSTER${i}"
+    done
+
+    for ((i=1; i<=server_count; i++)); do
+        IFS=':' read -r name port machine cluster <<< "${CONFIG[MANAGED_SERVERS_SERVER${i}]}"
+        MODEL_SERVER_NAMES+=("${name}")
+        MODEL_SERVER_PORTS+=("${port}")
+        MODEL_SERVER_MACHINES+=("${machine}")
+        MODEL_SERVER_CLUSTERS+=("${cluster}")
+    done
+
+    log DEBUG "Model: ${#MODEL_HOSTS[@]} hosts, ${#MODEL_CLUSTER_NAMES[@]} clusters, ${#MODEL_SERVER_NAMES[@]} servers"
+}
+
+# Cache key: the configuration file and this script (the model layout)
+config_model_key() {
+    local digest
+    digest=$(cat "${CONFIG_FILE}" "${BASH_SOURCE[0]}" | sha256sum)
+    echo "${digest%% *}"
+}
+
+# Load CONFIG and the model from the cache; fails on a cache miss
+load_config_model() {
+    [[ -f "${CONFIG_FILE}" ]] || return 1
+    MODEL_HASH=$(config_model_key)
+    local model_file="${MODEL_CACHE_DIR}/${MODEL_HASH}/model.sh"
+
+    if [[ "${USE_CACHE}" != "true" || ! -f "${model_file}" ]]; then
+        return 1
+    fi
+
+    source "${model_file}"
+    log INFO "Configuration model loaded from cache: ${MODEL_CACHE_DIR}/${MODEL_HASH}"
+    return 0
+}
+
+# JSON string literal of $1 in JSON_VALUE
+json_escape() {
+    local value="${1//\\/\\\\}"
+    value="${value//\"/\\\"}"
+    JSON_VALUE="\"${value//$'\n'/\\n}\""
+}
+
+# JSON number of $1 in JSON_VALUE (a string if it is not numeric)
+json_number() {
+    if [[ "$1" =~ ^[0-9]+$ ]]; then
+        JSON_VALUE="$1"
+    else
+        json_escape "$1"
+    fi
+}
+
+# Write model.json (for inspection and other tools) and model.sh (sourced
+# by load_config_model). Command-line overrides are applied after loading
+# and are never cached, so passwords from the environment stay out of it.
+save_config_model() {
+    local model_dir="${MODEL_CACHE_DIR}/${MODEL_HASH}"
+    local JSON_VALUE sep
+
+    (umask 077 && mkdir -p "${model_dir}") || return 1
+
+    {
+        declare -p CONFIG MODEL_HOSTS MODEL_MACHINE_NAMES MODEL_MACHINE_HOSTS MODEL_MACHINE_PORTS \
+            MODEL_CLUSTER_NAMES MODEL_SERVER_NAMES MODEL_SERVER_PORTS MODEL_SERVER_MACHINES \
+            MODEL_SERVER_CLUSTERS MODEL_MACHINE_HOST MODEL_CLUSTER_PREFIX MODEL_DYNAMIC_CLUSTER \
+            | sed 's/^declare -\([aA]\)/declare -g\1/; s/^declare -- /declare -g /'
+    } > "${model_dir}/model.sh.tmp" && mv "${model_dir}/model.sh.tmp" "${model_dir}/model.sh"
+
+    {
+        echo "{"
+        json_escape "${CONFIG_FILE}"
+        echo "  \"config_file\": ${JSON_VALUE},"
+        echo "  \"hash\": \"${MODEL_HASH}\","
+        echo "  \"domain\": {"
+        sep=""
+        for key in DOMAIN_NAME DOMAIN_HOME ADMIN_SERVER_NAME ADMIN_PORT ADMIN_USER PRODUCTION_MODE \
+                   JAVA_HOME WEBLOGIC_HOME MIDDLEWARE_HOME; do
+            json_escape "${CONFIG[DOMAIN_${key}]}"
+            printf '%s    "%s": %s' "${sep}" "${key,,}" "${JSON_VALUE}"
+            sep=$',\n'
+        done
+        printf '\n  },\n  "hosts": ['
+        sep=""
+        for host in "${MODEL_HOSTS[@]}"; do
+            json_escape "${host}"
+            printf '%s%s' "${sep}" "${JSON_VALUE}"
+            sep=", "
+        done
+        printf '],\n  "machines": [\n'
+        sep=""
+        for ((i=0; i<${#MODEL_MACHINE_NAMES[@]}; i++)); do
+            [[ -z "${MODEL_MACHINE_NAMES[$i]}" ]] && continue
+            json_number "${MODEL_MACHINE_PORTS[$i]}"
+            printf '%s    {"name": "%s", "host": "%s", "port": %s}' "${sep}" \
+                "${MODEL_MACHINE_NAMES[$i]}" "${MODEL_MACHINE_HOSTS[$i]}" "${JSON_VALUE}"
+            sep=$',\n'
+        done
+        printf '\n  ],\n  "clusters": [\n'
+        sep=""
+        for ((i=0; i<${#MODEL_CLUSTER_NAMES[@]}; i++)); do
+            local dynamic_value="false"
+            [[ -n "${MODEL_CLUSTER_NAMES[$i]}" && "${MODEL_CLUSTER_NAMES[$i]}" == "${MODEL_DYNAMIC_CLUSTER}" ]] && dynamic_value="true"
+            printf '%s    {"name": "%s", "messaging_mode": "%s", "dynamic": %s}' "${sep}" "${MODEL_CLUSTER_NAMES[$i]}" \
+                "${CONFIG[CLUSTERS_CLUSTER$((i + 1))_MESSAGING_MODE]:-unicast}" "${dynamic_value}"
+            sep=$',\n'
+        done
+        printf '\n  ],\n  "servers": [\n'
+        sep=""
+        for ((i=0; i<${#MODEL_SERVER_NAMES[@]}; i++)); do
+            local cluster_value="null"
+            if [[ -n "${MODEL_SERVER_CLUSTERS[$i]}" ]]; then
+                json_escape "${MODEL_SERVER_CLUSTERS[$i]}"
+                cluster_value="${JSON_VALUE}"
+            fi
+            json_number "${MODEL_SERVER_PORTS[$i]}"
+            printf '%s    {"name": "%s", "port": %s, "machine": "%s", "cluster": %s}' "${sep}" \
+                "${MODEL_SERVER_NAMES[$i]}" "${JSON_VALUE}" "${MODEL_SERVER_MACHINES[$i]}" "${cluster_value}"
+            sep=$',\n'
+        done
+        printf '\n  ]\n}\n'
+    } > "${model_dir}/model.json"
+    chmod 600 "${model_dir}/model.sh" "${model_dir}/model.json"
+
+    log INFO "Configuration model cached: ${model_dir}"
+    return 0
+}
+
 #===============================================================================
 # INTERACTIVE MODE
 #===============================================================================
@@ -355,6 +580,7 @@ generate_auto_servers() {
     local distribute=$(get_config "MANAGED_SERVERS_AUTO_DISTRIBUTE_ACROSS_MACHINES" "true")
     local cluster_assignment=$(get_config "MANAGED_SERVERS_AUTO_CLUSTER_ASSIGNMENT" "NONE")
     local single_cluster=$(get_config "MANAGED_SERVERS_AUTO_CLUSTER_NAME" "")
+    local dynamic=$(get_config "MANAGED_SERVERS_AUTO_DYNAMIC_CLUSTER" "false")
     
     local host_count=$(get_config "HOSTS_HOST_COUNT" "1")
     local cluster_count=$(get_config "CLUSTERS_CLUSTER_COUNT" "0")
@@ -375,6 +601,27 @@ generate_auto_servers() {
         machines+=("${machine_name}")
     done
     
+    # A dynamic cluster only needs its size: WebLogic derives each server
+    # from the template. The servers are still listed here, named and
+    # placed the way WebLogic calculates them, for validation,
+    # boot.properties and the Phase 1 host map.
+    if [[ "${dynamic}" == "true" ]]; then
+        if [[ "${cluster_assignment}" != "SINGLE" || -z "${single_cluster}" ]]; then
+            log ERROR "AUTO_DYNAMIC_CLUSTER requires AUTO_CLUSTER_ASSIGNMENT=SINGLE and AUTO_CLUSTER_NAME"
+            return 1
+        fi
+        if [[ "${suffix_style}" != "NUMBER" || "${port_increment}" != "1" ]]; then
+            log ERROR "AUTO_DYNAMIC_CLUSTER requires AUTO_SERVER_SUFFIX_STYLE=NUMBER and AUTO_PORT_INCREMENT=1"
+            return 1
+        fi
+        machines=($(dynamic_cluster_machines))
+        if [[ ${#machines[@]} -eq 0 ]]; then
+            log ERROR "AUTO_MACHINE_MATCH matches no machine: $(get_config "MANAGED_SERVERS_AUTO_MACHINE_MATCH")"
+            return 1
+        fi
+        log INFO "Dynamic cluster ${single_cluster}: ${count} servers from a server template"
+    fi
+    
     # Build cluster list (if enabled)
     local -a clusters
     if [[ "$(get_config "CLUSTERS_ENABLED" "false")" == "true" && ${cluster_count} -gt 0 ]]; then
@@ -442,6 +689,34 @@ generate_auto_servers() {
     return 0
 }
 
+# MachineNameMatchExpression of the dynamic cluster: the comma-separated
+# AUTO_MACHINE_MATCH patterns, all machines by default, or only the first
+# machine if servers are not distributed
+dynamic_machine_match() {
+    if [[ "$(get_config "MANAGED_SERVERS_AUTO_DISTRIBUTE_ACROSS_MACHINES" "true")" != "true" ]]; then
+        echo "${CONFIG[MACHINES_MACHINE1]%%:*}"
+    else
+        get_config "MANAGED_SERVERS_AUTO_MACHINE_MATCH" "*"
+    fi
+}
+
+# Machines of the dynamic cluster that match it (one per line)
+dynamic_cluster_machines() {
+    local host_count=$(get_config "HOSTS_HOST_COUNT" "1")
+    local -a patterns
+    IFS=',' read -ra patterns <<< "$(dynamic_machine_match)"
+    for ((i=1; i<=host_count; i++)); do
+        local machine_name="${CONFIG[MACHINES_MACHINE${i}]%%:*}"
+        for pattern in "${patterns[@]}"; do
+            pattern="${pattern// /}"
+            if [[ -n "${machine_name}" && "${machine_name}" == ${pattern} ]]; then
+                echo "${machine_name}"
+                break
+            fi
+        done
+    done
+}
+
 #===============================================================================
 # VALIDATION FUNCTIONS
 #===============================================================================
@@ -585,36 +860,31 @@ validate_configuration() {
     fi
     
     # Validate hosts
-    local host_count=$(get_config "HOSTS_HOST_COUNT" "1")
-    for ((i=1; i<=host_count; i++)); do
-        local host=$(get_config "HOSTS_HOST${i}")
-        if [[ -z "${host}" ]]; then
-            log ERROR "Host ${i} not defined"
+    for ((i=0; i<${#MODEL_HOSTS[@]}; i++)); do
+        if [[ -z "${MODEL_HOSTS[$i]}" ]]; then
+            log ERROR "Host $((i + 1)) not defined"
             ((errors++))
         fi
     done
     
     # Validate machines match hosts
-    for ((i=1; i<=host_count; i++)); do
-        local machine=$(get_config "MACHINES_MACHINE${i}")
-        if [[ -z "${machine}" ]]; then
-            log WARN "Machine ${i} not defined, will auto-generate"
+    for ((i=0; i<${#MODEL_MACHINE_NAMES[@]}; i++)); do
+        if [[ -z "${MODEL_MACHINE_NAMES[$i]}" ]]; then
+            log WARN "Machine $((i + 1)) not defined, will auto-generate"
         fi
     done
     
     # Validate clustering configuration
     local clustering_enabled=$(get_config "CLUSTERS_ENABLED" "false")
     if [[ "${clustering_enabled}" == "true" ]]; then
-        local cluster_count=$(get_config "CLUSTERS_CLUSTER_COUNT" "0")
-        if [[ ${cluster_count} -eq 0 ]]; then
+        if [[ ${#MODEL_CLUSTER_NAMES[@]} -eq 0 ]]; then
             log ERROR "Clustering enabled but no clusters defined"
             ((errors++))
         fi
         
-        for ((i=1; i<=cluster_count; i++)); do
-            local cluster_name=$(get_config "CLUSTERS_CLUSTER${i}_NAME")
-            if [[ -z "${cluster_name}" ]]; then
-                log ERROR "Cluster ${i} name not defined"
+        for ((i=0; i<${#MODEL_CLUSTER_NAMES[@]}; i++)); do
+            if [[ -z "${MODEL_CLUSTER_NAMES[$i]}" ]]; then
+                log ERROR "Cluster $((i + 1)) name not defined"
                 ((errors++))
             fi
         done
@@ -623,23 +893,39 @@ validate_configuration() {
     # Validate managed servers
     local server_mode=$(get_config "MANAGED_SERVERS_MODE" "MANUAL")
     if [[ "${server_mode}" == "AUTO" ]]; then
-        # Will be validated during generation
-        :
+        # Servers were validated during generation; a dynamic cluster also
+        # needs its cluster and room to grow to AUTO_MAX_SERVER_COUNT
+        if [[ -n "${MODEL_DYNAMIC_CLUSTER}" ]]; then
+            local dynamic_size=$(get_config "MANAGED_SERVERS_AUTO_SERVER_COUNT" "2")
+            local dynamic_max=$(get_config "MANAGED_SERVERS_AUTO_MAX_SERVER_COUNT" "${dynamic_size}")
+            local dynamic_port=$(get_config "MANAGED_SERVERS_AUTO_SERVER_START_PORT" "8001")
+            if [[ "${clustering_enabled}" != "true" || -z "${MODEL_CLUSTER_PREFIX[${MODEL_DYNAMIC_CLUSTER}]}" ]]; then
+                log ERROR "Dynamic cluster ${MODEL_DYNAMIC_CLUSTER} is not defined in [CLUSTERS]"
+                ((errors++))
+            fi
+            if [[ ! "${dynamic_max}" =~ ^[0-9]+$ ]] || [[ ${dynamic_max} -lt ${dynamic_size} ]]; then
+                log ERROR "AUTO_MAX_SERVER_COUNT must be a number >= AUTO_SERVER_COUNT (${dynamic_max})"
+                ((errors++))
+            elif [[ ${dynamic_port} =~ ^[0-9]+$ ]] && [[ $((dynamic_port + dynamic_max - 1)) -gt 65535 ]]; then
+                log ERROR "Dynamic server ports ${dynamic_port}+ exceed 65535 at AUTO_MAX_SERVER_COUNT=${dynamic_max}"
+                ((errors++))
+            fi
+        fi
     else
-        local server_count=$(get_config "MANAGED_SERVERS_SERVER_COUNT" "0")
         local -A port_usage
         local -A name_usage
         
-        for ((i=1; i<=server_count; i++)); do
-            local server_def=$(get_config "MANAGED_SERVERS_SERVER${i}")
-            if [[ -z "${server_def}" ]]; then
-                log ERROR "Server ${i} not defined"
+        for ((i=0; i<${#MODEL_SERVER_NAMES[@]}; i++)); do
+            if [[ -z "${CONFIG[MANAGED_SERVERS_SERVER$((i + 1))]}" ]]; then
+                log ERROR "Server $((i + 1)) not defined"
                 ((errors++))
                 continue
             fi
             
-            # Parse server definition
-            IFS=':' read -r server_name server_port server_machine server_cluster <<< "${server_def}"
+            local server_name="${MODEL_SERVER_NAMES[$i]}"
+            local server_port="${MODEL_SERVER_PORTS[$i]}"
+            local server_machine="${MODEL_SERVER_MACHINES[$i]}"
+            local server_cluster="${MODEL_SERVER_CLUSTERS[$i]}"
             
             # Validate server name
             if [[ ! "${server_name}" =~ ^[a-zA-Z][a-zA-Z0-9_-]{0,63}$ ]]; then
@@ -670,22 +956,99 @@ validate_configuration() {
             
             # Validate cluster reference if clustering is enabled
             if [[ "${clustering_enabled}" == "true" && -n "${server_cluster}" ]]; then
-                local cluster_found=false
-                local cluster_count=$(get_config "CLUSTERS_CLUSTER_COUNT" "0")
-                for ((j=1; j<=cluster_count; j++)); do
-                    if [[ "$(get_config "CLUSTERS_CLUSTER${j}_NAME")" == "${server_cluster}" ]]; then
-                        cluster_found=true
-                        break
+                if [[ -z "${MODEL_CLUSTER_PREFIX[${server_cluster}]}" ]]; then
+                    log ERROR "Server ${server_name} references undefined cluster: ${server_cluster}"
+                    ((errors++))
+                fi
+            fi
+        done
+    fi
+
+    # Validate session replication settings
+    if [[ "${clustering_enabled}" == "true" ]]; then
+        for ((i=0; i<${#MODEL_CLUSTER_NAMES[@]}; i++)); do
+            local prefix="CLUSTERS_CLUSTER$((i + 1))"
+            local cluster_name="${MODEL_CLUSTER_NAMES[$i]}"
+            for setting in MULTICAST_PORT FRONTEND_HTTP_PORT FRONTEND_HTTPS_PORT REPLICATION_PORT_OFFSET; do
+                local setting_value="${CONFIG[${prefix}_${setting}]}"
+                if [[ -n "${setting_value}" && ! "${setting_value}" =~ ^[0-9]+$ ]]; then
+                    log ERROR "Cluster ${cluster_name}: ${setting} must be a number (${setting_value})"
+                    ((errors++))
+                fi
+            done
+            [[ "${CONFIG[${prefix}_SESSION_REPLICATION]:-false}" != "true" ]] && continue
+
+            local machine_total=0
+            cluster_machines "${cluster_name}"
+            machine_total=${#CLUSTER_MACHINES[@]}
+            if [[ ${machine_total} -lt 2 ]]; then
+                log WARN "Cluster ${cluster_name}: session replication on a single machine does not survive a host failure"
+                ((warnings++))
+            fi
+
+            # The replication channel port must be free on each member's machine
+            if [[ -n "${CONFIG[${prefix}_REPLICATION_CHANNEL]}" ]]; then
+                local offset="${CONFIG[${prefix}_REPLICATION_PORT_OFFSET]:-100}"
+                local -A listen_ports=()
+                for ((s=0; s<${#MODEL_SERVER_NAMES[@]}; s++)); do
+                    listen_ports["${MODEL_SERVER_MACHINES[$s]}:${MODEL_SERVER_PORTS[$s]}"]="${MODEL_SERVER_NAMES[$s]}"
+                done
+                for ((s=0; s<${#MODEL_SERVER_NAMES[@]}; s++)); do
+                    local r_name="${MODEL_SERVER_NAMES[$s]}" r_port="${MODEL_SERVER_PORTS[$s]}"
+                    local r_machine="${MODEL_SERVER_MACHINES[$s]}"
+                    [[ "${MODEL_SERVER_CLUSTERS[$s]}" != "${cluster_name}" || ! "${offset}" =~ ^[0-9]+$ ]] && continue
+                    local channel_port=$((r_port + offset))
+                    if [[ -n "${listen_ports[${r_machine}:${channel_port}]}" ]]; then
+                        log ERROR "Replication channel port ${channel_port} of ${r_name} conflicts with ${listen_ports[${r_machine}:${channel_port}]} on ${r_machine}"
+                        ((errors++))
                     fi
                 done
-                if [[ "${cluster_found}" != "true" ]]; then
-                    log ERROR "Server ${server_name} references undefined cluster: ${server_cluster}"
+            fi
+        done
+    fi
+
+    # Validate work managers
+    if [[ "$(get_config "WORK_MANAGERS_ENABLED" "false")" == "true" ]]; then
+        local wm_count=$(get_config "WORK_MANAGERS_WORK_MANAGER_COUNT" "0")
+        local -A target_names
+        for target_name in "${MODEL_CLUSTER_NAMES[@]}"; do
+            [[ -n "${target_name}" ]] && target_names["${target_name}"]=1
+        done
+        # Dynamic servers do not exist until started, so only their cluster is a target
+        for ((i=0; i<${#MODEL_SERVER_NAMES[@]}; i++)); do
+            if [[ -n "${MODEL_SERVER_NAMES[$i]}" && "${MODEL_SERVER_CLUSTERS[$i]}" != "${MODEL_DYNAMIC_CLUSTER:-_}" ]]; then
+                target_names["${MODEL_SERVER_NAMES[$i]}"]=1
+            fi
+        done
+
+        for ((i=1; i<=wm_count; i++)); do
+            local wm_prefix="WORK_MANAGERS_WORK_MANAGER${i}"
+            local wm_name=$(get_config "${wm_prefix}_NAME")
+            local wm_target=$(get_config "${wm_prefix}_TARGET")
+            if [[ ! "${wm_name}" =~ ^[a-zA-Z][a-zA-Z0-9_.-]{0,63}$ ]]; then
+                log ERROR "Invalid work manager ${i} name: ${wm_name}"
+                ((errors++))
+                continue
+            fi
+            if [[ -z "${wm_target}" || -z "${target_names[${wm_target}]}" ]]; then
+                log ERROR "Work manager ${wm_name} targets undefined cluster or server: ${wm_target}"
+                ((errors++))
+            fi
+            for setting in FAIR_SHARE MAX_THREADS MIN_THREADS STUCK_THREAD_MAX_TIME STUCK_THREAD_COUNT; do
+                local setting_value=$(get_config "${wm_prefix}_${setting}")
+                if [[ -n "${setting_value}" && ! "${setting_value}" =~ ^[0-9]+$ ]]; then
+                    log ERROR "Work manager ${wm_name}: ${setting} must be a number (${setting_value})"
                     ((errors++))
                 fi
+            done
+            local fair_share=$(get_config "${wm_prefix}_FAIR_SHARE")
+            if [[ "${fair_share}" =~ ^[0-9]+$ ]] && [[ ${fair_share} -lt 1 || ${fair_share} -gt 1000 ]]; then
+                log ERROR "Work manager ${wm_name}: FAIR_SHARE must be 1-1000 (${fair_share})"
+                ((errors++))
             fi
         done
     fi
-    
+
     # Summary
     if [[ ${errors} -gt 0 ]]; then
         log ERROR "Configuration validation failed with ${errors} error(s) and ${warnings} warning(s)"
@@ -705,66 +1068,367 @@ validate_configuration() {
 # TEMPLATE PROCESSING
 #===============================================================================
 
-process_template() {
-    local template_file="$1"
-    local output_file="$2"
-    
-    log DEBUG "Processing template: ${template_file} -> ${output_file}"
-    
-    if [[ ! -f "${template_file}" ]]; then
-        log ERROR "Template file not found: ${template_file}"
+# Placeholders computed from the configuration (lists, host/server lines)
+declare -A TEMPLATE_VARS
+
+# Render templates in a single awk pass.
+# Arguments: template output [template output ...]
+#
+# Every {{NAME}} is looked up once in a table holding, in increasing
+# priority, the short keys (section prefix removed), the full CONFIG keys
+# and TEMPLATE_VARS, so a short key never replaces a full one. Substituted
+# values are not scanned again. Any placeholder left unresolved is reported
+# with its file and line and the render fails.
+render_templates() {
+    local vars_file
+    vars_file=$(mktemp) || return 1
+
+    local key value
+    {
+        for key in "${!CONFIG[@]}"; do
+            value="${CONFIG[$key]//\\/\\\\}"
+            printf '%s=%s\n' "${key#*_}" "${value//$'\n'/\\n}"
+        done
+        for key in "${!CONFIG[@]}"; do
+            value="${CONFIG[$key]//\\/\\\\}"
+            printf '%s=%s\n' "${key}" "${value//$'\n'/\\n}"
+        done
+        for key in "${!TEMPLATE_VARS[@]}"; do
+            value="${TEMPLATE_VARS[$key]//\\/\\\\}"
+            printf '%s=%s\n' "${key}" "${value//$'\n'/\\n}"
+        done
+    } > "${vars_file}"
+
+    local -a pairs=()
+    while [[ $# -gt 1 ]]; do
+        if [[ ! -f "$1" ]]; then
+            log ERROR "Template file not found: $1"
+            rm -f "${vars_file}"
+            return 1
+        fi
+        log DEBUG "Rendering template: $1 -> $2"
+        pairs+=("$1" "$2")
+        shift 2
+    done
+
+    local render_errors
+    render_errors=$(awk -v vars_file="${vars_file}" '
+        # Values are written with \\ for a backslash and \n for a newline;
+        # gsub keeps this linear in the length of large values (SERVERS_LIST)
+        function unescape(text) {
+            gsub(/\\\\/, "\001", text)
+            gsub(/\\n/, "\n", text)
+            gsub(/\001/, "\\\\", text)
+            return text
+        }
+        BEGIN {
+            while ((getline line < vars_file) > 0) {
+                eq = index(line, "=")
+                vars[substr(line, 1, eq - 1)] = unescape(substr(line, eq + 1))
+            }
+            close(vars_file)
+
+            failed = 0
+            for (a = 1; a < ARGC; a += 2) {
+                template = ARGV[a]
+                output = ARGV[a + 1]
+                printf "" > output
+                lineno = 0
+                while ((getline line < template) > 0) {
+                    lineno++
+                    rendered = ""
+                    while (match(line, /[{][{][A-Za-z0-9_]+[}][}]/)) {
+                        name = substr(line, RSTART + 2, RLENGTH - 4)
+                        rendered = rendered substr(line, 1, RSTART - 1)
+                        if (name in vars) {
+                            rendered = rendered vars[name]
+                        } else {
+                            rendered = rendered substr(line, RSTART, RLENGTH)
+                            printf "%s:%d: unresolved placeholder {{%s}}\n", template, lineno, name > "/dev/stderr"
+                            failed = 1
+                        }
+                        line = substr(line, RSTART + RLENGTH)
+                    }
+                    print rendered line > output
+                }
+                close(template)
+                close(output)
+            }
+            exit failed
+        }
+    ' "${pairs[@]}" 2>&1)
+    local render_exit=$?
+    rm -f "${vars_file}"
+
+    if [[ ${render_exit} -ne 0 ]]; then
+        local message
+        while IFS= read -r message; do
+            log ERROR "${message}"
+        done <<< "${render_errors}"
+        log ERROR "Template rendering failed"
         return 1
     fi
-    
-    # Start with template content
-    cp "${template_file}" "${output_file}"
-    
-    # Replace all {{VARIABLE}} placeholders with configuration values
-    for key in "${!CONFIG[@]}"; do
-        local value="${CONFIG[$key]}"
-        # Escape special characters for sed
-        local escaped_value=$(printf '%s\n' "$value" | sed -e 's/[&\\/]/\\&/g; s/$/\\/' -e '$s/\\$//')
-        sed -i "s|{{${key}}}|${escaped_value}|g" "${output_file}"
+    return 0
+}
+
+# Python value for an optional numeric setting
+py_number() {
+    echo "${1:-None}"
+}
+
+# Python value for an optional string setting
+py_string() {
+    if [[ -n "$1" ]]; then
+        echo "'$1'"
+    else
+        echo "None"
+    fi
+}
+
+# Machines hosting members of a cluster, in server order (CLUSTER_MACHINES)
+cluster_machines() {
+    local cluster_name="$1"
+    local -A seen
+    CLUSTER_MACHINES=()
+    for ((s=0; s<${#MODEL_SERVER_NAMES[@]}; s++)); do
+        local s_machine="${MODEL_SERVER_MACHINES[$s]}"
+        if [[ "${MODEL_SERVER_CLUSTERS[$s]}" == "${cluster_name}" && -z "${seen[${s_machine}]}" ]]; then
+            seen["${s_machine}"]=1
+            CLUSTER_MACHINES+=("${s_machine}")
+        fi
     done
-    
-    # Also replace without section prefix for convenience
-    for key in "${!CONFIG[@]}"; do
-        # Extract the key without section prefix
-        local short_key="${key#*_}"
-        local value="${CONFIG[$key]}"
-        local escaped_value=$(printf '%s\n' "$value" | sed -e 's/[&\\/]/\\&/g; s/$/\\/' -e '$s/\\$//')
-        sed -i "s|{{${short_key}}}|${escaped_value}|g" "${output_file}"
+}
+
+# host:port of every cluster member, for CLUSTER_ADDRESS=AUTO
+cluster_member_addresses() {
+    local cluster_name="$1"
+    local addresses=""
+    for ((s=0; s<${#MODEL_SERVER_NAMES[@]}; s++)); do
+        if [[ "${MODEL_SERVER_CLUSTERS[$s]}" == "${cluster_name}" ]]; then
+            local s_machine="${MODEL_SERVER_MACHINES[$s]}"
+            addresses="${addresses},${MODEL_MACHINE_HOST[${s_machine}]:-${s_machine}}:${MODEL_SERVER_PORTS[$s]}"
+        fi
     done
-    
-    log DEBUG "Template processed: ${output_file}"
-    return 0
+    echo "${addresses#,}"
+}
+
+# Machine definitions from [MACHINES] as a Python list literal
+build_machines_list() {
+    echo "["
+    for ((i=0; i<${#MODEL_MACHINE_NAMES[@]}; i++)); do
+        [[ -z "${CONFIG[MACHINES_MACHINE$((i + 1))]}" ]] && continue
+        echo "    {'name': '${MODEL_MACHINE_NAMES[$i]}', 'host': '${MODEL_MACHINE_HOSTS[$i]}', 'port': ${MODEL_MACHINE_PORTS[$i]}},"
+    done
+    echo "]"
+}
+
+# Cluster definitions from [CLUSTERS] as a Python list literal.
+# Shared by the offline domain script and create-cluster.py (online).
+build_clusters_list() {
+    if [[ "$(get_config "CLUSTERS_ENABLED" "false")" != "true" ]]; then
+        echo "[]"
+        return 0
+    fi
+
+    echo "["
+    for ((i=0; i<${#MODEL_CLUSTER_NAMES[@]}; i++)); do
+        local prefix="CLUSTERS_CLUSTER$((i + 1))"
+        local cluster_name="${MODEL_CLUSTER_NAMES[$i]}"
+        local cluster_address=$(get_config "${prefix}_CLUSTER_ADDRESS")
+        if [[ "${cluster_address}" == "AUTO" ]]; then
+            cluster_address=$(cluster_member_addresses "${cluster_name}")
+        fi
+        local replication_channel=""
+        if [[ "$(get_config "${prefix}_SESSION_REPLICATION" "false")" == "true" ]]; then
+            replication_channel=$(get_config "${prefix}_REPLICATION_CHANNEL")
+        fi
+        echo "    {'name': '${cluster_name}', 'messaging_mode': '$(get_config "${prefix}_MESSAGING_MODE" "unicast")'," \
+             "'multicast_address': $(py_string "$(get_config "${prefix}_MULTICAST_ADDRESS")")," \
+             "'multicast_port': $(py_number "$(get_config "${prefix}_MULTICAST_PORT")")," \
+             "'cluster_address': $(py_string "${cluster_address}")," \
+             "'frontend_host': $(py_string "$(get_config "${prefix}_FRONTEND_HOST")")," \
+             "'frontend_http_port': $(py_number "$(get_config "${prefix}_FRONTEND_HTTP_PORT")")," \
+             "'frontend_https_port': $(py_number "$(get_config "${prefix}_FRONTEND_HTTPS_PORT")")," \
+             "'load_algorithm': $(py_string "$(get_config "${prefix}_LOAD_ALGORITHM")")," \
+             "'replication_channel': $(py_string "${replication_channel}")},"
+    done
+    echo "]"
+}
+
+# Managed server definitions as a Python list literal. Members of a cluster
+# with SESSION_REPLICATION=true get a replication group (their machine), a
+# preferred secondary group (the next machine of the cluster, so the session
+# copy lives on another host) and, if configured, a replication channel.
+build_servers_list() {
+    # Machines of every cluster in server order, and from them the next
+    # machine of each cluster machine, worked out once for all servers
+    local -A cluster_machine_list=() cluster_machine_seen=() secondary_groups=()
+    for ((s=0; s<${#MODEL_SERVER_NAMES[@]}; s++)); do
+        local s_cluster="${MODEL_SERVER_CLUSTERS[$s]}" s_machine="${MODEL_SERVER_MACHINES[$s]}"
+        [[ -z "${s_cluster}" || -n "${cluster_machine_seen[${s_cluster}/${s_machine}]}" ]] && continue
+        cluster_machine_seen["${s_cluster}/${s_machine}"]=1
+        cluster_machine_list["${s_cluster}"]+=" ${s_machine}"
+    done
+    local cluster
+    for cluster in "${!cluster_machine_list[@]}"; do
+        local -a machines=(${cluster_machine_list[${cluster}]})
+        [[ ${#machines[@]} -gt 1 ]] || continue
+        for ((m=0; m<${#machines[@]}; m++)); do
+            secondary_groups["${cluster}/${machines[$m]}"]="${machines[$(( (m + 1) % ${#machines[@]} ))]}"
+        done
+    done
+
+    echo "["
+    for ((i=0; i<${#MODEL_SERVER_NAMES[@]}; i++)); do
+        [[ -z "${CONFIG[MANAGED_SERVERS_SERVER$((i + 1))]}" ]] && continue
+        [[ -n "${MODEL_DYNAMIC_CLUSTER}" && "${MODEL_SERVER_CLUSTERS[$i]}" == "${MODEL_DYNAMIC_CLUSTER}" ]] && continue
+        local server_name="${MODEL_SERVER_NAMES[$i]}" server_port="${MODEL_SERVER_PORTS[$i]}"
+        local server_machine="${MODEL_SERVER_MACHINES[$i]}" server_cluster="${MODEL_SERVER_CLUSTERS[$i]}"
+
+        local replication_group="" secondary_group="" channel="" channel_address="" channel_port=""
+        local prefix="${MODEL_CLUSTER_PREFIX[${server_cluster:-_}]}"
+        if [[ -n "${prefix}" && "${CONFIG[${prefix}_SESSION_REPLICATION]:-false}" == "true" ]]; then
+            replication_group="${server_machine}"
+            secondary_group="${secondary_groups[${server_cluster}/${server_machine}]}"
+            channel="${CONFIG[${prefix}_REPLICATION_CHANNEL]}"
+            if [[ -n "${channel}" ]]; then
+                channel_address="${MODEL_MACHINE_HOST[${server_machine}]:-${server_machine}}"
+                channel_port=$((server_port + ${CONFIG[${prefix}_REPLICATION_PORT_OFFSET]:-100}))
+            fi
+        fi
+
+        echo "    {'name': '${server_name}', 'port': ${server_port}, 'machine': '${server_machine}'," \
+             "'cluster': $(py_string "${server_cluster}")," \
+             "'replication_group': $(py_string "${replication_group}")," \
+             "'secondary_group': $(py_string "${secondary_group}")," \
+             "'replication_channel': $(py_string "${channel}")," \
+             "'replication_address': $(py_string "${channel_address}")," \
+             "'replication_port': $(py_number "${channel_port}")},"
+    done
+    echo "]"
+}
+
+# Dynamic cluster (AUTO_DYNAMIC_CLUSTER) as a Python list literal: the
+# server template and the DynamicServers settings of its cluster. Listen
+# ports are calculated, so server N listens on the template port + N; the
+# replication channel port is calculated the same way.
+build_dynamic_clusters_list() {
+    if [[ -z "${MODEL_DYNAMIC_CLUSTER}" ]]; then
+        echo "[]"
+        return 0
+    fi
+
+    local cluster_name="${MODEL_DYNAMIC_CLUSTER}"
+    local prefix="${MODEL_CLUSTER_PREFIX[${cluster_name}]}"
+    local size="${CONFIG[MANAGED_SERVERS_AUTO_SERVER_COUNT]:-2}"
+    local template_port=$(( ${CONFIG[MANAGED_SERVERS_AUTO_SERVER_START_PORT]:-8001} - 1 ))
+    local channel="" channel_port=""
+    if [[ "${CONFIG[${prefix}_SESSION_REPLICATION]:-false}" == "true" && -n "${CONFIG[${prefix}_REPLICATION_CHANNEL]}" ]]; then
+        channel="${CONFIG[${prefix}_REPLICATION_CHANNEL]}"
+        channel_port=$((template_port + ${CONFIG[${prefix}_REPLICATION_PORT_OFFSET]:-100}))
+    fi
+
+    echo "["
+    echo "    {'cluster': '${cluster_name}'," \
+         "'template': '$(get_config "MANAGED_SERVERS_AUTO_SERVER_TEMPLATE" "${cluster_name}-template")'," \
+         "'prefix': '$(get_config "MANAGED_SERVERS_AUTO_SERVER_PREFIX" "managedserver")'," \
+         "'size': ${size}, 'max_size': $(get_config "MANAGED_SERVERS_AUTO_MAX_SERVER_COUNT" "${size}")," \
+         "'listen_port': ${template_port}," \
+         "'machine_match': $(py_string "$(dynamic_machine_match)")," \
+         "'replication_channel': $(py_string "${channel}")," \
+         "'replication_port': $(py_number "${channel_port}")},"
+    echo "]"
+}
+
+# Work Manager definitions from [WORK_MANAGERS] as a Python list literal.
+# Shared by the offline domain script and create-work-managers.py (online).
+build_work_managers_list() {
+    if [[ "$(get_config "WORK_MANAGERS_ENABLED" "false")" != "true" ]]; then
+        echo "[]"
+        return 0
+    fi
+
+    local wm_count=$(get_config "WORK_MANAGERS_WORK_MANAGER_COUNT" "0")
+    echo "["
+    for ((i=1; i<=wm_count; i++)); do
+        local prefix="WORK_MANAGERS_WORK_MANAGER${i}"
+        local wm_name=$(get_config "${prefix}_NAME")
+        [[ -z "${wm_name}" ]] && continue
+        local ignore_stuck=$(get_config "${prefix}_IGNORE_STUCK_THREADS" "false" | sed 's/true/True/;s/false/False/')
+        echo "    {'name': '${wm_name}', 'target': '$(get_config "${prefix}_TARGET")'," \
+             "'fair_share': $(py_number "$(get_config "${prefix}_FAIR_SHARE")")," \
+             "'max_threads': $(py_number "$(get_config "${prefix}_MAX_THREADS")")," \
+             "'min_threads': $(py_number "$(get_config "${prefix}_MIN_THREADS")")," \
+             "'stuck_thread_max_time': $(py_number "$(get_config "${prefix}_STUCK_THREAD_MAX_TIME")")," \
+             "'stuck_thread_count': $(py_number "$(get_config "${prefix}_STUCK_THREAD_COUNT")")," \
+             "'ignore_stuck_threads': ${ignore_stuck}},"
+    done
+    echo "]"
+}
+
+# Compute the derived placeholders used by templates and the WLST script
+set_template_vars() {
+    local hosts_list="" hosts_definitions="" machines_definitions="" servers_definitions=""
+
+    for ((i=1; i<=${#MODEL_HOSTS[@]}; i++)); do
+        local host="${MODEL_HOSTS[$((i - 1))]}"
+        hosts_list="${hosts_list} \"${host}\""
+        hosts_definitions="${hosts_definitions}HOST${i}=\"${host}\""$'\n'
+        machines_definitions="${machines_definitions}MACHINE${i}=\"${CONFIG[MACHINES_MACHINE${i}]}\""$'\n'
+    done
+    for ((i=1; i<=${#MODEL_SERVER_NAMES[@]}; i++)); do
+        servers_definitions="${servers_definitions}SERVER${i}=\"${CONFIG[MANAGED_SERVERS_SERVER${i}]}\""$'\n'
+    done
+
+    TEMPLATE_VARS["CONFIG_FILE"]="${CONFIG_FILE:-interactive}"
+    TEMPLATE_VARS["HOSTS_LIST"]="${hosts_list# }"
+    TEMPLATE_VARS["HOSTS_DEFINITIONS"]="${hosts_definitions%$'\n'}"
+    TEMPLATE_VARS["MACHINES_DEFINITIONS"]="${machines_definitions%$'\n'}"
+    TEMPLATE_VARS["SERVERS_DEFINITIONS"]="${servers_definitions%$'\n'}"
+    TEMPLATE_VARS["MACHINES_LIST"]="$(build_machines_list)"
+    TEMPLATE_VARS["CLUSTERS_LIST"]="$(build_clusters_list)"
+    TEMPLATE_VARS["SERVERS_LIST"]="$(build_servers_list)"
+    TEMPLATE_VARS["DYNAMIC_CLUSTERS_LIST"]="$(build_dynamic_clusters_list)"
+    TEMPLATE_VARS["WORK_MANAGERS_LIST"]="$(build_work_managers_list)"
 }
 
 generate_scripts() {
     log_section "Generating Scripts from Templates"
     
     mkdir -p "${GENERATED_DIR}"
+    timed set_template_vars set_template_vars
     
     # Generate main WLST domain creation script
-    generate_wlst_script
+    timed generate_wlst_script generate_wlst_script
     
-    # Generate validation scripts
-    process_template "${TEMPLATE_DIR}/validate-environment.sh.template" "${GENERATED_DIR}/validate-environment.sh"
-    chmod +x "${GENERATED_DIR}/validate-environment.sh"
+    # Validation and cleanup scripts
+    local -a templates=(
+        "${TEMPLATE_DIR}/validate-environment.sh.template" "${GENERATED_DIR}/validate-environment.sh"
+        "${TEMPLATE_DIR}/validate-domain.sh.template" "${GENERATED_DIR}/validate-domain.sh"
+        "${TEMPLATE_DIR}/cleanup-domain.sh.template" "${GENERATED_DIR}/cleanup-domain.sh"
+    )
     
-    process_template "${TEMPLATE_DIR}/validate-domain.sh.template" "${GENERATED_DIR}/validate-domain.sh"
-    chmod +x "${GENERATED_DIR}/validate-domain.sh"
+    # Online cluster script (cluster address, frontend, session replication)
+    if [[ "$(get_config "CLUSTERS_ENABLED" "false")" == "true" ]]; then
+        templates+=("${TEMPLATE_DIR}/create-cluster.py.template" "${GENERATED_DIR}/create-cluster.py")
+    fi
     
-    # Generate cleanup script
-    process_template "${TEMPLATE_DIR}/cleanup-domain.sh.template" "${GENERATED_DIR}/cleanup-domain.sh"
-    chmod +x "${GENERATED_DIR}/cleanup-domain.sh"
+    # Online Work Manager script (applies [WORK_MANAGERS] to a running domain)
+    if [[ "$(get_config "WORK_MANAGERS_ENABLED" "false")" == "true" ]]; then
+        templates+=("${TEMPLATE_DIR}/create-work-managers.py.template" "${GENERATED_DIR}/create-work-managers.py")
+    fi
     
-    # Generate Phase 1 configuration
+    # Phase 1 configuration
     if [[ "$(get_config "OPTIONS_GENERATE_AUTOSTART_CONFIG" "true")" == "true" ]]; then
-        process_template "${TEMPLATE_DIR}/generate-phase1-config.sh.template" "${GENERATED_DIR}/generate-phase1-config.sh"
-        chmod +x "${GENERATED_DIR}/generate-phase1-config.sh"
+        templates+=("${TEMPLATE_DIR}/generate-phase1-config.sh.template" "${GENERATED_DIR}/generate-phase1-config.sh")
     fi
     
+    # All templates are rendered in one pass
+    if ! timed render_templates render_templates "${templates[@]}"; then
+        return 1
+    fi
+    chmod +x "${GENERATED_DIR}"/*.sh
+    
     log INFO "Scripts generated in: ${GENERATED_DIR}"
     return 0
 }
@@ -824,74 +1488,30 @@ CLUSTERING_ENABLED = $(get_config "CLUSTERS_ENABLED" "false" | sed 's/true/True/
 
 EOF
 
-    # Add cluster definitions if enabled
-    if [[ "$(get_config "CLUSTERS_ENABLED" "false")" == "true" ]]; then
-        local cluster_count=$(get_config "CLUSTERS_CLUSTER_COUNT" "0")
-        cat >> "${output_file}" << EOF
+    # Add cluster definitions (empty when clustering is disabled)
+    cat >> "${output_file}" << EOF
 # Cluster Definitions
-CLUSTERS = [
-EOF
-        for ((i=1; i<=cluster_count; i++)); do
-            local cluster_name=$(get_config "CLUSTERS_CLUSTER${i}_NAME")
-            local messaging_mode=$(get_config "CLUSTERS_CLUSTER${i}_MESSAGING_MODE" "unicast")
-            cat >> "${output_file}" << EOF
-    {'name': '${cluster_name}', 'messaging_mode': '${messaging_mode}'},
-EOF
-        done
-        cat >> "${output_file}" << EOF
-]
+CLUSTERS = ${TEMPLATE_VARS[CLUSTERS_LIST]}
 
 EOF
-    else
-        cat >> "${output_file}" << EOF
-CLUSTERS = []
-
-EOF
-    fi
     
     # Add machine definitions
-    local host_count=$(get_config "HOSTS_HOST_COUNT" "1")
     cat >> "${output_file}" << EOF
 # Machine Definitions
-MACHINES = [
-EOF
-    for ((i=1; i<=host_count; i++)); do
-        local machine_def=$(get_config "MACHINES_MACHINE${i}")
-        if [[ -n "${machine_def}" ]]; then
-            IFS=':' read -r machine_name machine_host machine_port <<< "${machine_def}"
-            cat >> "${output_file}" << EOF
-    {'name': '${machine_name}', 'host': '${machine_host}', 'port': ${machine_port:-5556}},
-EOF
-        fi
-    done
-    cat >> "${output_file}" << EOF
-]
+MACHINES = ${TEMPLATE_VARS[MACHINES_LIST]}
 
 EOF
 
     # Add server definitions
-    local server_count=$(get_config "MANAGED_SERVERS_SERVER_COUNT" "0")
     cat >> "${output_file}" << EOF
 # Managed Server Definitions
-MANAGED_SERVERS = [
-EOF
-    for ((i=1; i<=server_count; i++)); do
-        local server_def=$(get_config "MANAGED_SERVERS_SERVER${i}")
-        if [[ -n "${server_def}" ]]; then
-            IFS=':' read -r server_name server_port server_machine server_cluster <<< "${server_def}"
-            if [[ -n "${server_cluster}" ]]; then
-                cat >> "${output_file}" << EOF
-    {'name': '${server_name}', 'port': ${server_port}, 'machine': '${server_machine}', 'cluster': '${server_cluster}'},
-EOF
-            else
-                cat >> "${output_file}" << EOF
-    {'name': '${server_name}', 'port': ${server_port}, 'machine': '${server_machine}', 'cluster': None},
-EOF
-            fi
-        fi
-    done
-    cat >> "${output_file}" << EOF
-]
+MANAGED_SERVERS = ${TEMPLATE_VARS[SERVERS_LIST]}
+
+# Dynamic Cluster Definitions (servers calculated from a server template)
+DYNAMIC_CLUSTERS = ${TEMPLATE_VARS[DYNAMIC_CLUSTERS_LIST]}
+
+# Work Manager Definitions
+WORK_MANAGERS = ${TEMPLATE_VARS[WORK_MANAGERS_LIST]}
 
 EOF
 
@@ -901,6 +1521,125 @@ EOF
 # Domain Creation Logic
 #===============================================================================
 
+# Cluster attributes set from the optional CLUSTERS settings
+CLUSTER_ATTRIBUTES = [
+    ('multicast_address', 'MulticastAddress'),
+    ('multicast_port', 'MulticastPort'),
+    ('cluster_address', 'ClusterAddress'),
+    ('frontend_host', 'FrontendHost'),
+    ('frontend_http_port', 'FrontendHTTPPort'),
+    ('frontend_https_port', 'FrontendHTTPSPort'),
+    ('load_algorithm', 'DefaultLoadAlgorithm'),
+    ('replication_channel', 'ReplicationChannel'),
+]
+
+def configure_cluster(cluster):
+    """Set the optional cluster attributes (current directory is the cluster)."""
+    for key, attribute in CLUSTER_ATTRIBUTES:
+        if cluster.get(key):
+            set(attribute, cluster[key])
+            print("    " + attribute + ": " + str(cluster[key]))
+
+def configure_replication(server):
+    """Replication group, preferred secondary and channel (current directory is the server)."""
+    if server.get('replication_group'):
+        set('ReplicationGroup', server['replication_group'])
+        if server.get('secondary_group'):
+            set('PreferredSecondaryGroup', server['secondary_group'])
+        print("    Replication group: " + server['replication_group'] +
+              " (secondary: " + str(server.get('secondary_group')) + ")")
+    if server.get('replication_channel'):
+        create(server['replication_channel'], 'NetworkAccessPoint')
+        cd('NetworkAccessPoint/' + server['replication_channel'])
+        set('Protocol', 't3')
+        set('ListenAddress', server['replication_address'])
+        set('ListenPort', int(server['replication_port']))
+        print("    Replication channel: " + server['replication_address'] + ":" + str(server['replication_port']))
+
+def create_dynamic_clusters():
+    """Server template and DynamicServers settings of each dynamic cluster."""
+    for dynamic in DYNAMIC_CLUSTERS:
+        print("  Creating server template: " + dynamic['template'] + " (cluster " + dynamic['cluster'] + ")")
+        cd('/')
+        create(dynamic['template'], 'ServerTemplate')
+        cd('/ServerTemplate/' + dynamic['template'])
+        set('ListenPort', int(dynamic['listen_port']))
+        set('ListenAddress', '')
+        set('Cluster', getMBean('/Cluster/' + dynamic['cluster']))
+        if dynamic['replication_channel']:
+            create(dynamic['replication_channel'], 'NetworkAccessPoint')
+            cd('NetworkAccessPoint/' + dynamic['replication_channel'])
+            set('Protocol', 't3')
+            set('ListenPort', int(dynamic['replication_port']))
+            print("    Replication channel: template port " + str(dynamic['replication_port']))
+        
+        # Server N is <prefix>N listening on the template port + N, placed
+        # round-robin on the machines matching the expression
+        cd('/Cluster/' + dynamic['cluster'])
+        create(dynamic['cluster'], 'DynamicServers')
+        cd('DynamicServers/' + dynamic['cluster'])
+        set('ServerTemplate', getMBean('/ServerTemplate/' + dynamic['template']))
+        set('ServerNamePrefix', dynamic['prefix'])
+        set('MaxDynamicClusterSize', int(dynamic['max_size']))
+        set('DynamicClusterSize', int(dynamic['size']))
+        set('CalculatedListenPorts', True)
+        set('CalculatedMachineNames', True)
+        if dynamic['machine_match']:
+            set('MachineNameMatchExpression', dynamic['machine_match'])
+        print("    Dynamic servers: " + dynamic['prefix'] + "1-" + str(dynamic['size']) +
+              " (max " + str(dynamic['max_size']) + "), ports from " + str(int(dynamic['listen_port']) + 1))
+
+def self_tuning_path():
+    """Return the SelfTuning path of the domain (created if the template has none)."""
+    # Like the security realm, it may still carry the template's domain name
+    for name in [DOMAIN_NAME, 'base_domain']:
+        try:
+            cd('/SelfTuning/' + name)
+            return '/SelfTuning/' + name
+        except:
+            pass
+    cd('/')
+    create(DOMAIN_NAME, 'SelfTuning')
+    return '/SelfTuning/' + DOMAIN_NAME
+
+def create_work_managers():
+    """Create Work Managers with their constraints, request class and stuck thread action."""
+    base = self_tuning_path()
+    for wm in WORK_MANAGERS:
+        print("  Creating work manager: " + wm['name'] + " (target " + wm['target'] + ")")
+        components = []
+        if wm['max_threads']:
+            components.append(('MaxThreadsConstraint', wm['name'] + '_max_threads', 'Count', wm['max_threads']))
+        if wm['min_threads']:
+            components.append(('MinThreadsConstraint', wm['name'] + '_min_threads', 'Count', wm['min_threads']))
+        if wm['fair_share']:
+            components.append(('FairShareRequestClass', wm['name'] + '_fair_share', 'FairShare', wm['fair_share']))
+        
+        for component_type, name, attribute, value in components:
+            cd(base)
+            create(name, component_type)
+            cd(base + '/' + component_type + '/' + name)
+            set('Target', wm['target'])
+            set(attribute, int(value))
+            print("    " + component_type + ": " + attribute + "=" + str(value))
+        
+        cd(base)
+        create(wm['name'], 'WorkManager')
+        cd(base + '/WorkManager/' + wm['name'])
+        set('Target', wm['target'])
+        for component_type, name, attribute, value in components:
+            set(component_type, name)
+        set('IgnoreStuckThreads', wm['ignore_stuck_threads'])
+        
+        # Stuck thread action: suspend the work manager while too many of its
+        # threads are stuck, so one application cannot exhaust the server
+        if wm['stuck_thread_count']:
+            create(wm['name'] + '_stuck_threads', 'WorkManagerShutdownTrigger')
+            cd('WorkManagerShutdownTrigger/' + wm['name'] + '_stuck_threads')
+            set('StuckThreadCount', int(wm['stuck_thread_count']))
+            set('MaxStuckThreadTime', int(wm['stuck_thread_max_time'] or 600))
+            print("    Shutdown trigger: " + str(wm['stuck_thread_count']) + " stuck threads")
+
 def create_domain():
     """Create the WebLogic domain using offline WLST."""
     
@@ -978,6 +1717,7 @@ def create_domain():
             create(cluster['name'], 'Cluster')
             cd('/Cluster/' + cluster['name'])
             set('ClusterMessagingMode', cluster['messaging_mode'])
+            configure_cluster(cluster)
     else:
         print("\n[6/7] Clustering disabled - skipping cluster creation")
     
@@ -999,6 +1739,15 @@ def create_domain():
         if CLUSTERING_ENABLED and server['cluster']:
             set('Cluster', server['cluster'])
             print("    Assigned to cluster: " + server['cluster'])
+            configure_replication(server)
+    
+    if DYNAMIC_CLUSTERS:
+        print("\nCreating dynamic clusters...")
+        create_dynamic_clusters()
+    
+    if WORK_MANAGERS:
+        print("\nCreating work managers...")
+        create_work_managers()
     
     print("\nWriting domain to: " + DOMAIN_HOME)
     setOption('OverwriteDomain', 'true')
@@ -1010,8 +1759,12 @@ def create_domain():
     print("Domain Home: " + DOMAIN_HOME)
     print("Admin Server: " + ADMIN_SERVER_NAME + " (port " + str(ADMIN_PORT) + ")")
     print("Managed Servers: " + str(len(MANAGED_SERVERS)))
+    for dynamic in DYNAMIC_CLUSTERS:
+        print("Dynamic Servers: " + str(dynamic['size']) + " in " + dynamic['cluster'])
     if CLUSTERING_ENABLED:
         print("Clusters: " + str(len(CLUSTERS)))
+    if WORK_MANAGERS:
+        print("Work Managers: " + str(len(WORK_MANAGERS)))
     print("=" * 60)
 
 #===============================================================================
@@ -1043,12 +1796,7 @@ create_domain() {
     log_section "Creating WebLogic Domain"
     
     local mw_home=$(get_config "DOMAIN_MIDDLEWARE_HOME")
-    local wlst_script="${mw_home}/oracle_common/common/bin/wlst.sh"
-    
-    # Try alternative WLST location
-    if [[ ! -x "${wlst_script}" ]]; then
-        wlst_script="$(get_config "DOMAIN_WEBLOGIC_HOME")/common/bin/wlst.sh"
-    fi
+    local wlst_script=$(wls_tool "wlst.sh")
     
     if [[ ! -x "${wlst_script}" ]]; then
         log ERROR "WLST script not found"
@@ -1068,6 +1816,11 @@ create_domain() {
     export JAVA_HOME="$(get_config "DOMAIN_JAVA_HOME")"
     export MW_HOME="${mw_home}"
     
+    # An unchanged configuration was already built once: unpack that domain
+    if restore_cached_domain "${domain_home}"; then
+        return 0
+    fi
+    
     log INFO "Running WLST domain creation script..."
     log INFO "WLST: ${wlst_script}"
     log INFO "Script: ${GENERATED_DIR}/create-domain.py"
@@ -1087,9 +1840,179 @@ create_domain() {
     fi
     
     log INFO "Domain creation completed successfully"
+    
+    if [[ "$(get_config "OPTIONS_DOMAIN_CACHE" "true")" == "true" || ${#UNPACK_TARGETS[@]} -gt 0 ]]; then
+        pack_domain "${domain_home}" || log WARN "Domain not cached; the next run will rebuild it with WLST"
+    fi
+    return 0
+}
+
+# Path of a WebLogic command line tool (wlst.sh, pack.sh, unpack.sh)
+wls_tool() {
+    local tool="$1"
+    local tool_path="$(get_config "DOMAIN_MIDDLEWARE_HOME")/oracle_common/common/bin/${tool}"
+    
+    # Try alternative location
+    if [[ ! -x "${tool_path}" ]]; then
+        tool_path="$(get_config "DOMAIN_WEBLOGIC_HOME")/common/bin/${tool}"
+    fi
+    echo "${tool_path}"
+}
+
+#===============================================================================
+# DOMAIN TEMPLATE CACHE
+#===============================================================================
+
+# A created domain is packed twice under generated/cache/domains/<key>/:
+# domain.jar (the full domain, to restore it here) and managed.jar (the
+# managed server template for secondary hosts). The key is a hash of the
+# resolved configuration, overrides included, and of the script version.
+DOMAIN_CACHE_KEY=""
+DOMAIN_CACHE_DIR=""
+
+# Set DOMAIN_CACHE_KEY and DOMAIN_CACHE_DIR once the configuration is final
+set_domain_cache_key() {
+    local digest
+    digest=$(
+        {
+            echo "${MODEL_HASH:-interactive}"
+            for key in "${!CONFIG[@]}"; do
+                printf '%s=%s\n' "${key}" "${CONFIG[${key}]}"
+            done | sort
+        } | sha256sum
+    )
+    DOMAIN_CACHE_KEY="${digest%% *}"
+    DOMAIN_CACHE_DIR="${MODEL_CACHE_DIR}/domains/${DOMAIN_CACHE_KEY}"
+}
+
+# Unpack the cached domain.jar instead of running WLST; fails on a cache miss
+restore_cached_domain() {
+    local domain_home="$1"
+    local cache_dir="${DOMAIN_CACHE_DIR}"
+    
+    if [[ "${USE_CACHE}" != "true" || "$(get_config "OPTIONS_DOMAIN_CACHE" "true")" != "true" \
+            || ! -f "${cache_dir}/domain.jar" ]]; then
+        return 1
+    fi
+    
+    local unpack_script=$(wls_tool "unpack.sh")
+    if [[ ! -x "${unpack_script}" ]]; then
+        log WARN "unpack.sh not found, rebuilding the domain with WLST"
+        return 1
+    fi
+    
+    log INFO "Configuration unchanged since the domain was packed (${DOMAIN_CACHE_KEY:0:12})"
+    if [[ "${DRY_RUN}" == "true" ]]; then
+        log INFO "[DRY RUN] Would unpack ${cache_dir}/domain.jar to ${domain_home}"
+        return 0
+    fi
+    
+    log INFO "Unpacking cached domain template to ${domain_home}"
+    "${unpack_script}" -template="${cache_dir}/domain.jar" -domain="${domain_home}" \
+        -overwrite_domain=true 2>&1 | tee -a "${LOG_FILE}"
+    if [[ ${PIPESTATUS[0]} -ne 0 ]]; then
+        log WARN "Unpacking the cached domain failed, rebuilding it with WLST"
+        return 1
+    fi
+    
+    log INFO "Domain restored from cache"
+    return 0
+}
+
+# Pack the domain into domain.jar and managed.jar in the cache
+pack_domain() {
+    local domain_home="$1"
+    local domain_name=$(get_config "DOMAIN_DOMAIN_NAME")
+    local cache_dir="${DOMAIN_CACHE_DIR}"
+    local pack_script=$(wls_tool "pack.sh")
+    
+    if [[ ! -x "${pack_script}" ]]; then
+        log WARN "pack.sh not found"
+        return 1
+    fi
+    
+    # The templates hold the domain's encryption key and credentials, so
+    # they are private to the owner like the cached config model
+    log INFO "Packing domain templates: ${cache_dir}"
+    (umask 077 && mkdir -p "${cache_dir}") || return 1
+    chmod 700 "${cache_dir}" || return 1
+    rm -f "${cache_dir}"/*.jar.tmp
+    
+    # Written under a temporary name so a failed pack is never reused
+    (umask 077 && exec "${pack_script}" -domain="${domain_home}" -template="${cache_dir}/domain.jar.tmp" \
+        -template_name="${domain_name} domain") 2>&1 | tee -a "${LOG_FILE}"
+    [[ ${PIPESTATUS[0]} -eq 0 ]] || return 1
+    (umask 077 && exec "${pack_script}" -managed=true -domain="${domain_home}" -template="${cache_dir}/managed.jar.tmp" \
+        -template_name="${domain_name} managed servers") 2>&1 | tee -a "${LOG_FILE}"
+    [[ ${PIPESTATUS[0]} -eq 0 ]] || return 1
+    
+    chmod 600 "${cache_dir}/domain.jar.tmp" "${cache_dir}/managed.jar.tmp" || return 1
+    mv "${cache_dir}/domain.jar.tmp" "${cache_dir}/domain.jar"
+    mv "${cache_dir}/managed.jar.tmp" "${cache_dir}/managed.jar"
+    log INFO "Domain templates cached (${DOMAIN_CACHE_KEY:0:12})"
     return 0
 }
 
+# Unpack managed.jar onto each target in one step per target. A target is
+# host[:domain_home] (copied with scp, unpacked over ssh) or a local
+# directory (./dir or /dir), which stands in for a remote host.
+unpack_to_targets() {
+    log_section "Provisioning Secondary Hosts"
+    
+    local domain_home=$(get_config "DOMAIN_DOMAIN_HOME")
+    local cache_dir="${DOMAIN_CACHE_DIR}"
+    local template="${cache_dir}/managed.jar"
+    local unpack_script=$(wls_tool "unpack.sh")
+    local failed=0
+    
+    if [[ "${DRY_RUN}" == "true" ]]; then
+        for target in "${UNPACK_TARGETS[@]}"; do
+            log INFO "[DRY RUN] Would unpack ${template} to ${target}"
+        done
+        return 0
+    fi
+    
+    if [[ ! -f "${template}" ]]; then
+        log ERROR "Managed server template not found: ${template}"
+        return 1
+    fi
+    
+    for target in "${UNPACK_TARGETS[@]}"; do
+        local rc=0
+        if [[ "${target}" == /* || "${target}" == .* ]]; then
+            log INFO "Unpacking to local directory: ${target}"
+            "${unpack_script}" -template="${template}" -domain="${target}" \
+                -overwrite_domain=true >> "${LOG_FILE}" 2>&1 || rc=$?
+        else
+            local host="${target%%:*}"
+            local target_home="${domain_home}"
+            [[ "${target}" == *:* ]] && target_home="${target#*:}"
+            log INFO "Unpacking to ${host}:${target_home}"
+            # Staged in a private directory (mktemp -d is mode 700) and removed after
+            local remote_dir
+            remote_dir=$(ssh "${host}" "mktemp -d '/tmp/$(get_config "DOMAIN_DOMAIN_NAME")-unpack.XXXXXX'" 2>> "${LOG_FILE}")
+            if [[ -z "${remote_dir}" ]]; then
+                rc=1
+            else
+                scp -q "${template}" "${host}:${remote_dir}/managed.jar" >> "${LOG_FILE}" 2>&1 \
+                    && ssh "${host}" "'${unpack_script}' -template='${remote_dir}/managed.jar' -domain='${target_home}'" \
+                        "-overwrite_domain=true" >> "${LOG_FILE}" 2>&1 \
+                    || rc=$?
+                ssh "${host}" "rm -rf '${remote_dir}'" >> "${LOG_FILE}" 2>&1
+            fi
+        fi
+        
+        if [[ ${rc} -ne 0 ]]; then
+            log ERROR "Unpack failed for ${target} (see ${LOG_FILE})"
+            ((failed++))
+        else
+            log INFO "Domain ready on ${target}"
+        fi
+    done
+    
+    [[ ${failed} -eq 0 ]]
+}
+
 #===============================================================================
 # POST-CREATION TASKS
 #===============================================================================
@@ -1107,31 +2030,23 @@ create_boot_properties() {
         return 0
     fi
     
-    # Admin Server boot.properties
-    local admin_security_dir="${domain_home}/servers/${admin_server}/security"
-    mkdir -p "${admin_security_dir}"
-    cat > "${admin_security_dir}/boot.properties" << EOF
-username=${admin_user}
-password=${admin_password}
-EOF
-    chmod 600 "${admin_security_dir}/boot.properties"
-    log INFO "Created: ${admin_security_dir}/boot.properties"
-    
-    # Managed server boot.properties
-    local server_count=$(get_config "MANAGED_SERVERS_SERVER_COUNT" "0")
-    for ((i=1; i<=server_count; i++)); do
-        local server_def=$(get_config "MANAGED_SERVERS_SERVER${i}")
-        local server_name="${server_def%%:*}"
-        
-        local server_security_dir="${domain_home}/servers/${server_name}/security"
-        mkdir -p "${server_security_dir}"
-        cat > "${server_security_dir}/boot.properties" << EOF
-username=${admin_user}
-password=${admin_password}
-EOF
-        chmod 600 "${server_security_dir}/boot.properties"
-        log DEBUG "Created: ${server_security_dir}/boot.properties"
+    # Admin Server and managed servers. One mkdir and one chmod for all of
+    # them; the files are written by the shell itself, so the cost per
+    # server does not include forks, which slow down as the model grows.
+    local -a security_dirs=("${domain_home}/servers/${admin_server}/security")
+    for server_name in "${MODEL_SERVER_NAMES[@]}"; do
+        security_dirs+=("${domain_home}/servers/${server_name}/security")
     done
+    mkdir -p "${security_dirs[@]}" || return 1
+
+    local security_dir
+    for security_dir in "${security_dirs[@]}"; do
+        printf 'username=%s\npassword=%s\n' "${admin_user}" "${admin_password}" \
+            > "${security_dir}/boot.properties" || return 1
+    done
+    chmod 600 "${security_dirs[@]/%//boot.properties}" || return 1
+    log INFO "Created: ${security_dirs[0]}/boot.properties"
+    log DEBUG "Created: ${domain_home}/servers/<server>/security/boot.properties for ${#MODEL_SERVER_NAMES[@]} managed server(s)"
     
     log INFO "boot.properties files created for all servers"
     return 0
@@ -1176,7 +2091,7 @@ StopScriptEnabled=false
 QuitEnabled=false
 LogAppend=true
 StateCheckInterval=500
-CrashRecoveryEnabled=false
+CrashRecoveryEnabled=$(get_config "NODEMANAGER_CRASH_RECOVERY_ENABLED" "false")
 StartScriptEnabled=true
 LogFormatter=weblogic.nodemanager.server.LogFormatter
 ListenBacklog=50
@@ -1198,8 +2113,7 @@ generate_phase1_config() {
     local output_file="${GENERATED_DIR}/phase1-config.conf"
     local domain_name=$(get_config "DOMAIN_DOMAIN_NAME")
     local domain_home=$(get_config "DOMAIN_DOMAIN_HOME")
-    local host_count=$(get_config "HOSTS_HOST_COUNT" "1")
-    local server_count=$(get_config "MANAGED_SERVERS_SERVER_COUNT" "0")
+    local host_count=${#MODEL_HOSTS[@]}
     
     if [[ "${DRY_RUN}" == "true" ]]; then
         log INFO "[DRY RUN] Would generate Phase 1 configuration"
@@ -1237,28 +2151,19 @@ NM_TYPE=$(get_config "NODEMANAGER_TYPE" "PLAIN")
 
 EOF
 
-    # Add host-specific server assignments
-    for ((h=1; h<=host_count; h++)); do
-        local host=$(get_config "HOSTS_HOST${h}")
-        local machine_def=$(get_config "MACHINES_MACHINE${h}")
-        local machine_name="${machine_def%%:*}"
-        
-        # Find servers assigned to this machine
-        local host_servers=""
-        for ((s=1; s<=server_count; s++)); do
-            local server_def=$(get_config "MANAGED_SERVERS_SERVER${s}")
-            IFS=':' read -r s_name s_port s_machine s_cluster <<< "${server_def}"
-            if [[ "${s_machine}" == "${machine_name}" ]]; then
-                host_servers="${host_servers} ${s_name}"
-            fi
-        done
-        
-        cat >> "${output_file}" << EOF
-# Host ${h}: ${host}
-HOST${h}=${host}
-HOST${h}_SERVERS=${host_servers# }
-EOF
+    # Servers of every machine, in one pass over the servers
+    local -A machine_servers=()
+    for ((s=0; s<${#MODEL_SERVER_NAMES[@]}; s++)); do
+        machine_servers["${MODEL_SERVER_MACHINES[$s]}"]+=" ${MODEL_SERVER_NAMES[$s]}"
     done
+
+    # Add host-specific server assignments
+    for ((h=1; h<=${#MODEL_HOSTS[@]}; h++)); do
+        local host="${MODEL_HOSTS[$((h - 1))]}"
+        local host_servers="${machine_servers[${MODEL_MACHINE_NAMES[$((h - 1))]}]}"
+        printf '# Host %s: %s\nHOST%s=%s\nHOST%s_SERVERS=%s\n' \
+            "${h}" "${host}" "${h}" "${host}" "${h}" "${host_servers# }"
+    done >> "${output_file}"
     
     log INFO "Phase 1 configuration generated: ${output_file}"
     return 0
@@ -1270,6 +2175,8 @@ EOF
 
 main() {
     local start_time=$(date +%s)
+    now_us
+    local main_started=${NOW_US}
     
     # Parse command line arguments
     while [[ $# -gt 0 ]]; do
@@ -1302,6 +2209,18 @@ main() {
                 DRY_RUN=true
                 shift
                 ;;
+            --no-cache)
+                USE_CACHE=false
+                shift
+                ;;
+            --unpack-to)
+                UNPACK_TARGETS+=("$2")
+                shift 2
+                ;;
+            --timings)
+                TIMINGS_FILE="$2"
+                shift 2
+                ;;
             --verbose)
                 VERBOSE=true
                 shift
@@ -1320,6 +2239,10 @@ main() {
     
     # Initialize logging
     init_logging
+    if [[ -n "${TIMINGS_FILE}" ]] && ! : > "${TIMINGS_FILE}"; then
+        log ERROR "Cannot write phase timings to ${TIMINGS_FILE}"
+        exit 1
+    fi
     
     log_section "WebLogic Domain Creation - Phase 2"
     log INFO "Version: ${VERSION}"
@@ -1332,32 +2255,44 @@ main() {
         exit 1
     fi
     
-    # Load configuration
-    if [[ "${INTERACTIVE_MODE}" == "true" ]]; then
-        run_interactive_mode
-    else
-        if ! load_config_file "${CONFIG_FILE}"; then
+    # Load configuration: the cached model of an unchanged file, otherwise
+    # parse it, expand AUTO servers and compile the model once
+    if [[ "${INTERACTIVE_MODE}" == "true" ]] || ! timed load_config_model load_config_model; then
+        if [[ "${INTERACTIVE_MODE}" == "true" ]]; then
+            run_interactive_mode
+        elif ! timed load_config_file load_config_file "${CONFIG_FILE}"; then
             exit 1
         fi
+        
+        # Handle AUTO mode for managed servers
+        if [[ "$(get_config "MANAGED_SERVERS_MODE")" == "AUTO" ]]; then
+            if ! timed generate_auto_servers generate_auto_servers; then
+                exit 2
+            fi
+        fi
+        
+        timed compile_config_model compile_config_model
+        if [[ -n "${MODEL_HASH}" ]] && ! timed save_config_model save_config_model; then
+            log WARN "Could not cache configuration model in ${MODEL_CACHE_DIR}"
+        fi
     fi
     
-    # Apply command-line overrides
+    # Apply command-line overrides (never cached)
     apply_overrides
+    set_domain_cache_key
     
-    # Handle AUTO mode for managed servers
-    if [[ "$(get_config "MANAGED_SERVERS_MODE")" == "AUTO" ]]; then
-        if ! generate_auto_servers; then
-            exit 2
-        fi
+    # Secondary hosts provisioned from the packed managed server template
+    if [[ "$(get_config "OPTIONS_UNPACK_SECONDARY_HOSTS" "false")" == "true" ]]; then
+        UNPACK_TARGETS+=("${MODEL_HOSTS[@]:1}")
     fi
     
     # Validation
     if [[ "${SKIP_VALIDATION}" != "true" ]]; then
-        if ! validate_configuration; then
+        if ! timed validate_configuration validate_configuration; then
             exit 2
         fi
         
-        if ! validate_environment; then
+        if ! timed validate_environment validate_environment; then
             exit 2
         fi
     fi
@@ -1369,13 +2304,13 @@ main() {
     fi
     
     # Generate scripts from templates
-    if ! generate_scripts; then
+    if ! timed generate_scripts generate_scripts; then
         log ERROR "Script generation failed"
         exit 1
     fi
     
     # Create the domain
-    if ! create_domain; then
+    if ! timed create_domain create_domain; then
         log ERROR "Domain creation failed"
         log ERROR "Check log file for details: ${LOG_FILE}"
         exit 1
@@ -1383,13 +2318,18 @@ main() {
     
     # Post-creation tasks
     if [[ "$(get_config "OPTIONS_CREATE_BOOT_PROPERTIES" "true")" == "true" ]]; then
-        create_boot_properties
+        timed create_boot_properties create_boot_properties
     fi
     
-    configure_nodemanager
+    timed configure_nodemanager configure_nodemanager
     
     if [[ "$(get_config "OPTIONS_GENERATE_AUTOSTART_CONFIG" "true")" == "true" ]]; then
-        generate_phase1_config
+        timed generate_phase1_config generate_phase1_config
+    fi
+    
+    if [[ ${#UNPACK_TARGETS[@]} -gt 0 ]] && ! timed unpack_to_targets unpack_to_targets; then
+        log ERROR "Secondary host provisioning failed; re-run with --unpack-to to retry"
+        exit 1
     fi
     
     # Calculate elapsed time
@@ -1407,6 +2347,10 @@ main() {
     fi
     log INFO "Elapsed time: ${elapsed} seconds"
     log INFO "Log file: ${LOG_FILE}"
+    if [[ -n "${TIMINGS_FILE}" ]]; then
+        record_timing total "${main_started}" 0
+        log INFO "Phase timings: ${TIMINGS_FILE}"
+    fi
     
     echo ""
     echo -e "${GREEN}========================================${NC}"
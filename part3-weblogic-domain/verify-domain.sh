@@ -27,6 +27,23 @@ echo " WebLogic Domain Verification"
 echo "========================================"
 echo ""
 
+# Fast path: ask the WLST agent (Part 4) when it is running - no JVM,
+# no password prompt. Exit code 3 means the agent is not available.
+AGENT_CLIENT="/u01/app/eppm/scripts/wlst-client.py"
+if [[ -f "${AGENT_CLIENT}" ]]; then
+    python3 "${AGENT_CLIENT}" state
+    RESULT=$?
+    if [[ ${RESULT} -ne 3 ]]; then
+        echo ""
+        if [ ${RESULT} -eq 0 ]; then
+            echo -e "${GREEN}✓ Domain verification passed${NC}"
+        else
+            echo -e "${YELLOW}⚠ Some servers are not running${NC}"
+        fi
+        exit ${RESULT}
+    fi
+fi
+
 # Prompt for password
 read -sp "Enter WebLogic admin password: " ADMIN_PASSWORD
 echo ""
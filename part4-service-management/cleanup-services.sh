@@ -64,7 +64,7 @@ echo "[1/6] Stopping WebLogic services..."
 echo "============================================================"
 
 # Stop services in reverse dependency order
-for service in weblogic-managedservers weblogic-adminserver weblogic-nodemanager; do
+for service in weblogic-watchdog weblogic-metrics weblogic-managedservers weblogic-wlst-agent weblogic-adminserver weblogic-nodemanager; do
     if systemctl is-active --quiet "${service}" 2>/dev/null; then
         echo "  Stopping ${service}..."
         systemctl stop "${service}" || true
@@ -79,7 +79,7 @@ echo "============================================================"
 echo "[2/6] Disabling WebLogic services..."
 echo "============================================================"
 
-for service in weblogic-managedservers weblogic-adminserver weblogic-nodemanager; do
+for service in weblogic-watchdog weblogic-metrics weblogic-managedservers weblogic-wlst-agent weblogic-adminserver weblogic-nodemanager; do
     if systemctl is-enabled --quiet "${service}" 2>/dev/null; then
         echo "  Disabling ${service}..."
         systemctl disable "${service}" || true
@@ -94,7 +94,7 @@ echo "============================================================"
 echo "[3/6] Removing systemd service files..."
 echo "============================================================"
 
-for service_file in weblogic-nodemanager.service weblogic-adminserver.service weblogic-managedservers.service; do
+for service_file in weblogic-nodemanager.service weblogic-adminserver.service weblogic-wlst-agent.service weblogic-metrics.service weblogic-watchdog.service weblogic-managedservers.service; do
     if [[ -f "/etc/systemd/system/${service_file}" ]]; then
         echo "  Removing /etc/systemd/system/${service_file}..."
         rm -f "/etc/systemd/system/${service_file}"
@@ -125,6 +125,18 @@ else
     echo "  ${SCRIPTS_DIR} not found (skipping)"
 fi
 
+# Log search index (log_index.py) - rebuilt from the logs on next use
+rm -rf /u01/app/eppm/log-index
+
+# Metrics export (collect-metrics.py)
+rm -rf /u01/app/eppm/metrics
+
+# Watchdog action log (server-watchdog.py)
+rm -rf /u01/app/eppm/watchdog
+
+# Lifecycle timing history (lifecycle_timing.py)
+rm -rf /u01/app/eppm/timing
+
 echo ""
 echo "============================================================"
 echo "[5/6] Removing WLST credential store files..."
@@ -0,0 +1,352 @@
+#!/usr/bin/env python
+# =============================================================================
+# collect-metrics.py
+# WebLogic runtime metrics collector with Prometheus text export
+#
+# Connects to the Admin Server once and polls the Domain Runtime MBean
+# server for every running server:
+#   ThreadPoolRuntime      throughput, queue length, pending, hogging and
+#                          stuck threads, completed requests
+#   JVMRuntime             heap size/free/max, uptime
+#   ServerRuntime          state, open sockets
+#   WorkManagerRuntime     completed/pending requests and stuck threads per
+#                          application
+#   WebAppComponentRuntime open and total sessions per web application
+#
+# Cost is kept flat as servers are added:
+#   - MBean names are discovered with one queryNames per MBean type for the
+#     whole domain, and only rediscovered every rediscover_every polls or
+#     when a server joins or leaves
+#   - each MBean is read with a single getAttributes call
+#   - servers are polled in parallel on a Java thread pool, so a poll takes
+#     as long as the slowest server rather than the sum of all of them
+# The connection, discovery and polling are shared with server-watchdog.py
+# in domain_runtime.py.
+#
+# The last ring_size samples of each server are kept in a ring buffer and
+# used for derived rates (requests per second). Metrics are written in
+# Prometheus text format to metrics_file (for the node_exporter textfile
+# collector) and served on http://<metrics_address>:metrics_port/metrics.
+# The endpoint has no authentication, so it listens on 127.0.0.1 only unless
+# --bind gives another address (e.g. for a remote Prometheus).
+#
+# Run by weblogic-metrics.service on prmapp01, or by hand:
+#   wlst.sh collect-metrics.py [--once] [--interval 30] [--bind 127.0.0.1] [--port 9798]
+#
+# Zero to Enterprise: P6 EPPM 25.12 with SSO - Part 4
+# Integration Faces - https://integrationfaces.com
+# Benjamin Mukoro & AI Assistant
+# =============================================================================
+
+import sys
+import os
+import time
+from collections import deque
+from java.lang import String
+from java.net import InetSocketAddress
+from java.util.concurrent import Executors, TimeUnit
+from com.sun.net.httpserver import HttpHandler, HttpServer
+
+# Connection parameters
+admin_url = 't3://prmapp01:7001'
+
+# Credential store files (created by store-credentials.py)
+credential_dir = '/u01/app/eppm/scripts'
+config_file = credential_dir + '/wlconfig'
+key_file = credential_dir + '/wlkey'
+
+# Collection
+poll_interval = 30          # seconds between polls
+poll_timeout = 20           # seconds allowed for one poll of all servers
+pool_size = 16              # polling threads (>= number of servers keeps polls flat)
+ring_size = 20              # samples kept per server
+rediscover_every = 20       # polls between MBean rediscovery
+
+# Export
+metrics_file = '/u01/app/eppm/metrics/weblogic.prom'
+metrics_address = '127.0.0.1'  # HTTP endpoint address; 0.0.0.0 exposes it to the network
+metrics_port = 9798         # 0 disables the HTTP endpoint
+run_once = False
+
+args = sys.argv[1:]
+while args:
+    arg = args.pop(0)
+    if arg == '--once':
+        run_once = True
+    elif arg == '--interval':
+        poll_interval = int(args.pop(0))
+    elif arg == '--bind':
+        metrics_address = args.pop(0)
+    elif arg == '--port':
+        metrics_port = int(args.pop(0))
+    elif arg == '--file':
+        metrics_file = args.pop(0)
+
+# domain_runtime.py and domain_topology.py are installed next to the credentials
+sys.path.append(credential_dir)
+import domain_runtime
+
+try:
+    import domain_topology
+    admin_url = domain_topology.admin_url(domain_topology.load_topology()) or admin_url
+except Exception, e:
+    print('WARNING: config.xml unavailable (' + str(e) + '), using ' + admin_url)
+
+# MBean types and the attributes read from each (one getAttributes per MBean)
+mbean_types = {
+    'ServerRuntime': ['State', 'OpenSocketsCurrentCount'],
+    'ThreadPoolRuntime': ['CompletedRequestCount', 'ExecuteThreadTotalCount',
+                          'ExecuteThreadIdleCount', 'HoggingThreadCount', 'StuckThreadCount',
+                          'StandbyThreadCount', 'PendingUserRequestCount', 'QueueLength',
+                          'Throughput'],
+    'JVMRuntime': ['HeapSizeCurrent', 'HeapFreeCurrent', 'HeapSizeMax', 'Uptime'],
+    'WorkManagerRuntime': ['CompletedRequests', 'PendingRequests', 'StuckThreadCount'],
+    'WebAppComponentRuntime': ['ContextRoot', 'OpenSessionsCurrentCount', 'SessionsOpenedTotalCount']
+}
+
+# (metric, MBean type, attribute, Prometheus type, help)
+metric_specs = [
+    ('weblogic_server_open_sockets', 'ServerRuntime', 'OpenSocketsCurrentCount', 'gauge',
+     'Open sockets'),
+    ('weblogic_threadpool_completed_requests_total', 'ThreadPoolRuntime', 'CompletedRequestCount',
+     'counter', 'Requests completed by the self-tuning thread pool'),
+    ('weblogic_threadpool_throughput', 'ThreadPoolRuntime', 'Throughput', 'gauge',
+     'Requests completed per second (WebLogic average)'),
+    ('weblogic_threadpool_execute_threads', 'ThreadPoolRuntime', 'ExecuteThreadTotalCount', 'gauge',
+     'Execute threads'),
+    ('weblogic_threadpool_idle_threads', 'ThreadPoolRuntime', 'ExecuteThreadIdleCount', 'gauge',
+     'Idle execute threads'),
+    ('weblogic_threadpool_hogging_threads', 'ThreadPoolRuntime', 'HoggingThreadCount', 'gauge',
+     'Threads held by one request for a long time'),
+    ('weblogic_threadpool_stuck_threads', 'ThreadPoolRuntime', 'StuckThreadCount', 'gauge',
+     'Threads stuck longer than StuckThreadMaxTime'),
+    ('weblogic_threadpool_standby_threads', 'ThreadPoolRuntime', 'StandbyThreadCount', 'gauge',
+     'Standby threads'),
+    ('weblogic_threadpool_pending_user_requests', 'ThreadPoolRuntime', 'PendingUserRequestCount',
+     'gauge', 'User requests waiting for a thread'),
+    ('weblogic_threadpool_queue_length', 'ThreadPoolRuntime', 'QueueLength', 'gauge',
+     'Requests in the thread pool queue'),
+    ('weblogic_jvm_heap_size_bytes', 'JVMRuntime', 'HeapSizeCurrent', 'gauge', 'Current heap size'),
+    ('weblogic_jvm_heap_free_bytes', 'JVMRuntime', 'HeapFreeCurrent', 'gauge', 'Free heap'),
+    ('weblogic_jvm_heap_max_bytes', 'JVMRuntime', 'HeapSizeMax', 'gauge', 'Maximum heap size'),
+    ('weblogic_jvm_uptime_seconds', 'JVMRuntime', 'Uptime', 'gauge', 'JVM uptime')
+]
+
+app_metric_specs = [
+    ('weblogic_app_completed_requests_total', 'WorkManagerRuntime', 'CompletedRequests', 'counter',
+     'Requests completed by the application work manager'),
+    ('weblogic_app_pending_requests', 'WorkManagerRuntime', 'PendingRequests', 'gauge',
+     'Requests waiting in the application work manager'),
+    ('weblogic_app_stuck_threads', 'WorkManagerRuntime', 'StuckThreadCount', 'gauge',
+     'Stuck threads of the application work manager'),
+    ('weblogic_webapp_open_sessions', 'WebAppComponentRuntime', 'OpenSessionsCurrentCount', 'gauge',
+     'Open HTTP sessions'),
+    ('weblogic_webapp_sessions_opened_total', 'WebAppComponentRuntime', 'SessionsOpenedTotalCount',
+     'counter', 'HTTP sessions opened')
+]
+
+
+def log(message):
+    print(time.strftime('%Y-%m-%d %H:%M:%S') + ' ' + message)
+    sys.stdout.flush()
+
+
+class MetricsHandler(HttpHandler):
+    """Serves the latest metrics text on /metrics"""
+
+    def __init__(self, collector):
+        self.collector = collector
+
+    def handle(self, exchange):
+        try:
+            body = String(self.collector.text).getBytes('UTF-8')
+            exchange.getResponseHeaders().set('Content-Type', 'text/plain; version=0.0.4')
+            exchange.sendResponseHeaders(200, len(body))
+            stream = exchange.getResponseBody()
+            stream.write(body)
+            stream.close()
+        finally:
+            exchange.close()
+
+
+class Collector(object):
+    def __init__(self):
+        self.executor = Executors.newFixedThreadPool(pool_size)
+        self.buffers = {}           # server -> deque of samples
+        self.names = {}
+        self.polls = 0
+        self.errors = 0
+        self.last_duration = 0.0
+        self.states = {}
+        self.text = '# no data collected yet\n'
+
+    def poll(self):
+        started = time.time()
+        if self.polls % rediscover_every == 0 or not self.names:
+            self.names = admin.discover(mbean_types)
+        self.states = admin.lifecycle_states()
+        running = [s for s in self.states.keys() if self.states[s] == 'RUNNING']
+        if sorted(running) != sorted(self.names.keys()):
+            self.names = admin.discover(mbean_types)     # a server started or stopped
+
+        tasks = [admin.server_poll(server, names, mbean_types) for server, names in self.names.items()]
+        for future in self.executor.invokeAll(tasks, poll_timeout, TimeUnit.SECONDS):
+            if future.isCancelled():
+                self.errors += 1
+                continue
+            sample = future.get()
+            if sample['error']:
+                self.errors += 1
+                log('Poll of ' + sample['server'] + ' failed: ' + sample['error'])
+                continue
+            buffer = self.buffers.get(sample['server'])
+            if buffer is None:
+                buffer = deque(maxlen=ring_size)
+                self.buffers[sample['server']] = buffer
+            buffer.append(sample)
+
+        self.polls += 1
+        self.last_duration = time.time() - started
+        self.text = self.render()
+
+    def request_rate(self, server):
+        """Requests/second over the ring buffer (0 after a restart)"""
+        buffer = self.buffers.get(server)
+        if not buffer or len(buffer) < 2:
+            return None
+        first = thread_pool_value(buffer[0], 'CompletedRequestCount')
+        last = thread_pool_value(buffer[-1], 'CompletedRequestCount')
+        elapsed = buffer[-1]['time'] - buffer[0]['time']
+        if first is None or last is None or elapsed <= 0 or last < first:
+            return None
+        return (last - first) / elapsed
+
+    def render(self):
+        lines = []
+        fresh = {}
+        for server, buffer in self.buffers.items():
+            if buffer and server in self.names and time.time() - buffer[-1]['time'] < 3 * poll_interval:
+                fresh[server] = buffer[-1]
+
+        add_metric(lines, 'weblogic_up', 'gauge', 'Server answered the last poll',
+                   [({'server': s}, s in fresh and 1 or 0) for s in sorted(self.states.keys())])
+        add_metric(lines, 'weblogic_server_state', 'gauge', 'Lifecycle state (1 for the current state)',
+                   [({'server': s, 'state': self.states[s]}, 1) for s in sorted(self.states.keys())])
+
+        for metric, mbean_type, attribute, kind, text in metric_specs:
+            samples = []
+            for server in sorted(fresh.keys()):
+                for sample_type, name, values in fresh[server]['mbeans']:
+                    if sample_type == mbean_type and values.get(attribute) is not None:
+                        value = values[attribute]
+                        if attribute == 'Uptime':
+                            value = value / 1000.0
+                        samples.append(({'server': server}, value))
+            add_metric(lines, metric, kind, text, samples)
+
+        for metric, mbean_type, attribute, kind, text in app_metric_specs:
+            samples = []
+            for server in sorted(fresh.keys()):
+                for sample_type, name, values in fresh[server]['mbeans']:
+                    if sample_type != mbean_type or values.get(attribute) is None:
+                        continue
+                    labels = {'server': server,
+                              'application': name.getKeyProperty('ApplicationRuntime') or ''}
+                    if mbean_type == 'WorkManagerRuntime':
+                        labels['workmanager'] = name.getKeyProperty('Name')
+                    else:
+                        labels['context'] = values.get('ContextRoot') or ''
+                    samples.append((labels, values[attribute]))
+            add_metric(lines, metric, kind, text, samples)
+
+        rates = [({'server': s}, self.request_rate(s)) for s in sorted(fresh.keys())]
+        add_metric(lines, 'weblogic_threadpool_requests_per_second', 'gauge',
+                   'Completed requests per second over the collector ring buffer',
+                   [(labels, rate) for labels, rate in rates if rate is not None])
+
+        add_metric(lines, 'weblogic_collector_poll_seconds', 'gauge', 'Duration of the last poll',
+                   [({}, self.last_duration)])
+        add_metric(lines, 'weblogic_collector_polls_total', 'counter', 'Polls completed',
+                   [({}, self.polls)])
+        add_metric(lines, 'weblogic_collector_errors_total', 'counter', 'Server polls that failed',
+                   [({}, self.errors)])
+        return '\n'.join(lines) + '\n'
+
+
+def thread_pool_value(sample, attribute):
+    for mbean_type, name, values in sample['mbeans']:
+        if mbean_type == 'ThreadPoolRuntime':
+            return values.get(attribute)
+    return None
+
+
+def add_metric(lines, metric, kind, text, samples):
+    lines.append('# HELP ' + metric + ' ' + text)
+    lines.append('# TYPE ' + metric + ' ' + kind)
+    for labels, value in samples:
+        label_text = ','.join(['%s="%s"' % (k, str(labels[k]).replace('\\', '\\\\').replace('"', '\\"'))
+                               for k in sorted(labels.keys())])
+        if label_text:
+            label_text = '{' + label_text + '}'
+        if isinstance(value, float):
+            value_text = repr(value)
+        else:
+            value_text = str(value)
+        lines.append(metric + label_text + ' ' + value_text)
+
+
+def write_metrics_file(text):
+    """Write atomically so the textfile collector never reads half a file"""
+    if not metrics_file:
+        return
+    directory = os.path.dirname(metrics_file)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    temp_file = metrics_file + '.tmp'
+    f = open(temp_file, 'w')
+    try:
+        f.write(text)
+    finally:
+        f.close()
+    os.rename(temp_file, metrics_file)
+
+
+def start_http(collector):
+    server = HttpServer.create(InetSocketAddress(metrics_address, metrics_port), 0)
+    server.createContext('/metrics', MetricsHandler(collector))
+    server.setExecutor(None)
+    server.start()
+    log('Serving metrics on http://' + metrics_address + ':' + str(metrics_port) + '/metrics')
+    return server
+
+
+# Main
+admin = domain_runtime.AdminConnection(globals(), admin_url, config_file, key_file, log)
+admin.connect()
+collector = Collector()
+
+if run_once:
+    collector.poll()
+    write_metrics_file(collector.text)
+    print(collector.text)
+    collector.executor.shutdownNow()
+    disconnect()
+    exit()
+
+http_server = None
+if metrics_port:
+    http_server = start_http(collector)
+
+log('Polling every ' + str(poll_interval) + 's')
+while True:
+    try:
+        collector.poll()
+        write_metrics_file(collector.text)
+    except Exception, e:
+        log('Poll failed (' + str(e) + '), reconnecting')
+        try:
+            admin.reconnect()
+            collector.names = {}
+        except Exception, e:
+            log('Reconnect failed: ' + str(e))
+    time.sleep(max(1, poll_interval - collector.last_duration))
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# =============================================================================
+# domain_runtime.py
+# Admin Server connection and parallel runtime MBean polling for WLST daemons
+#
+# Shared by collect-metrics.py and server-watchdog.py, which both keep one
+# connection to the Admin Server open and poll every running server:
+#   - MBean names are discovered with one queryNames per MBean type for the
+#     whole domain
+#   - each MBean is read with a single getAttributes call
+#   - ServerPoll reads one server and runs on a Java thread pool, so a poll
+#     takes as long as the slowest server rather than the sum of all of them
+#
+# WLST only (Jython 2.7). connect(), disconnect(), domainRuntime() and mbs
+# exist in the calling script's namespace, not in imported modules, so the
+# script passes its globals():
+#   import domain_runtime
+#   admin = domain_runtime.AdminConnection(globals(), admin_url, config_file,
+#                                          key_file, log)
+#   admin.connect()
+#   states = admin.lifecycle_states()
+#
+# Zero to Enterprise: P6 EPPM 25.12 with SSO - Part 4
+# Integration Faces - https://integrationfaces.com
+# Benjamin Mukoro & AI Assistant
+# =============================================================================
+
+import time
+from java.util.concurrent import Callable
+from javax.management import ObjectName
+
+
+class AdminConnection:
+    """Connection to the domain runtime tree of the Admin Server"""
+
+    def __init__(self, wlst, url, config_file, key_file, log):
+        self.wlst = wlst
+        self.url = url
+        self.config_file = config_file
+        self.key_file = key_file
+        self.log = log
+
+    def mbs(self):
+        # WLST rebinds mbs on every connect
+        return self.wlst['mbs']
+
+    def connect(self):
+        """(Re)connect to the Admin Server and switch to the domain runtime tree"""
+        self.log('Connecting to Admin Server at ' + self.url)
+        self.wlst['connect'](userConfigFile=self.config_file, userKeyFile=self.key_file, url=self.url)
+        self.wlst['domainRuntime']()
+        self.log('Connected')
+
+    def disconnect(self):
+        self.wlst['disconnect']()
+
+    def reconnect(self):
+        try:
+            self.disconnect()
+        except:
+            pass
+        self.connect()
+
+    def lifecycle_states(self):
+        """State of every configured server, running or not"""
+        mbs = self.mbs()
+        states = {}
+        for name in mbs.queryNames(ObjectName('com.bea:Type=ServerLifeCycleRuntime,*'), None):
+            states[name.getKeyProperty('Name')] = str(mbs.getAttribute(name, 'State'))
+        return states
+
+    def discover(self, mbean_types):
+        """ObjectNames per running server: {server: [(type, ObjectName), ...]}
+
+        One queryNames per MBean type covers every running server.
+        """
+        servers = {}
+        for mbean_type in mbean_types.keys():
+            for name in self.mbs().queryNames(ObjectName('com.bea:Type=' + mbean_type + ',*'), None):
+                location = name.getKeyProperty('Location')
+                if not location:
+                    continue
+                if mbean_type == 'WorkManagerRuntime' and not name.getKeyProperty('ApplicationRuntime'):
+                    continue        # server-level work managers; covered by the thread pool
+                servers.setdefault(location, []).append((mbean_type, name))
+        return servers
+
+    def server_poll(self, server, names, mbean_types):
+        return ServerPoll(self.mbs(), server, names, mbean_types)
+
+
+class ServerPoll(Callable):
+    """Reads all MBeans of one server; runs on the thread pool
+
+    The sample is {'server', 'time', 'mbeans': [(type, ObjectName, {attribute:
+    value})], 'error'}.
+    """
+
+    def __init__(self, mbs, server, names, mbean_types):
+        self.mbs = mbs
+        self.server = server
+        self.names = names
+        self.mbean_types = mbean_types
+
+    def call(self):
+        sample = {'server': self.server, 'time': time.time(), 'mbeans': [], 'error': None}
+        try:
+            for mbean_type, name in self.names:
+                values = {}
+                for attribute in self.mbs.getAttributes(name, self.mbean_types[mbean_type]).asList():
+                    values[attribute.getName()] = attribute.getValue()
+                sample['mbeans'].append((mbean_type, name, values))
+        except Exception, e:
+            sample['error'] = str(e)
+        return sample
@@ -0,0 +1,420 @@
+#!/usr/bin/env python
+# =============================================================================
+# domain_topology.py
+# Offline WebLogic domain topology from config.xml, cached on disk
+#
+# Stream-parses $DOMAIN_HOME/config/config.xml (no WLST connection needed)
+# for servers, machines, clusters, application deployments and listen ports,
+# and builds a host -> managed servers index. A server's host is the Node
+# Manager listen address of its machine, falling back to the server's own
+# listen address. Dynamic cluster members have no <server> element; they
+# are calculated from the server template the way WebLogic names, numbers
+# and places them.
+#
+# The result is cached as JSON next to the scripts. The cache is reused while
+# config.xml has the same mtime and size; if only the mtime changed (e.g. the
+# file was re-synced from the Admin Server) the content hash decides.
+#
+# Works under both WLST (Jython 2.7) and python3:
+#   import domain_topology
+#   topology = domain_topology.load_topology()
+#   servers = domain_topology.servers_for_host(topology, 'prmapp01')
+#
+# Command line:
+#   python3 domain_topology.py [--host prmapp01] [--json] [--refresh]
+#                              [--config config.xml] [--cache cache.json]
+#
+# Zero to Enterprise: P6 EPPM 25.12 with SSO - Part 4
+# Integration Faces - https://integrationfaces.com
+# Benjamin Mukoro & AI Assistant
+# =============================================================================
+
+from __future__ import print_function
+
+import fnmatch
+import hashlib
+import json
+import os
+import sys
+import xml.sax
+
+DOMAIN_HOME = '/u01/app/weblogic/user_projects/domains/eppm_domain'
+CONFIG_XML = DOMAIN_HOME + '/config/config.xml'
+CACHE_FILE = '/u01/app/eppm/scripts/.topology-cache.json'
+CACHE_VERSION = 2
+
+DEFAULT_LISTEN_PORT = 7001
+DEFAULT_NM_PORT = 5556
+
+# config.xml elements collected, relative to the element that owns them
+SERVER_FIELDS = ('name', 'listen-port', 'listen-address', 'machine', 'cluster')
+MACHINE_TAGS = ('machine', 'unix-machine')
+APP_FIELDS = ('name', 'source-path', 'staging-mode', 'version-identifier', 'module-type')
+DYNAMIC_FIELDS = ('server-template', 'dynamic-cluster-size', 'server-name-prefix',
+                  'calculated-listen-ports', 'calculated-machine-names',
+                  'machine-name-match-expression')
+
+
+class ConfigHandler(xml.sax.ContentHandler):
+    """Collects the parts of config.xml the lifecycle scripts need
+
+    Only direct children of the top-level elements are read, so nested
+    elements such as <ssl><listen-port> do not overwrite a server's own
+    listen port.
+    """
+
+    def __init__(self):
+        xml.sax.ContentHandler.__init__(self)
+        self.path = []
+        self.text = []
+        self.current = None
+        self.domain = {'name': None, 'admin-server-name': None}
+        self.servers = []
+        self.templates = []
+        self.machines = []
+        self.clusters = []
+        self.applications = []
+
+    def startElement(self, name, attrs):
+        tag = name.split(':')[-1]
+        self.path.append(tag)
+        self.text = []
+        if len(self.path) != 2:
+            return
+        if tag == 'server':
+            self.current = {'ssl-listen-port': None}
+            self.servers.append(self.current)
+        elif tag == 'server-template':
+            self.current = {'ssl-listen-port': None}
+            self.templates.append(self.current)
+        elif tag in MACHINE_TAGS:
+            self.current = {}
+            self.machines.append(self.current)
+        elif tag == 'cluster':
+            self.current = {}
+            self.clusters.append(self.current)
+        elif tag == 'app-deployment':
+            self.current = {'targets': []}
+            self.applications.append(self.current)
+        else:
+            self.current = None
+
+    def characters(self, content):
+        self.text.append(content)
+
+    def endElement(self, name):
+        value = ''.join(self.text).strip()
+        self.text = []
+        path = self.path
+        owner = path[1] if len(path) > 1 else None
+
+        if len(path) == 2 and path[1] in ('name', 'admin-server-name'):
+            self.domain[path[1]] = value
+        elif len(path) == 3 and self.current is not None:
+            field = path[2]
+            if owner in ('server', 'server-template') and field in SERVER_FIELDS:
+                self.current[field] = value
+            elif owner in MACHINE_TAGS and field == 'name':
+                self.current['name'] = value
+            elif owner == 'cluster' and field in ('name', 'cluster-address'):
+                self.current[field] = value
+            elif owner == 'app-deployment' and field == 'target':
+                self.current['targets'].extend([t.strip() for t in value.split(',') if t.strip()])
+            elif owner == 'app-deployment' and field in APP_FIELDS:
+                self.current[field] = value
+        elif len(path) == 4 and self.current is not None:
+            if owner in ('server', 'server-template') and path[2] == 'ssl' and path[3] == 'listen-port':
+                self.current['ssl-listen-port'] = value
+            elif owner == 'cluster' and path[2] == 'dynamic-servers' and path[3] in DYNAMIC_FIELDS:
+                self.current.setdefault('dynamic-servers', {})[path[3]] = value
+            elif owner in MACHINE_TAGS and path[2] == 'node-manager' and \
+                    path[3] in ('listen-address', 'listen-port', 'nm-type'):
+                self.current['nm-' + path[3].replace('nm-', '')] = value
+        path.pop()
+
+
+def short_host(address):
+    """Host name without domain suffix, matching socket.gethostname() use"""
+    if not address:
+        return None
+    if address.replace('.', '').isdigit():
+        return address
+    return address.split('.')[0]
+
+
+def to_int(value, default):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def dynamic_servers(handler, machine_names):
+    """Server elements of the dynamic cluster members, as WebLogic calculates them
+
+    Member N is <prefix>N. With calculated listen ports it listens on the
+    template ports + N; with calculated machine names it is placed
+    round-robin on the machines matching the expression (all by default).
+    """
+    templates = {}
+    for template in handler.templates:
+        templates[template['name']] = template
+    servers = []
+    for cluster in handler.clusters:
+        dynamic = cluster.get('dynamic-servers')
+        if not dynamic or dynamic.get('server-template') not in templates:
+            continue
+        template = templates[dynamic['server-template']]
+        machines = []
+        if dynamic.get('calculated-machine-names') == 'true':
+            patterns = [p.strip() for p in (dynamic.get('machine-name-match-expression') or '*').split(',')]
+            machines = [m for m in machine_names if any([fnmatch.fnmatchcase(m, p) for p in patterns if p])]
+        calculated_ports = dynamic.get('calculated-listen-ports') != 'false'
+        for index in range(1, to_int(dynamic.get('dynamic-cluster-size'), 0) + 1):
+            server = {'name': (dynamic.get('server-name-prefix') or cluster['name'] + '-') + str(index),
+                      'listen-address': template.get('listen-address'),
+                      'listen-port': template.get('listen-port'),
+                      'ssl-listen-port': template.get('ssl-listen-port'),
+                      'machine': machines[(index - 1) % len(machines)] if machines else None,
+                      'cluster': cluster['name']}
+            if calculated_ports:
+                server['listen-port'] = to_int(template.get('listen-port'), DEFAULT_LISTEN_PORT) + index
+                if server['ssl-listen-port']:
+                    server['ssl-listen-port'] = to_int(server['ssl-listen-port'], 0) + index
+            servers.append(server)
+    return servers
+
+
+def build_topology(handler):
+    """Turn the parsed elements into the indexed topology dict"""
+    machines = {}
+    for machine in handler.machines:
+        machines[machine['name']] = {
+            'host': short_host(machine.get('nm-listen-address')),
+            'nm_port': to_int(machine.get('nm-listen-port'), DEFAULT_NM_PORT),
+            'nm_type': machine.get('nm-type') or 'SSL'
+        }
+
+    admin_name = handler.domain.get('admin-server-name') or 'AdminServer'
+    servers = {}
+    order = []
+    machine_names = [machine['name'] for machine in handler.machines]
+    for server in handler.servers + dynamic_servers(handler, machine_names):
+        name = server['name']
+        machine = server.get('machine') or None
+        host = None
+        if machine and machine in machines:
+            host = machines[machine]['host']
+        if not host:
+            host = short_host(server.get('listen-address'))
+        servers[name] = {
+            'listen_address': server.get('listen-address') or '',
+            'listen_port': to_int(server.get('listen-port'), DEFAULT_LISTEN_PORT),
+            'ssl_listen_port': to_int(server.get('ssl-listen-port'), None),
+            'machine': machine,
+            'cluster': server.get('cluster') or None,
+            'host': host
+        }
+        order.append(name)
+
+    clusters = {}
+    for cluster in handler.clusters:
+        clusters[cluster['name']] = {
+            'address': cluster.get('cluster-address') or None,
+            'servers': [name for name in order if servers[name]['cluster'] == cluster['name']]
+        }
+
+    hosts = {}
+    for name in order:
+        if name == admin_name:
+            continue
+        host = servers[name]['host']
+        if host:
+            hosts.setdefault(host, []).append(name)
+
+    applications = {}
+    for app in handler.applications:
+        applications[app['name']] = {
+            'targets': app['targets'],
+            'source_path': app.get('source-path'),
+            'staging_mode': app.get('staging-mode'),
+            'version': app.get('version-identifier') or None
+        }
+
+    return {
+        'domain': handler.domain.get('name'),
+        'admin_server': admin_name,
+        'servers': servers,
+        'server_order': order,
+        'machines': machines,
+        'clusters': clusters,
+        'applications': applications,
+        'hosts': hosts
+    }
+
+
+def parse_config(config_xml):
+    handler = ConfigHandler()
+    xml.sax.parse(config_xml, handler)
+    return build_topology(handler)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    config_file = open(path, 'rb')
+    try:
+        while True:
+            chunk = config_file.read(65536)
+            if not chunk:
+                break
+            digest.update(chunk)
+    finally:
+        config_file.close()
+    return digest.hexdigest()
+
+
+def read_cache(cache_file):
+    try:
+        cache = open(cache_file, 'r')
+        try:
+            return json.load(cache)
+        finally:
+            cache.close()
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def write_cache(cache_file, data):
+    """Write the cache atomically; a read-only scripts dir is not an error"""
+    temp_file = cache_file + '.tmp'
+    try:
+        cache = open(temp_file, 'w')
+        try:
+            json.dump(data, cache, indent=2, sort_keys=True)
+        finally:
+            cache.close()
+        os.rename(temp_file, cache_file)
+    except (IOError, OSError):
+        pass
+
+
+def load_topology(config_xml=CONFIG_XML, cache_file=CACHE_FILE, refresh=False):
+    """Return the domain topology, re-parsing config.xml only when it changed"""
+    stat = os.stat(config_xml)
+    mtime = int(stat.st_mtime)
+    size = stat.st_size
+
+    cached = None if refresh else read_cache(cache_file)
+    if cached and cached.get('version') == CACHE_VERSION and cached.get('config') == config_xml:
+        if cached.get('mtime') == mtime and cached.get('size') == size:
+            return cached['topology']
+        sha256 = file_sha256(config_xml)
+        if cached.get('sha256') == sha256:
+            cached['mtime'] = mtime
+            write_cache(cache_file, cached)
+            return cached['topology']
+    else:
+        sha256 = file_sha256(config_xml)
+
+    topology = parse_config(config_xml)
+    write_cache(cache_file, {'version': CACHE_VERSION, 'config': config_xml,
+                             'mtime': mtime, 'size': size, 'sha256': sha256,
+                             'topology': topology})
+    return topology
+
+
+def servers_for_host(topology, host):
+    """Managed servers whose machine (or listen address) is on host"""
+    return list(topology['hosts'].get(short_host(host), []))
+
+
+def admin_url(topology, protocol='t3'):
+    """URL of the Admin Server, or None if its host cannot be determined"""
+    admin = topology['servers'].get(topology['admin_server'])
+    if admin is None or not admin['host']:
+        return None
+    return protocol + '://' + admin['host'] + ':' + str(admin['listen_port'])
+
+
+def resolve_host(host, fallback_map=None, fallback_admin_url=None,
+                 config_xml=CONFIG_XML, cache_file=CACHE_FILE):
+    """Managed servers and Admin Server URL for host, for the lifecycle scripts
+
+    Uses config.xml when it is readable and knows the host, otherwise the
+    scripts' built-in map. Returns (servers, admin_url, source); servers is
+    None when neither knows the host.
+    """
+    host = short_host(host)
+    try:
+        topology = load_topology(config_xml, cache_file)
+        servers = servers_for_host(topology, host)
+        if servers:
+            return servers, admin_url(topology) or fallback_admin_url, 'config.xml'
+        source = 'built-in server map (' + str(host) + ' not in config.xml)'
+    except Exception as e:
+        source = 'built-in server map (config.xml unavailable: ' + str(e) + ')'
+    return (fallback_map or {}).get(host), fallback_admin_url, source
+
+
+def print_topology(topology):
+    print('Domain: ' + str(topology['domain']))
+    print('Admin Server: ' + topology['admin_server'] + ' (' + str(admin_url(topology)) + ')')
+    print('')
+    print('Hosts:')
+    for host in sorted(topology['hosts'].keys()):
+        print('  ' + host)
+        for name in topology['hosts'][host]:
+            server = topology['servers'][name]
+            print('    %-20s %-6s %s' % (name, server['listen_port'], server['cluster'] or '-'))
+    print('')
+    print('Clusters:')
+    for name in sorted(topology['clusters'].keys()):
+        print('  %-20s %s' % (name, ', '.join(topology['clusters'][name]['servers'])))
+    print('')
+    print('Applications:')
+    for name in sorted(topology['applications'].keys()):
+        print('  %-20s %s' % (name, ', '.join(topology['applications'][name]['targets'])))
+
+
+def main(argv):
+    config_xml = CONFIG_XML
+    cache_file = CACHE_FILE
+    host = None
+    as_json = False
+    refresh = False
+
+    args = list(argv)
+    while args:
+        arg = args.pop(0)
+        if arg == '--config':
+            config_xml = args.pop(0)
+        elif arg == '--cache':
+            cache_file = args.pop(0)
+        elif arg == '--host':
+            host = args.pop(0)
+        elif arg == '--json':
+            as_json = True
+        elif arg == '--refresh':
+            refresh = True
+        else:
+            print('Usage: domain_topology.py [--host H] [--json] [--refresh] '
+                  '[--config config.xml] [--cache cache.json]')
+            return 2
+
+    topology = load_topology(config_xml, cache_file, refresh)
+    if host:
+        servers = servers_for_host(topology, host)
+        if as_json:
+            print(json.dumps(servers))
+        else:
+            print('\n'.join(servers))
+        return 0 if servers else 1
+    if as_json:
+        print(json.dumps(topology, indent=2, sort_keys=True))
+    else:
+        print_topology(topology)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
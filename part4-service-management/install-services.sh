@@ -9,6 +9,11 @@
 #
 # Usage:
 #   sudo ./install-services.sh
+#   sudo ADMIN_HOST=apphost1 EPPM_HOSTS="apphost1 apphost2" ./install-services.sh
+#
+# ADMIN_HOST gets the Admin Server and metrics services as well. Both are
+# set by provision-hosts.py from the domain .conf when installing on all
+# hosts at once.
 #
 # Zero to Enterprise: P6 EPPM 25.12 with SSO - Part 4
 # Integration Faces - https://integrationfaces.com
@@ -19,6 +24,8 @@ set -e
 
 SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
 HOSTNAME="$(hostname -s)"
+ADMIN_HOST="${ADMIN_HOST:-prmapp01}"
+EPPM_HOSTS="${EPPM_HOSTS:-prmapp01 prmapp02}"
 
 echo "============================================================"
 echo "Installing WebLogic Services"
@@ -33,9 +40,13 @@ if [[ $EUID -ne 0 ]]; then
 fi
 
 # Validate hostname
-if [[ "${HOSTNAME}" != "prmapp01" && "${HOSTNAME}" != "prmapp02" ]]; then
+if [[ " ${EPPM_HOSTS} " != *" ${HOSTNAME} "* ]]; then
     echo "WARNING: Unexpected hostname '${HOSTNAME}'"
-    echo "Expected: prmapp01 or prmapp02"
+    echo "Expected one of: ${EPPM_HOSTS}"
+    if [[ ! -t 0 ]]; then
+        echo "ERROR: Not a terminal; set EPPM_HOSTS to include ${HOSTNAME}"
+        exit 1
+    fi
     read -p "Continue anyway? (y/n): " confirm
     [[ "${confirm}" != "y" ]] && exit 1
 fi
@@ -50,18 +61,40 @@ cp "${SCRIPT_DIR}/setup-boot-properties.sh" /u01/app/eppm/scripts/
 cp "${SCRIPT_DIR}/store-credentials.py" /u01/app/eppm/scripts/
 cp "${SCRIPT_DIR}/start-managed-servers.py" /u01/app/eppm/scripts/
 cp "${SCRIPT_DIR}/stop-managed-servers.py" /u01/app/eppm/scripts/
+cp "${SCRIPT_DIR}/wait-for-admin.sh" /u01/app/eppm/scripts/
+cp "${SCRIPT_DIR}/domain_topology.py" /u01/app/eppm/scripts/
+cp "${SCRIPT_DIR}/domain_runtime.py" /u01/app/eppm/scripts/
+cp "${SCRIPT_DIR}/wlst-agent.py" /u01/app/eppm/scripts/
+cp "${SCRIPT_DIR}/wlst-client.py" /u01/app/eppm/scripts/
+cp "${SCRIPT_DIR}/wlst-run.sh" /u01/app/eppm/scripts/
+cp "${SCRIPT_DIR}/log_index.py" /u01/app/eppm/scripts/
+cp "${SCRIPT_DIR}/collect-metrics.py" /u01/app/eppm/scripts/
+cp "${SCRIPT_DIR}/provision-hosts.py" /u01/app/eppm/scripts/
+cp "${SCRIPT_DIR}/server-watchdog.py" /u01/app/eppm/scripts/
+cp "${SCRIPT_DIR}/lifecycle_timing.py" /u01/app/eppm/scripts/
 chown oracle:oinstall /u01/app/eppm/scripts/*.py /u01/app/eppm/scripts/*.sh
 chmod 750 /u01/app/eppm/scripts/*.py /u01/app/eppm/scripts/*.sh
+mkdir -p /u01/app/eppm/log-index
+chown oracle:oinstall /u01/app/eppm/log-index
+mkdir -p /u01/app/eppm/metrics
+chown oracle:oinstall /u01/app/eppm/metrics
+mkdir -p /u01/app/eppm/watchdog
+chown oracle:oinstall /u01/app/eppm/watchdog
+mkdir -p /u01/app/eppm/timing
+chown oracle:oinstall /u01/app/eppm/timing
 
 echo "[3/5] Installing systemd service files..."
 cp "${SCRIPT_DIR}/weblogic-nodemanager.service" /etc/systemd/system/
 cp "${SCRIPT_DIR}/weblogic-managedservers.service" /etc/systemd/system/
+cp "${SCRIPT_DIR}/weblogic-wlst-agent.service" /etc/systemd/system/
 
-if [[ "${HOSTNAME}" == "prmapp01" ]]; then
+if [[ "${HOSTNAME}" == "${ADMIN_HOST}" ]]; then
     cp "${SCRIPT_DIR}/weblogic-adminserver.service" /etc/systemd/system/
-    echo "  -> Installed: nodemanager, adminserver, managedservers"
+    cp "${SCRIPT_DIR}/weblogic-metrics.service" /etc/systemd/system/
+    cp "${SCRIPT_DIR}/weblogic-watchdog.service" /etc/systemd/system/
+    echo "  -> Installed: nodemanager, adminserver, wlst-agent, managedservers, metrics, watchdog"
 else
-    echo "  -> Installed: nodemanager, managedservers"
+    echo "  -> Installed: nodemanager, wlst-agent, managedservers"
 fi
 
 chmod 644 /etc/systemd/system/weblogic-*.service
@@ -80,7 +113,7 @@ echo "============================================================"
 echo ""
 echo "NEXT STEPS (as the oracle user):"
 echo ""
-if [[ "${HOSTNAME}" == "prmapp01" ]]; then
+if [[ "${HOSTNAME}" == "${ADMIN_HOST}" ]]; then
     echo "1. Set up Admin Server boot.properties:"
     echo "   cd /u01/app/eppm/scripts"
     echo "   ./setup-boot-properties.sh"
@@ -95,20 +128,28 @@ if [[ "${HOSTNAME}" == "prmapp01" ]]; then
     echo "   /u01/app/weblogic/oracle_common/common/bin/wlst.sh store-credentials.py"
     echo ""
     echo "4. Enable and start services:"
-    echo "   sudo systemctl enable weblogic-nodemanager weblogic-adminserver weblogic-managedservers"
+    echo "   sudo systemctl enable weblogic-nodemanager weblogic-adminserver weblogic-wlst-agent weblogic-managedservers"
     echo "   sudo systemctl start weblogic-nodemanager"
     echo "   sudo systemctl start weblogic-adminserver"
+    echo "   sudo systemctl start weblogic-wlst-agent"
     echo "   sudo systemctl start weblogic-managedservers"
+    echo ""
+    echo "5. Optional: start the runtime metrics collector (Prometheus, 127.0.0.1:9798):"
+    echo "   sudo systemctl enable --now weblogic-metrics"
+    echo ""
+    echo "6. Optional: start the watchdog that restarts unhealthy managed servers:"
+    echo "   sudo systemctl enable --now weblogic-watchdog"
 else
-    echo "1. Ensure prmapp01's Admin Server is running"
+    echo "1. Ensure ${ADMIN_HOST}'s Admin Server is running"
     echo ""
     echo "2. Set up WLST credential store:"
     echo "   cd /u01/app/eppm/scripts"
     echo "   /u01/app/weblogic/oracle_common/common/bin/wlst.sh store-credentials.py"
     echo ""
     echo "3. Enable and start services:"
-    echo "   sudo systemctl enable weblogic-nodemanager weblogic-managedservers"
+    echo "   sudo systemctl enable weblogic-nodemanager weblogic-wlst-agent weblogic-managedservers"
     echo "   sudo systemctl start weblogic-nodemanager"
+    echo "   sudo systemctl start weblogic-wlst-agent"
     echo "   sudo systemctl start weblogic-managedservers"
 fi
 echo ""
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# =============================================================================
+# lifecycle_timing.py
+# Timed spans for start, stop, deploy and configuration runs, with history
+#
+# The WLST scripts record how long each phase of a run took: the wait for
+# the Admin Server, the connect, every server's STARTING->RUNNING or
+# drain/force shutdown, every deployment, every edit session activation.
+# Each run is appended to HISTORY_FILE as one JSON line:
+#   {"operation": "start-managed-servers", "host": "prmapp01",
+#    "started": "2025-01-10T10:15:02", "seconds": 142.3, "status": "ok",
+#    "context": {"mode": "parallel"},
+#    "spans": [{"name": "connect", "seconds": 2.1, "status": "ok", ...},
+#              {"name": "server_start", "target": "p6web_ms1", ...}]}
+#
+# Used from WLST (Jython 2.7) by start/stop-managed-servers.py, wlst-agent.py,
+# deploy_p6_apps.py and configure_server_args.py:
+#   timing = lifecycle_timing.Recorder('start-managed-servers', mode='parallel')
+#   timing.begin('connect')
+#   ...
+#   timing.end('connect')
+#   timing.add('server_start', 83.2, target='p6web_ms1')
+#   timing.finish('ok')
+# Recording never raises; a history file that cannot be written only prints
+# a warning.
+#
+# The report (python3) compares the latest run of every span with the
+# median of the runs before it and flags regressions, e.g. p6web_ms1 boot
+# time doubling after a patch:
+#   python3 lifecycle_timing.py report
+#   python3 lifecycle_timing.py report --operation start-managed-servers --target p6web_ms1
+#   python3 lifecycle_timing.py history --last 20
+#   python3 lifecycle_timing.py report --json
+#
+# Zero to Enterprise: P6 EPPM 25.12 with SSO - Part 4
+# Integration Faces - https://integrationfaces.com
+# Benjamin Mukoro & AI Assistant
+# =============================================================================
+
+from __future__ import print_function
+
+import json
+import os
+import socket
+import sys
+import time
+
+HISTORY_FILE = '/u01/app/eppm/timing/history.jsonl'
+
+# Report defaults
+BASELINE_RUNS = 10          # earlier runs the latest one is compared with
+REGRESSION_FACTOR = 1.5     # latest/baseline median ratio flagged as a regression
+REGRESSION_MIN_SECONDS = 5.0  # ignore regressions smaller than this in absolute terms
+
+
+class Recorder(object):
+    """Collects the spans of one run and appends the run to the history"""
+
+    def __init__(self, operation, history_file=None, host=None, **context):
+        self.operation = operation
+        self.history_file = history_file or HISTORY_FILE
+        self.host = host or socket.gethostname().split('.')[0]
+        self.context = context
+        self.started = time.time()
+        self.spans = []
+        self.open = {}
+        self.finished = False
+
+    def begin(self, name, target=None):
+        self.open[(name, target)] = time.time()
+
+    def end(self, name, target=None, status='ok', **attrs):
+        """Close a span opened with begin(); returns its seconds"""
+        started = self.open.pop((name, target), None)
+        if started is None:
+            return None
+        seconds = time.time() - started
+        self.add(name, seconds, target, status, started, **attrs)
+        return seconds
+
+    def add(self, name, seconds, target=None, status='ok', started=None, **attrs):
+        """Record a span timed by the caller"""
+        if seconds is None:
+            return
+        span = {'name': name, 'seconds': round(seconds, 3), 'status': status}
+        if target is not None:
+            span['target'] = target
+        if started is not None:
+            span['offset'] = round(started - self.started, 3)
+        span.update(attrs)
+        self.spans.append(span)
+
+    def finish(self, status='ok', **context):
+        """Append the run to the history file (once); returns the record"""
+        if self.finished:
+            return None
+        self.finished = True
+        for name, target in list(self.open.keys()):
+            self.end(name, target, 'unfinished')
+        self.context.update(context)
+        record = {
+            'operation': self.operation,
+            'host': self.host,
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'epoch': int(self.started),
+            'seconds': round(time.time() - self.started, 3),
+            'status': status,
+            'context': self.context,
+            'spans': self.spans
+        }
+        try:
+            directory = os.path.dirname(self.history_file)
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory)
+            f = open(self.history_file, 'a')
+            try:
+                f.write(json.dumps(record, sort_keys=True) + '\n')
+            finally:
+                f.close()
+        except Exception as e:
+            print('WARNING: timing history not written to ' + self.history_file + ': ' + str(e))
+        return record
+
+
+def read_history(history_file=HISTORY_FILE):
+    """All runs in the history, oldest first; unreadable lines are skipped"""
+    runs = []
+    if not os.path.exists(history_file):
+        return runs
+    f = open(history_file)
+    try:
+        for line in f:
+            try:
+                runs.append(json.loads(line))
+            except ValueError:
+                continue
+    finally:
+        f.close()
+    runs.sort(key=lambda run: run.get('epoch', 0))
+    return runs
+
+
+def median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+
+def span_series(runs):
+    """{(operation, host, span, target): [(epoch, seconds)]} of successful spans"""
+    series = {}
+    for run in runs:
+        totals = [('total', None, run.get('seconds'), run.get('status'))]
+        spans = [(s.get('name'), s.get('target'), s.get('seconds'), s.get('status'))
+                 for s in run.get('spans', [])]
+        for name, target, seconds, status in totals + spans:
+            if status != 'ok' or seconds is None:
+                continue
+            key = (run.get('operation'), run.get('host'), name, target)
+            series.setdefault(key, []).append((run.get('epoch', 0), seconds))
+    return series
+
+
+def compare(series, baseline_runs=BASELINE_RUNS, factor=REGRESSION_FACTOR,
+            min_seconds=REGRESSION_MIN_SECONDS):
+    """One row per span: latest run against the median of the runs before it"""
+    rows = []
+    for key in sorted(series.keys(), key=lambda k: tuple(str(part) for part in k)):
+        points = series[key]
+        epoch, latest = points[-1]
+        baseline = [seconds for e, seconds in points[-baseline_runs - 1:-1]]
+        row = {'operation': key[0], 'host': key[1], 'span': key[2], 'target': key[3], 'runs': len(points),
+               'latest': latest, 'latest_at': epoch,
+               'baseline': None, 'change': None, 'regression': False}
+        if baseline:
+            row['baseline'] = median(baseline)
+            if row['baseline'] > 0:
+                row['change'] = latest / row['baseline']
+            row['regression'] = (latest >= row['baseline'] * factor and
+                                 latest - row['baseline'] >= min_seconds)
+        rows.append(row)
+    return rows
+
+
+def parse_age(text):
+    """'30m', '12h', '7d' -> seconds"""
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    if text and text[-1] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+def select_runs(runs, options):
+    if options.operation:
+        runs = [run for run in runs if run.get('operation') == options.operation]
+    if options.host:
+        runs = [run for run in runs if run.get('host') == options.host]
+    if options.since:
+        oldest = time.time() - parse_age(options.since)
+        runs = [run for run in runs if run.get('epoch', 0) >= oldest]
+    return runs
+
+
+def format_seconds(value):
+    if value is None:
+        return '-'
+    return '%.1fs' % value
+
+
+def print_report(rows, options):
+    print('%-24s %-10s %-14s %-14s %5s %10s %10s %8s' % ('Operation', 'Host', 'Span', 'Target', 'Runs',
+                                                       'Baseline', 'Latest', 'Change'))
+    for row in rows:
+        change = row['change'] is not None and '%+.0f%%' % ((row['change'] - 1) * 100) or '-'
+        print('%-24s %-10s %-14s %-14s %5d %10s %10s %8s%s'
+              % (row['operation'], row['host'], row['span'], row['target'] or '-', row['runs'],
+                 format_seconds(row['baseline']), format_seconds(row['latest']), change,
+                 row['regression'] and '  REGRESSION' or ''))
+    regressions = [row for row in rows if row['regression']]
+    print('')
+    if regressions:
+        print('%d regression(s): latest run at least %.1fx the median of the previous %d runs'
+              % (len(regressions), options.factor, options.baseline))
+    else:
+        print('No regressions (threshold %.1fx the median of the previous %d runs)'
+              % (options.factor, options.baseline))
+
+
+def print_history(runs, last):
+    print('%-19s %-24s %-10s %-8s %9s %6s  %s' % ('Started', 'Operation', 'Host', 'Status', 'Seconds',
+                                                  'Spans', 'Slowest'))
+    for run in runs[-last:]:
+        spans = [s for s in run.get('spans', []) if s.get('seconds') is not None]
+        slowest = '-'
+        if spans:
+            span = max(spans, key=lambda s: s['seconds'])
+            slowest = '%s %s %.1fs' % (span['name'], span.get('target') or '', span['seconds'])
+            slowest = ' '.join(slowest.split())
+        print('%-19s %-24s %-10s %-8s %9.1f %6d  %s'
+              % (run.get('started', '-'), run.get('operation'), run.get('host'), run.get('status'),
+                 run.get('seconds') or 0, len(spans), slowest))
+
+
+def main(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description='Lifecycle timing history and regression report')
+    parser.add_argument('--file', default=HISTORY_FILE, help='history file')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    report = commands.add_parser('report', help='latest run of each span against its baseline')
+    history = commands.add_parser('history', help='list recorded runs')
+    for command in (report, history):
+        command.add_argument('--operation', help='e.g. start-managed-servers, deploy-p6-apps')
+        command.add_argument('--host', help='only runs on this host')
+        command.add_argument('--since', help='only runs within this age (30m, 12h, 7d)')
+    report.add_argument('--span', help='only this span (connect, server_start, ...)')
+    report.add_argument('--target', help='only this target (server or application)')
+    report.add_argument('--baseline', type=int, default=BASELINE_RUNS,
+                        help='earlier runs in the baseline median')
+    report.add_argument('--factor', type=float, default=REGRESSION_FACTOR,
+                        help='latest/baseline ratio flagged as a regression')
+    report.add_argument('--min-seconds', type=float, default=REGRESSION_MIN_SECONDS,
+                        help='smallest absolute slowdown flagged')
+    report.add_argument('--json', action='store_true', help='print the rows as JSON')
+    history.add_argument('--last', type=int, default=20, help='runs shown')
+    options = parser.parse_args(argv)
+
+    runs = select_runs(read_history(options.file), options)
+    if options.command == 'history':
+        print_history(runs, options.last)
+        return 0
+
+    rows = compare(span_series(runs), options.baseline, options.factor, options.min_seconds)
+    if options.span:
+        rows = [row for row in rows if row['span'] == options.span]
+    if options.target:
+        rows = [row for row in rows if row['target'] == options.target]
+    if options.json:
+        print(json.dumps(rows, indent=2, sort_keys=True))
+    else:
+        print_report(rows, options)
+    return [row for row in rows if row['regression']] and 1 or 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
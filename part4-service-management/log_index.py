@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+# =============================================================================
+# log_index.py
+# Indexed time-range and message ID search over WebLogic logs
+#
+# build  - reads the server logs (<server>.log*), stdout logs (<server>.out*)
+#          and the Node Manager log once and writes, per file, a sparse
+#          timestamp -> byte offset index (one entry per INDEX_STEP bytes)
+#          plus counts of BEA- message IDs and severities and the index blocks
+#          each message ID occurs in. Indexes are keyed by inode, so a rotated
+#          log (p6web_ms1.log -> p6web_ms1.log00001) keeps its index, and
+#          later builds only read data appended since the previous build.
+# query  - updates the index, then memory-maps only the blocks of each file
+#          that overlap the time window (or contain the message ID) across
+#          all servers, and prints matching entries in time order, stack
+#          traces included. --journal adds the systemd journal for the same
+#          window (journald keeps its own index).
+# stats  - message ID and severity counts per server, from the index alone.
+#
+# Usage:
+#   ./log_index.py build
+#   ./log_index.py query --from "2025-01-10 10:00" --to "2025-01-10 10:30"
+#   ./log_index.py query --last 2h --severity Error --server p6web_ms1
+#   ./log_index.py query --msgid BEA-000337 --last 1d
+#   ./log_index.py query --last 30m --grep OutOfMemory --journal
+#   ./log_index.py stats [--server p6ws_ms1]
+#
+# Cron (as oracle) keeps the index current so queries never wait on a build:
+#   */10 * * * * /u01/app/eppm/scripts/log_index.py build --quiet
+#
+# Zero to Enterprise: P6 EPPM 25.12 with SSO - Part 4
+# Integration Faces - https://integrationfaces.com
+# Benjamin Mukoro & AI Assistant
+# =============================================================================
+
+import argparse
+import bisect
+import calendar
+import glob
+import json
+import mmap
+import os
+import re
+import subprocess
+import sys
+import time
+
+DOMAIN_HOME = '/u01/app/weblogic/user_projects/domains/eppm_domain'
+INDEX_DIR = '/u01/app/eppm/log-index'
+INDEX_VERSION = 2
+
+# Logs indexed, relative to DOMAIN_HOME (access and GC logs use other formats)
+LOG_GLOBS = ['servers/*/logs/*.log*', 'servers/*/logs/*.out*', 'nodemanager/nodemanager.log*']
+SKIP_PREFIXES = ('access.log', 'gc.log')
+
+INDEX_STEP = 64 * 1024      # bytes between sparse index entries
+DEFAULT_LIMIT = 500         # entries printed by query unless --limit is given
+JOURNAL_UNITS = ['weblogic-nodemanager', 'weblogic-adminserver',
+                 'weblogic-managedservers', 'weblogic-wlst-agent']
+
+# ####<Jan 10, 2025, 10:15:02,123 AM UTC> <Error> <Deployer> ... <1736504102123> ... <BEA-149205> <...>
+# <Jan 10, 2025 10:15:02,123 AM UTC> <Notice> <WebLogicServer> <BEA-000365> <...>     (.out)
+# <Jan 10, 2025 10:15:02 AM UTC> <INFO> <...>                                         (Node Manager)
+ENTRY = re.compile(rb'^(?:####)?<([A-Z][a-z]{2} \d{1,2}, \d{4},? \d{1,2}:\d{2}:\d{2})(?:[,.](\d{1,3}))?'
+                   rb' ?([AP]M)? ?([^>]*)> <([A-Za-z]+)>')
+RAW_TIME = re.compile(rb'> <(\d{13})> <')
+MSGID = re.compile(rb'<((?:BEA|WL|WLS|WLDF|JMX|OSB|ADF)-\d{6})>')
+
+# Zone of .out and Node Manager header times, which carry no epoch: a UTC/GMT
+# offset, the local zone's own names (standard or daylight time), or one of
+# these abbreviations (seconds east of UTC). Unknown zones are read as local.
+ZONE_OFFSET = re.compile(r'^(?:UTC|GMT)?([+-])(\d{1,2}):?(\d{2})?$')
+ZONE_ABBREVIATIONS = {
+    'UTC': 0, 'GMT': 0, 'Z': 0, 'WET': 0, 'WEST': 3600, 'BST': 3600,
+    'CET': 3600, 'CEST': 7200, 'EET': 7200, 'EEST': 10800, 'MSK': 10800,
+    'WAT': 3600, 'CAT': 7200, 'EAT': 10800, 'SAST': 7200,
+    'IST': 19800, 'SGT': 28800, 'HKT': 28800, 'JST': 32400, 'KST': 32400,
+    'AEST': 36000, 'AEDT': 39600, 'NZST': 43200, 'NZDT': 46800,
+    'EST': -18000, 'EDT': -14400, 'CST': -21600, 'CDT': -18000,
+    'MST': -25200, 'MDT': -21600, 'PST': -28800, 'PDT': -25200,
+    'AKST': -32400, 'AKDT': -28800, 'HST': -36000,
+}
+
+
+class EntryParser(object):
+    """Timestamp, severity and message ID of log entry header lines"""
+
+    def __init__(self):
+        self.seconds = {}       # 'Jan 10, 2025 10:15:02 AM' -> epoch, memoized
+
+    def parse(self, line):
+        """(epoch, severity, msgid) for an entry's first line, or None"""
+        match = ENTRY.match(line)
+        if not match:
+            return None
+        raw = RAW_TIME.search(line)
+        if raw:
+            epoch = int(raw.group(1)) / 1000.0
+        else:
+            key = (match.group(1).replace(b',', b'') + b' ' + (match.group(3) or b''), match.group(4))
+            epoch = self.seconds.get(key)
+            if epoch is None:
+                epoch = parse_header_time(key[0].decode('ascii').strip(),
+                                          key[1].decode('ascii', 'replace').strip())
+                self.seconds[key] = epoch
+            if epoch is None:
+                return None
+            if match.group(2):
+                epoch += int(match.group(2).ljust(3, b'0')) / 1000.0
+        msgid = MSGID.search(line)
+        return (epoch, match.group(5).decode('ascii').capitalize(),
+                msgid.group(1).decode('ascii') if msgid else None)
+
+
+def zone_offset(zone):
+    """Seconds east of UTC for a zone token, or None if it is not known"""
+    if zone in ZONE_ABBREVIATIONS:
+        return ZONE_ABBREVIATIONS[zone]
+    match = ZONE_OFFSET.match(zone)
+    if match:
+        offset = int(match.group(2)) * 3600 + int(match.group(3) or 0) * 60
+        return match.group(1) == '-' and -offset or offset
+    return None
+
+
+def parse_header_time(value, zone=''):
+    """Epoch of a header time, in its zone (local time if there is none)"""
+    for pattern in ('%b %d %Y %I:%M:%S %p', '%b %d %Y %H:%M:%S'):
+        try:
+            parsed = time.strptime(value, pattern)
+        except ValueError:
+            continue
+        if zone and zone in time.tzname:
+            # Local standard or daylight time: the name settles the hour
+            # that occurs twice when the clocks go back
+            return time.mktime(parsed[:8] + (time.tzname.index(zone),))
+        offset = zone_offset(zone) if zone else None
+        if offset is None:
+            return time.mktime(parsed)
+        return calendar.timegm(parsed) - offset
+    return None
+
+
+def server_of(path):
+    parts = path.split(os.sep)
+    if 'nodemanager' in parts[-2:]:
+        return 'nodemanager'
+    return parts[-3]
+
+
+def log_files(domain_home):
+    files = []
+    for pattern in LOG_GLOBS:
+        for path in glob.glob(os.path.join(domain_home, pattern)):
+            name = os.path.basename(path)
+            if name.startswith(SKIP_PREFIXES) or name.endswith('.lck') or not os.path.isfile(path):
+                continue
+            files.append(path)
+    return sorted(set(files))
+
+
+# -----------------------------------------------------------------------------
+# Index build
+# -----------------------------------------------------------------------------
+
+def index_path(index_dir, stat):
+    return os.path.join(index_dir, '%d-%d.json' % (stat.st_dev, stat.st_ino))
+
+
+def load_index(path):
+    try:
+        with open(path) as f:
+            index = json.load(f)
+        if index.get('version') == INDEX_VERSION:
+            return index
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def new_index(path, stat):
+    return {'version': INDEX_VERSION, 'path': path, 'server': server_of(path),
+            'inode': stat.st_ino, 'offset': 0, 'first': None, 'last': None,
+            'sparse': [], 'next_block': 0, 'entries': 0,
+            'msgids': {}, 'severities': {}, 'msgid_blocks': {}}
+
+
+def index_file(path, stat, index, parser):
+    """Extend index with the complete lines after index['offset']"""
+    offset = index['offset']
+    sparse = index['sparse']
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                break       # partial line still being written
+            header = parser.parse(line)
+            if header is not None:
+                epoch, severity, msgid = header
+                if offset >= index['next_block']:
+                    sparse.append([epoch, offset])
+                    index['next_block'] = offset + INDEX_STEP
+                if index['first'] is None:
+                    index['first'] = epoch
+                index['last'] = max(epoch, index['last'] or epoch)
+                index['entries'] += 1
+                index['severities'][severity] = index['severities'].get(severity, 0) + 1
+                if msgid:
+                    index['msgids'][msgid] = index['msgids'].get(msgid, 0) + 1
+                    blocks = index['msgid_blocks'].setdefault(msgid, [])
+                    if not blocks or blocks[-1] != len(sparse) - 1:
+                        blocks.append(len(sparse) - 1)
+            offset += len(line)
+    read = offset - index['offset']
+    index['offset'] = offset
+    index['path'] = path
+    return read
+
+
+def build(domain_home, index_dir, quiet=False):
+    """Index new data in every log; returns {path: index}"""
+    if not os.path.isdir(index_dir):
+        os.makedirs(index_dir)
+    parser = EntryParser()
+    indexes = {}
+    current = set()
+    total_read = 0
+    started = time.time()
+
+    for path in log_files(domain_home):
+        stat = os.stat(path)
+        target = index_path(index_dir, stat)
+        current.add(os.path.basename(target))
+        index = load_index(target)
+        if index is None or stat.st_size < index['offset']:
+            index = new_index(path, stat)       # new file, or truncated and rewritten
+        if stat.st_size > index['offset'] or index['path'] != path:
+            total_read += index_file(path, stat, index, parser)
+            write_index(target, index)
+        indexes[path] = index
+
+    # Drop indexes of files that have been deleted
+    for name in os.listdir(index_dir):
+        if name.endswith('.json') and name not in current:
+            os.remove(os.path.join(index_dir, name))
+
+    if not quiet:
+        print('Indexed %d files, %.1f MB of new data in %.1fs'
+              % (len(indexes), total_read / 1048576.0, time.time() - started))
+    return indexes
+
+
+def write_index(target, index):
+    temp_file = target + '.tmp'
+    with open(temp_file, 'w') as f:
+        json.dump(index, f, separators=(',', ':'))
+    os.rename(temp_file, target)
+
+
+# -----------------------------------------------------------------------------
+# Query
+# -----------------------------------------------------------------------------
+
+def blocks_in_window(index, start, end):
+    """(first_block, last_block) overlapping [start, end]; None if no overlap"""
+    sparse = index['sparse']
+    if not sparse or index['last'] < start or index['first'] > end:
+        return None
+    times = [entry[0] for entry in sparse]
+    # Entries are written almost in order; start one block early to be safe
+    first = max(0, bisect.bisect_left(times, start) - 1)
+    last = max(first, bisect.bisect_right(times, end) - 1)
+    return first, last
+
+
+def block_range(index, block, file_size):
+    sparse = index['sparse']
+    begin = sparse[block][1]
+    end = sparse[block + 1][1] if block + 1 < len(sparse) else min(index['offset'], file_size)
+    return begin, end
+
+
+def scan(mm, begin, end, parser):
+    """Yield (epoch, severity, msgid, text) for entries starting in [begin, end)"""
+    position = begin
+    entry = None
+    lines = []
+    while position < end or (entry is not None and position < len(mm)):
+        newline = mm.find(b'\n', position)
+        if newline < 0:
+            break
+        line = mm[position:newline + 1]
+        header = parser.parse(line)
+        if header is not None:
+            if entry is not None:
+                yield entry + (b''.join(lines),)
+            if position >= end:
+                return
+            entry = header
+            lines = []
+        if entry is not None:
+            lines.append(line)
+        position = newline + 1
+    if entry is not None:
+        yield entry + (b''.join(lines),)
+
+
+def query(indexes, start, end, servers=None, msgid=None, severities=None, grep=None):
+    """Matching entries across all files, in time order"""
+    parser = EntryParser()
+    matches = []
+    for path, index in sorted(indexes.items()):
+        if servers and index['server'] not in servers:
+            continue
+        window = blocks_in_window(index, start, end)
+        if window is None:
+            continue
+        blocks = range(window[0], window[1] + 1)
+        if msgid:
+            wanted = set(index['msgid_blocks'].get(msgid, []))
+            blocks = [block for block in blocks if block in wanted]
+        if not blocks:
+            continue
+
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                continue
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                for block in blocks:
+                    begin, stop = block_range(index, block, size)
+                    for epoch, severity, entry_msgid, text in scan(mm, begin, stop, parser):
+                        if epoch < start or epoch > end:
+                            continue
+                        if msgid and entry_msgid != msgid:
+                            continue
+                        if severities and severity not in severities:
+                            continue
+                        if grep and grep not in text:
+                            continue
+                        matches.append((epoch, index['server'], text))
+            finally:
+                mm.close()
+    matches.sort(key=lambda match: match[0])
+    return matches
+
+
+def journal(start, end, grep=None):
+    """The same window from the systemd journal of the WebLogic units"""
+    command = ['journalctl', '--no-pager', '-o', 'short-iso',
+               '--since', time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start)),
+               '--until', time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(end))]
+    for unit in JOURNAL_UNITS:
+        command += ['-u', unit]
+    if grep:
+        command += ['-g', grep]
+    try:
+        return subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                              universal_newlines=True).stdout
+    except OSError as e:
+        return 'journalctl not available: %s\n' % e
+
+
+def parse_time(value):
+    """'2025-01-10 10:15[:30]', '10:15' (today) or epoch seconds"""
+    for pattern in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d'):
+        try:
+            return time.mktime(time.strptime(value, pattern))
+        except ValueError:
+            pass
+    for pattern in ('%H:%M:%S', '%H:%M'):
+        try:
+            parsed = time.strptime(value, pattern)
+            today = time.localtime()
+            return time.mktime(today[:3] + parsed[3:6] + today[6:])
+        except ValueError:
+            pass
+    return float(value)
+
+
+def parse_duration(value):
+    """'90s', '30m', '6h', '2d' -> seconds"""
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    if value[-1] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
+
+
+def format_time(epoch):
+    millis = int(round(epoch * 1000))
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(millis // 1000)) + '.%03d' % (millis % 1000)
+
+
+def print_stats(indexes, servers=None, top=15):
+    by_server = {}
+    for index in indexes.values():
+        if servers and index['server'] not in servers:
+            continue
+        totals = by_server.setdefault(index['server'], {'files': 0, 'bytes': 0, 'entries': 0,
+                                                        'first': None, 'last': None,
+                                                        'msgids': {}, 'severities': {}})
+        totals['files'] += 1
+        totals['bytes'] += index['offset']
+        totals['entries'] += index['entries']
+        for key in ('msgids', 'severities'):
+            for name, count in index[key].items():
+                totals[key][name] = totals[key].get(name, 0) + count
+        if index['first'] is not None:
+            totals['first'] = min(index['first'], totals['first'] or index['first'])
+            totals['last'] = max(index['last'], totals['last'] or index['last'])
+
+    for server in sorted(by_server.keys()):
+        totals = by_server[server]
+        span = ''
+        if totals['first'] is not None:
+            span = ', %s to %s' % (format_time(totals['first'])[:19], format_time(totals['last'])[:19])
+        print('')
+        print('%s: %d files, %.1f MB, %d entries%s'
+              % (server, totals['files'], totals['bytes'] / 1048576.0, totals['entries'], span))
+        print('  Severities: ' + ', '.join('%s %d' % item for item in
+                                           sorted(totals['severities'].items(), key=lambda i: -i[1])))
+        for msgid, count in sorted(totals['msgids'].items(), key=lambda i: -i[1])[:top]:
+            print('  %-12s %8d' % (msgid, count))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Index and search WebLogic logs')
+    parser.add_argument('--domain-home', default=DOMAIN_HOME)
+    parser.add_argument('--index-dir', default=INDEX_DIR)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = commands.add_parser('build', help='index new log data')
+    build_parser.add_argument('--quiet', action='store_true')
+
+    query_parser = commands.add_parser('query', help='entries in a time window')
+    query_parser.add_argument('--from', dest='start', help='start time (default: --last ago)')
+    query_parser.add_argument('--to', dest='end', help='end time (default: now)')
+    query_parser.add_argument('--last', default='1h', help='window length if --from is not given')
+    query_parser.add_argument('--server', action='append', help='only this server (repeatable)')
+    query_parser.add_argument('--msgid', help='only this message ID, e.g. BEA-000337')
+    query_parser.add_argument('--severity', action='append',
+                              help='only this severity: Emergency, Alert, Critical, Error, Warning, Notice, Info')
+    query_parser.add_argument('--grep', help='only entries containing this text')
+    query_parser.add_argument('--limit', type=int, default=DEFAULT_LIMIT)
+    query_parser.add_argument('--first-line', action='store_true', help='omit stack traces')
+    query_parser.add_argument('--journal', action='store_true', help='include the systemd journal')
+    query_parser.add_argument('--no-update', action='store_true', help='use the index as it is')
+
+    stats_parser = commands.add_parser('stats', help='message ID and severity counts')
+    stats_parser.add_argument('--server', action='append')
+    stats_parser.add_argument('--top', type=int, default=15)
+    stats_parser.add_argument('--no-update', action='store_true')
+
+    options = parser.parse_args()
+
+    if options.command == 'build':
+        build(options.domain_home, options.index_dir, options.quiet)
+        return 0
+
+    indexes = build(options.domain_home, options.index_dir, quiet=True) if not options.no_update else \
+        dict((index['path'], index) for index in
+             filter(None, [load_index(path) for path in glob.glob(os.path.join(options.index_dir, '*.json'))]))
+
+    if options.command == 'stats':
+        print_stats(indexes, options.server, options.top)
+        return 0
+
+    end = parse_time(options.end) if options.end else time.time()
+    start = parse_time(options.start) if options.start else end - parse_duration(options.last)
+    severities = set(s.capitalize() for s in options.severity) if options.severity else None
+    grep = options.grep.encode('utf-8') if options.grep else None
+
+    started = time.time()
+    matches = query(indexes, start, end, options.server, options.msgid, severities, grep)
+    for epoch, server, text in matches[:options.limit]:
+        lines = text.decode('utf-8', 'replace').rstrip('\n')
+        if options.first_line:
+            lines = lines.split('\n')[0]
+        print('%s %-12s %s' % (format_time(epoch), server, lines))
+
+    print('')
+    print('%d entries from %s to %s (%.2fs)%s'
+          % (len(matches), format_time(start)[:19], format_time(end)[:19], time.time() - started,
+             ', first %d shown - use --limit' % options.limit if len(matches) > options.limit else ''))
+
+    if options.journal:
+        print('')
+        print('--- systemd journal ---')
+        sys.stdout.write(journal(start, end, options.grep))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+# =============================================================================
+# provision-hosts.py
+# Run provisioning steps on every host of a domain at once
+#
+# Hosts come from the [HOSTS] and [MACHINES] sections of the part 3 domain
+# .conf; HOST1 is the Admin Server host, as in the generated domain. A plan
+# is a list of steps. Each step runs on all hosts, the admin host or the
+# other hosts, concurrently up to --parallel at a time:
+#   - on one host, steps run in plan order and stop at the first failure
+#   - a barrier step starts on any host only after an earlier step has
+#     finished on all of its hosts (e.g. managed server services only once
+#     the Admin Server is up); if that step failed anywhere it is skipped
+#
+# Every host gets its own log (<log-dir>/<host>.log) and exit status; the
+# summary is also written to <log-dir>/summary.json.
+#
+# Plans:
+#   install  - copy this directory to the hosts and run install-services.sh
+#   start    - enable and start Node Manager everywhere, then the Admin
+#              Server, then the WLST agent and managed servers
+#   run CMD  - run CMD on every host (--admin-first: admin host, then rest)
+#
+# Transports (--transport):
+#   ssh      - ssh/tar over BatchMode ssh (default)
+#   local    - a directory per host under --local-root stands in for the
+#              host; absolute paths in the plan are mapped below it
+#   docker   - docker exec / docker cp into container <prefix><host>
+#
+# Usage:
+#   ./provision-hosts.py --config multi-host.conf install
+#   ./provision-hosts.py --config multi-host.conf --parallel 8 start
+#   ./provision-hosts.py --config multi-host.conf run --admin-first 'uptime'
+#   ./provision-hosts.py --config multi-host.conf --transport local \
+#       --local-root /tmp/hosts --no-sudo install
+#
+# Zero to Enterprise: P6 EPPM 25.12 with SSO - Part 4
+# Integration Faces - https://integrationfaces.com
+# Benjamin Mukoro & AI Assistant
+# =============================================================================
+
+import argparse
+import concurrent.futures
+import json
+import os
+import re
+import shlex
+import subprocess
+import sys
+import threading
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+STAGE_DIR = '/tmp/eppm-part4'
+LOG_DIR = '/u01/app/eppm/logs/provision'
+DEFAULT_PARALLEL = 4
+STEP_TIMEOUT = 1800         # seconds before a step is killed
+
+SECTION = re.compile(r'^\[([A-Z_]+)\]')
+SETTING = re.compile(r'^([A-Z_0-9]+)\s*=\s*(.*)')
+
+
+class Step(object):
+    """One command run on a set of hosts
+
+    hosts is 'all', 'admin' or 'others', always within the selected hosts.
+    barrier names an earlier step that must have finished on all of its
+    hosts first. put copies a local
+    directory to the host before command runs.
+    """
+
+    def __init__(self, name, command, hosts='all', barrier=None, put=None):
+        self.name = name
+        self.command = command
+        self.hosts = hosts
+        self.barrier = barrier
+        self.put = put
+
+
+def install_plan():
+    return [
+        Step('stage', 'ls {stage}', put=(SCRIPT_DIR, STAGE_DIR)),
+        Step('install', 'cd {stage} && {sudo}env ADMIN_HOST={admin_host} EPPM_HOSTS={hosts}'
+                        ' bash ./install-services.sh </dev/null'),
+    ]
+
+
+def start_plan():
+    return [
+        Step('nodemanager', '{sudo}systemctl enable --now weblogic-nodemanager'),
+        Step('adminserver', '{sudo}systemctl enable --now weblogic-adminserver', hosts='admin'),
+        Step('services', '{sudo}systemctl enable --now weblogic-wlst-agent weblogic-managedservers',
+             barrier='adminserver'),
+    ]
+
+
+def command_plan(command, admin_first):
+    if not admin_first:
+        return [Step('run', command)]
+    return [Step('run-admin', command, hosts='admin'),
+            Step('run', command, hosts='others', barrier='run-admin')]
+
+
+# -----------------------------------------------------------------------------
+# Domain configuration
+# -----------------------------------------------------------------------------
+
+def read_domain_config(path):
+    """SECTION_KEY -> value, parsed like create-domain.sh load_config_file"""
+    config = {}
+    section = ''
+    with open(path) as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            match = SECTION.match(line)
+            if match:
+                section = match.group(1)
+                continue
+            match = SETTING.match(line)
+            if match:
+                value = match.group(2).split('#')[0].rstrip()
+                config[(section + '_' if section else '') + match.group(1)] = value
+    return config
+
+
+def domain_hosts(config):
+    """[(host, machine)] in HOST<N> order"""
+    hosts = []
+    for index in range(1, int(config.get('HOSTS_HOST_COUNT', '1')) + 1):
+        host = config.get('HOSTS_HOST%d' % index)
+        if not host:
+            continue
+        machine = config.get('MACHINES_MACHINE%d' % index, '').split(':')[0] or None
+        hosts.append((host, machine))
+    return hosts
+
+
+# -----------------------------------------------------------------------------
+# Transports
+# -----------------------------------------------------------------------------
+
+class SshTransport(object):
+    """Commands over ssh, directories copied as a tar stream"""
+
+    def __init__(self, options):
+        self.ssh = ['ssh', '-o', 'BatchMode=yes', '-o', 'ConnectTimeout=10']
+        if options.ssh_user:
+            self.ssh += ['-l', options.ssh_user]
+
+    def path(self, host, path):
+        return path
+
+    def run(self, host, command, log, timeout):
+        return run_logged(self.ssh + [host, command], log, timeout)
+
+    def put(self, host, source, dest, log, timeout):
+        unpack = 'mkdir -p %s && tar -C %s -xf -' % (shlex.quote(dest), shlex.quote(dest))
+        return run_piped(['tar', '-C', source, '-cf', '-', '.'], self.ssh + [host, unpack], log, timeout)
+
+
+class LocalTransport(object):
+    """A directory per host under --local-root stands in for the host"""
+
+    def __init__(self, options):
+        self.root = os.path.abspath(options.local_root)
+
+    def path(self, host, path):
+        return os.path.join(self.root, host, path.lstrip('/'))
+
+    def run(self, host, command, log, timeout):
+        home = os.path.join(self.root, host)
+        os.makedirs(home, exist_ok=True)
+        env = dict(os.environ, PROVISION_HOST=host)
+        return run_logged(['bash', '-c', command], log, timeout, cwd=home, env=env)
+
+    def put(self, host, source, dest, log, timeout):
+        target = self.path(host, dest)
+        os.makedirs(target, exist_ok=True)
+        return run_piped(['tar', '-C', source, '-cf', '-', '.'], ['tar', '-C', target, '-xf', '-'],
+                         log, timeout)
+
+
+class DockerTransport(object):
+    """Commands and copies into the container <prefix><host>"""
+
+    def __init__(self, options):
+        self.prefix = options.container_prefix
+
+    def path(self, host, path):
+        return path
+
+    def run(self, host, command, log, timeout):
+        return run_logged(['docker', 'exec', self.prefix + host, 'bash', '-c', command], log, timeout)
+
+    def put(self, host, source, dest, log, timeout):
+        container = self.prefix + host
+        status = run_logged(['docker', 'exec', container, 'mkdir', '-p', dest], log, timeout)
+        if status != 0:
+            return status
+        return run_logged(['docker', 'cp', source + '/.', container + ':' + dest], log, timeout)
+
+
+TRANSPORTS = {'ssh': SshTransport, 'local': LocalTransport, 'docker': DockerTransport}
+
+
+def run_logged(argv, log, timeout, cwd=None, env=None):
+    """Run argv with stdout/stderr appended to log; returns the exit status"""
+    try:
+        process = subprocess.Popen(argv, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                                   cwd=cwd, env=env)
+    except OSError as e:
+        log.write(('%s: %s\n' % (argv[0], e)).encode('utf-8'))
+        return 127
+    try:
+        return process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+        log.write(('Killed after %d seconds\n' % timeout).encode('utf-8'))
+        return 124
+
+
+def run_piped(producer_argv, consumer_argv, log, timeout):
+    """producer | consumer, both logged; fails if either fails"""
+    try:
+        producer = subprocess.Popen(producer_argv, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                    stderr=log)
+    except OSError as e:
+        log.write(('%s: %s\n' % (producer_argv[0], e)).encode('utf-8'))
+        return 127
+    try:
+        consumer = subprocess.Popen(consumer_argv, stdin=producer.stdout, stdout=log, stderr=subprocess.STDOUT)
+    except OSError as e:
+        producer.kill()
+        producer.wait()
+        log.write(('%s: %s\n' % (consumer_argv[0], e)).encode('utf-8'))
+        return 127
+    producer.stdout.close()
+    try:
+        status = consumer.wait(timeout)
+    except subprocess.TimeoutExpired:
+        consumer.kill()
+        consumer.wait()
+        status = 124
+    return producer.wait() or status
+
+
+# -----------------------------------------------------------------------------
+# Executor
+# -----------------------------------------------------------------------------
+
+class Executor(object):
+    """Schedules (step, host) tasks as soon as their dependencies allow"""
+
+    def __init__(self, plan, hosts, domain_hosts, admin_host, transport, options):
+        self.plan = plan
+        self.hosts = hosts
+        self.domain_hosts = domain_hosts
+        self.admin_host = admin_host
+        self.transport = transport
+        self.options = options
+        self.lock = threading.Lock()
+        self.results = {}       # (step, host) -> {'status', 'exit', 'seconds'}
+        self.hosts_of = dict((step.name, self.step_hosts(step)) for step in plan)
+
+    def step_hosts(self, step):
+        if step.hosts == 'admin':
+            # Only when --hosts selects it; a barrier on no hosts is satisfied
+            return [h for h in self.hosts if h == self.admin_host]
+        if step.hosts == 'others':
+            return [h for h in self.hosts if h != self.admin_host]
+        return list(self.hosts)
+
+    def expand(self, step, host):
+        """The step command with its {placeholders} filled in for host"""
+        return step.command.format(
+            stage=shlex.quote(self.transport.path(host, STAGE_DIR)),
+            sudo='' if self.options.no_sudo else 'sudo ',
+            admin_host=shlex.quote(self.admin_host),
+            hosts=shlex.quote(' '.join(self.domain_hosts)),
+            host=shlex.quote(host))
+
+    def readiness(self, index, host):
+        """'ready', 'wait' or the reason the task is skipped"""
+        step = self.plan[index]
+        for earlier in reversed(self.plan[:index]):
+            if host in self.hosts_of[earlier.name]:
+                result = self.results.get((earlier.name, host))
+                if result is None or result['status'] == 'running':
+                    return 'wait'
+                if result['status'] != 'ok':
+                    return 'skipped: ' + earlier.name + ' ' + result['status']
+                break
+        if step.barrier:
+            barrier_results = [self.results.get((step.barrier, h)) for h in self.hosts_of[step.barrier]]
+            if [r for r in barrier_results if r is None or r['status'] == 'running']:
+                return 'wait'
+            failed = [h for h, r in zip(self.hosts_of[step.barrier], barrier_results) if r['status'] != 'ok']
+            if failed:
+                return 'skipped: barrier ' + step.barrier + ' not ok on ' + ', '.join(failed)
+        return 'ready'
+
+    def execute(self, step, host):
+        started = time.time()
+        with open(os.path.join(self.options.log_dir, host + '.log'), 'ab') as log:
+            command = self.expand(step, host)
+            log.write(('\n=== %s %s on %s\n$ %s\n' % (time.strftime('%Y-%m-%d %H:%M:%S'), step.name, host,
+                                                        command)).encode('utf-8'))
+            log.flush()
+            status = 0
+            if step.put:
+                status = self.transport.put(host, step.put[0], step.put[1], log, self.options.timeout)
+            if status == 0:
+                status = self.transport.run(host, command, log, self.options.timeout)
+            seconds = time.time() - started
+            log.write(('=== %s exit %d after %.1fs\n' % (step.name, status, seconds)).encode('utf-8'))
+        return status, seconds
+
+    def finish(self, step, host, status, seconds):
+        with self.lock:
+            self.results[(step.name, host)] = {'status': 'ok' if status == 0 else 'failed',
+                                               'exit': status, 'seconds': round(seconds, 1)}
+            print('%-20s %-12s %s (%.1fs)' % (host, step.name, 'ok' if status == 0 else 'FAILED exit %d' % status,
+                                             seconds))
+            sys.stdout.flush()
+
+    def run(self):
+        pending = [(i, host) for i, step in enumerate(self.plan) for host in self.hosts_of[step.name]]
+        running = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.options.parallel) as pool:
+            while pending or running:
+                for index, host in list(pending):
+                    step = self.plan[index]
+                    state = self.readiness(index, host)
+                    if state == 'wait':
+                        continue
+                    pending.remove((index, host))
+                    if state == 'ready':
+                        self.results[(step.name, host)] = {'status': 'running'}
+                        running[pool.submit(self.execute, step, host)] = (step, host)
+                    else:
+                        self.results[(step.name, host)] = {'status': 'skipped', 'reason': state[9:]}
+                        print('%-20s %-12s %s' % (host, step.name, state))
+                if not running:
+                    break
+                done, _ = concurrent.futures.wait(list(running), return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    step, host = running.pop(future)
+                    try:
+                        status, seconds = future.result()
+                    except Exception as e:
+                        print('%-20s %-12s error: %s' % (host, step.name, e))
+                        status, seconds = 1, 0.0
+                    self.finish(step, host, status, seconds)
+        return self.summary()
+
+    def summary(self):
+        hosts = {}
+        for host in self.hosts:
+            steps = [(step.name, self.results[(step.name, host)])
+                     for step in self.plan if (step.name, host) in self.results]
+            failed = [name for name, result in steps if result['status'] != 'ok']
+            hosts[host] = {'status': 'failed' if failed else 'ok',
+                           'failed_step': failed[0] if failed else None,
+                           'steps': dict(steps),
+                           'log': os.path.join(self.options.log_dir, host + '.log')}
+        return hosts
+
+
+def print_plan(plan, executor):
+    for step in plan:
+        barrier = ' (after %s on all its hosts)' % step.barrier if step.barrier else ''
+        print('%-12s %s%s' % (step.name, ', '.join(executor.hosts_of[step.name]) or '(no selected hosts)',
+                              barrier))
+        for host in executor.hosts_of[step.name][:1]:
+            if step.put:
+                print('             copy %s -> %s' % (step.put[0], executor.transport.path(host, step.put[1])))
+            print('             $ %s' % executor.expand(step, host))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run provisioning steps on all domain hosts')
+    parser.add_argument('--config', required=True, help='part 3 domain .conf ([HOSTS], [MACHINES])')
+    parser.add_argument('--hosts', help='comma-separated subset of the hosts')
+    parser.add_argument('--admin-host', help='Admin Server host (default: HOST1)')
+    parser.add_argument('--parallel', type=int, default=DEFAULT_PARALLEL, help='hosts worked on at once')
+    parser.add_argument('--timeout', type=int, default=STEP_TIMEOUT, help='seconds per step and host')
+    parser.add_argument('--transport', choices=sorted(TRANSPORTS), default='ssh')
+    parser.add_argument('--ssh-user', help='remote user for the ssh transport')
+    parser.add_argument('--local-root', default='/tmp/provision-hosts', help='root of the local transport')
+    parser.add_argument('--container-prefix', default='', help='container name prefix for docker')
+    parser.add_argument('--log-dir', help='per-host logs (default: %s/<timestamp>)' % LOG_DIR)
+    parser.add_argument('--no-sudo', action='store_true', help='run commands without sudo')
+    parser.add_argument('--dry-run', action='store_true', help='print the plan only')
+    plans = parser.add_subparsers(dest='plan')
+    plans.required = True
+    plans.add_parser('install', help='copy the scripts and run install-services.sh')
+    plans.add_parser('start', help='start Node Manager, Admin Server, then managed servers')
+    run_parser = plans.add_parser('run', help='run a command on every host')
+    run_parser.add_argument('--admin-first', action='store_true', help='admin host before the others')
+    run_parser.add_argument('command')
+    options = parser.parse_args()
+
+    if options.parallel < 1:
+        parser.error('--parallel must be at least 1')
+    config = read_domain_config(options.config)
+    all_hosts = [host for host, machine in domain_hosts(config)]
+    hosts = list(all_hosts)
+    if not hosts:
+        parser.error('no hosts in [HOSTS] of ' + options.config)
+    admin_host = options.admin_host or hosts[0]
+    if options.hosts:
+        wanted = [h.strip() for h in options.hosts.split(',') if h.strip()]
+        unknown = [h for h in wanted if h not in hosts]
+        if unknown:
+            parser.error('not in ' + options.config + ': ' + ', '.join(unknown))
+        hosts = [h for h in hosts if h in wanted]
+
+    if options.plan == 'install':
+        plan = install_plan()
+    elif options.plan == 'start':
+        plan = start_plan()
+    else:
+        plan = command_plan(options.command, options.admin_first)
+
+    options.log_dir = options.log_dir or os.path.join(LOG_DIR, time.strftime('%Y%m%d-%H%M%S'))
+    executor = Executor(plan, hosts, all_hosts, admin_host, TRANSPORTS[options.transport](options), options)
+    print('Plan %s on %d host(s), admin host %s, %d at a time (%s transport)'
+          % (options.plan, len(hosts), admin_host, options.parallel, options.transport))
+    if options.dry_run:
+        print('')
+        print_plan(plan, executor)
+        return 0
+
+    os.makedirs(options.log_dir, exist_ok=True)
+    print('Logs: ' + options.log_dir)
+    print('')
+    started = time.time()
+    summary = executor.run()
+    with open(os.path.join(options.log_dir, 'summary.json'), 'w') as f:
+        json.dump({'plan': options.plan, 'admin_host': admin_host, 'hosts': summary,
+                   'seconds': round(time.time() - started, 1)}, f, indent=2, sort_keys=True)
+
+    print('')
+    failed = 0
+    for host in hosts:
+        result = summary[host]
+        if result['status'] == 'ok':
+            print('%-20s ok' % host)
+        else:
+            failed += 1
+            step = result['steps'][result['failed_step']]
+            reason = step.get('reason') or 'exit %d' % step['exit']
+            print('%-20s FAILED at %s (%s) - %s' % (host, result['failed_step'], reason, result['log']))
+    print('%d of %d host(s) ok in %.1fs' % (len(hosts) - failed, len(hosts), time.time() - started))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,441 @@
+#!/usr/bin/env python
+# =============================================================================
+# server-watchdog.py
+# Restarts unhealthy P6 EPPM managed servers
+#
+# Node Manager restarts a server whose process dies, but not one that is
+# still running and no longer useful. This daemon connects to the Admin
+# Server once and checks every managed server each poll_interval (polled
+# in parallel through domain_runtime.py, as collect-metrics.py does):
+#   lifecycle state   FAILED or FAILED_NOT_RESTARTABLE, or ADMIN for longer
+#                     than admin_grace
+#   health            ServerRuntime HealthState OVERLOADED, CRITICAL or FAILED
+#   stuck threads     ThreadPoolRuntime StuckThreadCount >= stuck_thread_limit
+#   heap after GC     lowest heap use over the last heap_window polls (what
+#                     is left after collections) above heap_after_gc_percent
+#                     of the maximum heap
+#   unresponsive      no answer to the poll within poll_timeout
+# A check must keep failing for unhealthy_for seconds (FAILED states: at
+# once) before the server is restarted: graceful shutdown, forced after
+# drain_timeout, then start through Node Manager.
+#
+# Restart policy:
+#   - one restart at a time in the whole domain, so two members of a
+#     cluster are never down for a restart together
+#   - a member that still serves requests (health, stuck threads, heap,
+#     unresponsive) is only restarted while all other members of its
+#     cluster are RUNNING and healthy; restarting it while they are
+#     struggling too would push its load onto an already overloaded cluster
+#   - restart_cooldown after a restart before the server is judged again,
+#     cluster_cooldown before another member of the same cluster
+#   - at most max_restarts_per_server per server and max_restarts_total in
+#     all within restart_window; a server that keeps failing is left alone
+#   - SHUTDOWN servers and servers being started or stopped by someone
+#     else are never touched
+#
+# Every action and every deferred restart is logged to stdout (the journal)
+# and appended to action_log. --dry-run logs what would be restarted
+# without restarting anything; each simulated restart counts as in progress
+# until the next poll and then starts the same cooldowns, so the log shows
+# what the policy would defer.
+#
+# Run by weblogic-watchdog.service on prmapp01, or by hand:
+#   wlst.sh server-watchdog.py [--dry-run] [--status] [--interval 30]
+#
+# Zero to Enterprise: P6 EPPM 25.12 with SSO - Part 4
+# Integration Faces - https://integrationfaces.com
+# Benjamin Mukoro & AI Assistant
+# =============================================================================
+
+import sys
+import os
+import time
+from collections import deque
+from java.util.concurrent import Executors, TimeUnit
+from weblogic.health import HealthState
+
+# Connection parameters
+admin_url = 't3://prmapp01:7001'
+admin_server = 'AdminServer'
+
+# Credential store files (created by store-credentials.py)
+credential_dir = '/u01/app/eppm/scripts'
+config_file = credential_dir + '/wlconfig'
+key_file = credential_dir + '/wlkey'
+
+# Health checks
+poll_interval = 30          # seconds between polls
+poll_timeout = 20           # seconds a server may take to answer a poll
+pool_size = 16              # polling threads
+unhealthy_for = 90          # seconds a check must keep failing before a restart
+admin_grace = 300           # seconds a server may stay in ADMIN (boot passes through it)
+stuck_thread_limit = 5      # stuck threads that make a server unhealthy
+heap_after_gc_percent = 90  # live heap as a percentage of the maximum heap
+heap_window = 10            # polls the lowest heap use is taken over
+unhealthy_health_states = ['HEALTH_OVERLOADED', 'HEALTH_CRITICAL', 'HEALTH_FAILED']
+ignore_servers = []         # servers the watchdog never restarts
+
+# Restart policy
+drain_timeout = 120         # seconds for a graceful shutdown before forcing
+force_timeout = 60          # seconds for a forced shutdown
+start_timeout = 480         # seconds for the server to reach RUNNING again
+restart_cooldown = 900      # seconds after a restart before the server is judged again
+cluster_cooldown = 300      # seconds after a restart before another member of its cluster
+restart_window = 3600       # seconds the restart limits count over
+max_restarts_per_server = 3
+max_restarts_total = 6
+
+action_log = '/u01/app/eppm/watchdog/actions.log'
+dry_run = False
+status_only = False
+
+args = sys.argv[1:]
+while args:
+    arg = args.pop(0)
+    if arg == '--dry-run':
+        dry_run = True
+    elif arg == '--status':
+        status_only = True
+    elif arg == '--interval':
+        poll_interval = int(args.pop(0))
+
+# domain_runtime.py and domain_topology.py are installed next to the credentials
+sys.path.append(credential_dir)
+import domain_runtime
+
+clusters = {}
+try:
+    import domain_topology
+    topology = domain_topology.load_topology()
+    admin_url = domain_topology.admin_url(topology) or admin_url
+    admin_server = topology['admin_server']
+    for cluster_name, cluster in topology['clusters'].items():
+        clusters[cluster_name] = cluster['servers']
+except Exception, e:
+    print('WARNING: config.xml unavailable (' + str(e) + '), using ' + admin_url +
+          ' and no cluster membership')
+
+# MBean types and the attributes the checks read (one getAttributes per MBean)
+mbean_types = {
+    'ServerRuntime': ['HealthState'],
+    'ThreadPoolRuntime': ['StuckThreadCount'],
+    'JVMRuntime': ['HeapSizeCurrent', 'HeapFreeCurrent', 'HeapSizeMax']
+}
+
+failed_states = ['FAILED', 'FAILED_NOT_RESTARTABLE']
+
+# Checks a server fails while it does not serve requests; restarting it
+# costs the cluster no capacity
+not_serving_checks = ['state', 'admin']
+
+
+def log(message):
+    print(time.strftime('%Y-%m-%d %H:%M:%S') + ' ' + message)
+    sys.stdout.flush()
+
+
+def action(server, name, detail):
+    """Log one watchdog action to stdout and action_log"""
+    line = '%s %-20s %-10s %s' % (time.strftime('%Y-%m-%d %H:%M:%S'), server, name, detail)
+    print(line)
+    sys.stdout.flush()
+    if not action_log:
+        return
+    try:
+        directory = os.path.dirname(action_log)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        f = open(action_log, 'a')
+        try:
+            f.write(line + '\n')
+        finally:
+            f.close()
+    except Exception, e:
+        log('Cannot write ' + action_log + ': ' + str(e))
+
+
+def cluster_of(server):
+    for cluster_name, members in clusters.items():
+        if server in members:
+            return cluster_name
+    return None
+
+
+class Restart:
+    """One server restart, advanced by one step each poll"""
+
+    def __init__(self, server, reason, serving):
+        self.server = server
+        self.reason = reason
+        self.started = time.time()
+        if serving:
+            self.lifecycle().shutdown(drain_timeout, False)
+            self.phase = 'draining'
+            self.deadline = self.started + drain_timeout
+            action(server, 'DRAIN', 'graceful shutdown, up to %ds (%s)' % (drain_timeout, reason))
+        else:
+            self.lifecycle().forceShutdown()
+            self.phase = 'forcing'
+            self.deadline = self.started + force_timeout
+            action(server, 'FORCE', 'forced shutdown (%s)' % reason)
+
+    def lifecycle(self):
+        # Looked up each time; the proxy does not survive a reconnect
+        return getMBean('/ServerLifeCycleRuntimes/' + self.server)
+
+    def advance(self, state):
+        """Move the restart on; returns None while it runs, else True/False"""
+        now = time.time()
+        if self.phase in ('draining', 'forcing') and state == 'SHUTDOWN':
+            self.lifecycle().start()
+            self.phase = 'starting'
+            self.deadline = now + start_timeout
+            action(self.server, 'START', 'start through Node Manager')
+        elif self.phase == 'draining' and now > self.deadline:
+            self.lifecycle().forceShutdown()
+            self.phase = 'forcing'
+            self.deadline = now + force_timeout
+            action(self.server, 'FORCE', 'not SHUTDOWN after %ds drain (%s)' % (drain_timeout, state))
+        elif self.phase == 'forcing' and now > self.deadline:
+            action(self.server, 'FAILED', 'not SHUTDOWN after forced shutdown (%s)' % state)
+            return False
+        elif self.phase == 'starting':
+            if state == 'RUNNING':
+                action(self.server, 'RESTARTED', 'RUNNING after %.0fs' % (now - self.started))
+                return True
+            if state in failed_states or now > self.deadline:
+                action(self.server, 'FAILED', 'start ended in %s after %.0fs' % (state, now - self.started))
+                return False
+        return None
+
+
+class SimulatedRestart:
+    """Stands in for a Restart with --dry-run; finished at the next poll"""
+
+    def __init__(self, server, reason):
+        self.server = server
+        self.reason = reason
+        self.started = time.time()
+        action(server, 'DRY-RUN', 'would restart (' + reason + ')')
+
+    def advance(self, state):
+        return True
+
+
+class Watchdog:
+    def __init__(self):
+        self.executor = Executors.newFixedThreadPool(pool_size)
+        self.checks = {}            # server -> {check: (since, detail)}
+        self.heap = {}              # server -> deque of heap use percentages
+        self.cooldown_until = {}    # server -> time
+        self.cluster_restarted = {} # cluster -> time its last restart ended
+        self.history = deque()      # (time, server) of restarts within restart_window
+        self.deferred = {}          # server -> reason last logged
+        self.restart = None
+        self.states = {}
+
+    def poll_servers(self, servers):
+        """{server: sample} for the running servers, None if it did not answer"""
+        names = admin.discover(mbean_types)
+        tasks = [admin.server_poll(server, names[server], mbean_types) for server in servers if server in names]
+        samples = dict([(server, None) for server in servers])
+        for future in self.executor.invokeAll(tasks, poll_timeout, TimeUnit.SECONDS):
+            if not future.isCancelled():
+                sample = future.get()
+                samples[sample['server']] = sample
+        return samples
+
+    def failing(self, server, state, sample):
+        """{check: detail} for every check the server fails right now"""
+        if state in failed_states:
+            return {'state': state}
+        if state == 'ADMIN':
+            return {'admin': 'in ADMIN state'}
+        if state != 'RUNNING':
+            return {}
+        if sample is None or sample['error']:
+            return {'unresponsive': (sample and sample['error']) or 'no answer within %ds' % poll_timeout}
+
+        failing = {}
+        values = dict([(mbean_type, attributes) for mbean_type, name, attributes in sample['mbeans']])
+        health = values.get('ServerRuntime', {}).get('HealthState')
+        if health is not None:
+            health_name = HealthState.mapToString(health.getState())
+            if health_name in unhealthy_health_states:
+                failing['health'] = health_name
+        stuck = values.get('ThreadPoolRuntime', {}).get('StuckThreadCount')
+        if stuck is not None and stuck >= stuck_thread_limit:
+            failing['stuck'] = '%d stuck threads' % stuck
+        jvm = values.get('JVMRuntime', {})
+        if jvm.get('HeapSizeMax'):
+            used = (jvm['HeapSizeCurrent'] - jvm['HeapFreeCurrent']) * 100.0 / jvm['HeapSizeMax']
+            history = self.heap.setdefault(server, deque(maxlen=heap_window))
+            history.append(used)
+            if len(history) == heap_window and min(history) >= heap_after_gc_percent:
+                failing['heap'] = 'heap after GC %.0f%% of max' % min(history)
+        return failing
+
+    def update_checks(self, server, failing):
+        now = time.time()
+        checks = self.checks.setdefault(server, {})
+        for check in checks.keys():
+            if check not in failing:
+                del checks[check]
+                action(server, 'RECOVERED', check)
+        for check, detail in failing.items():
+            if check not in checks:
+                action(server, 'UNHEALTHY', detail)
+            checks[check] = (checks.get(check, (now, None))[0], detail)
+
+    def due(self, server):
+        """The checks that have failed long enough to restart for"""
+        now = time.time()
+        due = []
+        for check, (since, detail) in self.checks.get(server, {}).items():
+            if check == 'state':
+                delay = 0
+            elif check == 'admin':
+                delay = admin_grace
+            else:
+                delay = unhealthy_for
+            if now - since >= delay:
+                due.append((check, detail))
+        return due
+
+    def blocked(self, server, serving):
+        """Why the policy does not allow restarting server now, or None"""
+        now = time.time()
+        while self.history and now - self.history[0][0] > restart_window:
+            self.history.popleft()
+        if self.restart is not None:
+            return 'restart of ' + self.restart.server + ' in progress'
+        if now < self.cooldown_until.get(server, 0):
+            return 'cooldown until ' + time.strftime('%H:%M:%S', time.localtime(self.cooldown_until[server]))
+        restarts = len([s for t, s in self.history if s == server])
+        if restarts >= max_restarts_per_server:
+            return '%d restarts within %ds, limit reached' % (restarts, restart_window)
+        if len(self.history) >= max_restarts_total:
+            return '%d domain restarts within %ds, limit reached' % (len(self.history), restart_window)
+
+        cluster_name = cluster_of(server)
+        if cluster_name is None:
+            return None
+        if now < self.cluster_restarted.get(cluster_name, 0) + cluster_cooldown:
+            return 'cluster ' + cluster_name + ' cooldown until ' + time.strftime(
+                '%H:%M:%S', time.localtime(self.cluster_restarted[cluster_name] + cluster_cooldown))
+        if serving:
+            peers = [s for s in clusters[cluster_name] if s != server]
+            down = [s for s in peers if self.states.get(s) != 'RUNNING']
+            if down:
+                return 'cluster members not RUNNING: ' + ', '.join(down)
+            struggling = [s for s in peers if self.checks.get(s)]
+            if struggling:
+                return 'cluster members also unhealthy: ' + ', '.join(struggling)
+        return None
+
+    def defer(self, server, reason):
+        """Log a deferred restart once per reason"""
+        if self.deferred.get(server) != reason:
+            self.deferred[server] = reason
+            action(server, 'DEFERRED', reason)
+
+    def finish_restart(self):
+        now = time.time()
+        server = self.restart.server
+        self.cooldown_until[server] = now + restart_cooldown
+        cluster_name = cluster_of(server)
+        if cluster_name:
+            self.cluster_restarted[cluster_name] = now
+        self.checks.pop(server, None)
+        self.heap.pop(server, None)
+        self.restart = None
+
+    def start_restart(self, server, due):
+        now = time.time()
+        serving = not [check for check, detail in due if check in not_serving_checks]
+        reason = '; '.join([detail for check, detail in due])
+        self.history.append((now, server))
+        self.deferred.pop(server, None)
+        if dry_run:
+            self.restart = SimulatedRestart(server, reason)
+            return
+        try:
+            self.restart = Restart(server, reason, serving)
+        except Exception, e:
+            action(server, 'FAILED', 'restart not started: ' + str(e))
+            self.cooldown_until[server] = now + restart_cooldown
+
+    def poll(self):
+        self.states = admin.lifecycle_states()
+        managed = [s for s in sorted(self.states.keys()) if s != admin_server and s not in ignore_servers]
+        running = [s for s in managed if self.states[s] == 'RUNNING']
+        samples = self.poll_servers(running)
+
+        if self.restart is not None:
+            result = self.restart.advance(self.states.get(self.restart.server))
+            if result is not None:
+                self.finish_restart()
+
+        for server in managed:
+            if self.restart is not None and server == self.restart.server:
+                continue
+            if self.states[server] != 'RUNNING':
+                self.heap.pop(server, None)
+            self.update_checks(server, self.failing(server, self.states[server], samples.get(server)))
+
+        # Servers that serve nothing first, then the longest unhealthy
+        candidates = []
+        for server in managed:
+            if self.restart is not None and server == self.restart.server:
+                continue
+            due = self.due(server)
+            if not due:
+                self.deferred.pop(server, None)
+                continue
+            serving = not [check for check, detail in due if check in not_serving_checks]
+            since = min([since for since, detail in self.checks[server].values()])
+            candidates.append((serving, since, server, due))
+        candidates.sort()
+
+        for serving, since, server, due in candidates:
+            reason = self.blocked(server, serving)
+            if reason:
+                self.defer(server, reason)
+                continue
+            self.start_restart(server, due)
+
+    def print_status(self):
+        print('%-20s %-24s %s' % ('Server', 'State', 'Failing checks'))
+        for server in sorted(self.states.keys()):
+            checks = self.checks.get(server, {})
+            details = ', '.join([detail for since, detail in checks.values()]) or '-'
+            print('%-20s %-24s %s' % (server, self.states[server], details))
+
+
+# Main
+admin = domain_runtime.AdminConnection(globals(), admin_url, config_file, key_file, log)
+admin.connect()
+watchdog = Watchdog()
+
+if status_only:
+    dry_run = True
+    action_log = None
+    watchdog.poll()
+    print('')
+    watchdog.print_status()
+    watchdog.executor.shutdownNow()
+    disconnect()
+    exit()
+
+log('Watching managed servers every %ds%s' % (poll_interval, dry_run and ' (dry run)' or ''))
+while True:
+    started = time.time()
+    try:
+        watchdog.poll()
+    except Exception, e:
+        log('Poll failed (' + str(e) + '), reconnecting')
+        try:
+            admin.reconnect()
+        except Exception, e:
+            log('Reconnect failed: ' + str(e))
+    time.sleep(max(1, poll_interval - (time.time() - started)))
@@ -15,6 +15,9 @@
 import sys
 import os
 import socket
+import time
+import random
+import httplib
 from java.lang import Thread
 
 # Connection parameters
@@ -25,78 +28,144 @@ credential_dir = '/u01/app/eppm/scripts'
 config_file = credential_dir + '/wlconfig'
 key_file = credential_dir + '/wlkey'
 
-# Retry settings for waiting on Admin Server
-max_retries = 30
-retry_interval = 10000  # milliseconds (10 seconds)
+# Readiness settings for waiting on Admin Server
+# The Admin Server is probed on its listen port (TCP, then GET /weblogic/ready)
+# with exponential backoff; WLST only connects once the probe passes.
+admin_wait_deadline = 300   # seconds to wait for the Admin Server overall
+backoff_initial = 1.0       # seconds before the second probe
+backoff_max = 15.0          # upper bound for the delay between probes
+probe_timeout = 3           # seconds per TCP/HTTP probe
+
+# Startup mode: 'parallel' launches every server with a non-blocking start
+# task and polls them together, 'serial' starts one server at a time.
+# Override on the command line with --parallel or --serial.
+start_mode = 'parallel'
+
+# Parallel startup settings
+start_timeout = 480     # seconds allowed for each start group to reach RUNNING
+poll_interval = 2000    # milliseconds between state polls
+
+# Optional start ordering for parallel mode. Each group is a list of server
+# name prefixes; a group is launched only once every server in the previous
+# group is RUNNING. Servers that match no group start with the first group.
+# Example - P6 Web first, then Web Services, then the rest together:
+#   start_groups = [['p6web'], ['p6ws'], ['p6tm', 'p6cc']]
+start_groups = []
+
+for arg in sys.argv[1:]:
+    if arg == '--parallel':
+        start_mode = 'parallel'
+    elif arg == '--serial':
+        start_mode = 'serial'
 
 # Get hostname and determine which servers to manage
 hostname = socket.gethostname().split('.')[0]  # Remove domain suffix if present
 
 # Server assignments by host
+# Resolved offline from the domain's config.xml (domain_topology.py, cached);
+# this map and admin_url above are only used when config.xml is unavailable.
 server_map = {
     'prmapp01': ['p6web_ms1', 'p6ws_ms1', 'p6tm_ms1', 'p6cc_ms1'],
     'prmapp02': ['p6web_ms2', 'p6ws_ms2', 'p6tm_ms2', 'p6cc_ms2']
 }
 
-if hostname not in server_map:
-    print('ERROR: Unknown hostname: ' + hostname)
-    print('Expected: prmapp01 or prmapp02')
-    sys.exit(1)
-
-managed_servers = server_map[hostname]
-
-print('=' * 60)
-print('P6 EPPM Managed Server Startup')
-print('Host: ' + hostname)
-print('=' * 60)
-print('')
+try:
+    sys.path.append(credential_dir)
+    import domain_topology
+    managed_servers, admin_url, topology_source = domain_topology.resolve_host(hostname, server_map, admin_url)
+except ImportError:
+    managed_servers = server_map.get(hostname)
+    topology_source = 'built-in server map'
 
-# Verify credential files exist
-if not os.path.exists(config_file):
-    print('ERROR: Credential config file not found: ' + config_file)
-    print('')
-    print('Please run store-credentials.py first to set up secure credentials.')
+if not managed_servers:
+    print('ERROR: No managed servers found for host: ' + hostname)
+    print('Source: ' + topology_source)
     sys.exit(1)
 
-if not os.path.exists(key_file):
-    print('ERROR: Credential key file not found: ' + key_file)
-    print('')
-    print('Please run store-credentials.py first to set up secure credentials.')
-    sys.exit(1)
+# Phase timings are appended to the timing history (lifecycle_timing.py)
+try:
+    import lifecycle_timing
+    timing = lifecycle_timing.Recorder('start-managed-servers', host=hostname, mode=start_mode)
+except ImportError:
+    timing = None
+
 
-# Try to connect with retries (wait for Admin Server to be ready)
-connected = False
-for attempt in range(1, max_retries + 1):
+def probe_admin_server(host, port):
+    """Cheap readiness probe: TCP connect, then the /weblogic/ready endpoint"""
     try:
-        print('Connecting to Admin Server at ' + admin_url + ' (attempt ' + str(attempt) + '/' + str(max_retries) + ')')
-        # Use encrypted credential store instead of plaintext password
-        connect(userConfigFile=config_file, userKeyFile=key_file, url=admin_url)
-        print('Connected successfully')
-        connected = True
-        break
+        sock = socket.create_connection((host, port), probe_timeout)
+        sock.close()
     except:
-        if attempt < max_retries:
-            print('  Admin Server not ready, waiting 10 seconds...')
-            Thread.sleep(retry_interval)
-        else:
-            print('ERROR: Could not connect after ' + str(max_retries) + ' attempts')
-            sys.exit(1)
+        return 'port closed'
+    
+    try:
+        conn = httplib.HTTPConnection(host, port, timeout=probe_timeout)
+        conn.request('GET', '/weblogic/ready')
+        status = conn.getresponse().status
+        conn.close()
+    except:
+        return 'no HTTP response'
+    
+    if status != 200:
+        return 'HTTP ' + str(status)
+    return None
 
-if not connected:
-    print('ERROR: Failed to connect to Admin Server')
-    sys.exit(1)
 
-print('')
+def wait_for_admin_server(host, port):
+    """Probe with exponential backoff and jitter until ready or the deadline"""
+    start_time = time.time()
+    deadline = start_time + admin_wait_deadline
+    delay = backoff_initial
+    attempt = 0
+    
+    while True:
+        attempt += 1
+        reason = probe_admin_server(host, port)
+        if reason is None:
+            print('Admin Server ready after %.1fs (%d probes)' % (time.time() - start_time, attempt))
+            return True
+        
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            print('ERROR: Admin Server not ready after %ds (last probe: %s)' % (admin_wait_deadline, reason))
+            return False
+        
+        # Full jitter keeps hosts from probing in lockstep after a shared reboot
+        sleep_time = min(random.uniform(delay / 2.0, delay), remaining)
+        print('  Admin Server not ready (%s), next probe in %.1fs' % (reason, sleep_time))
+        Thread.sleep(int(sleep_time * 1000))
+        delay = min(delay * 2, backoff_max)
 
-try:
-    # Navigate to domainRuntime to access ServerLifeCycleRuntimes
-    domainRuntime()
+
+def build_start_groups(servers, groups):
+    """Split servers into ordered start groups using start_groups prefixes"""
+    if not groups:
+        return [list(servers)]
     
+    buckets = [[] for group in groups]
+    for server_name in servers:
+        index = 0
+        for i in range(len(groups)):
+            matched = False
+            for prefix in groups[i]:
+                if server_name.startswith(prefix):
+                    matched = True
+                    break
+            if matched:
+                index = i
+                break
+        buckets[index].append(server_name)
+    
+    return [bucket for bucket in buckets if bucket]
+
+
+def start_serial(servers):
+    """Start servers one at a time, each blocking until RUNNING"""
     started_count = 0
     failed_count = 0
     skipped_count = 0
     
-    for server_name in managed_servers:
+    for server_name in servers:
         try:
             # Check current state
             cd('/ServerLifeCycleRuntimes/' + server_name)
@@ -108,13 +177,186 @@ try:
                 continue
             
             print('Starting: ' + server_name + ' (current state: ' + state + ')')
+            if timing:
+                timing.begin('server_start', server_name)
             start(server_name, 'Server')
             print('  -> Started: ' + server_name)
+            if timing:
+                timing.end('server_start', server_name)
             started_count += 1
         except Exception, e:
             print('  -> ERROR: ' + server_name + ': ' + str(e))
+            if timing:
+                timing.end('server_start', server_name, 'failed')
             failed_count += 1
     
+    return started_count, skipped_count, failed_count
+
+
+def start_group(servers, results):
+    """Launch non-blocking start tasks for a group and poll them together"""
+    tasks = {}
+    launched = {}
+    
+    for server_name in servers:
+        try:
+            lifecycle = getMBean('/ServerLifeCycleRuntimes/' + server_name)
+            state = lifecycle.getState()
+            
+            if state == 'RUNNING':
+                print('Server ' + server_name + ' is already RUNNING - skipping')
+                results[server_name] = ('SKIPPED', None)
+                continue
+            
+            print('Starting: ' + server_name + ' (current state: ' + state + ')')
+            # ServerLifeCycleRuntime.start() returns its task without blocking
+            tasks[server_name] = lifecycle.start()
+            launched[server_name] = time.time()
+        except Exception, e:
+            print('  -> ERROR: ' + server_name + ': ' + str(e))
+            results[server_name] = ('FAILED', None)
+    
+    pending = [name for name in servers if name in tasks]
+    deadline = time.time() + start_timeout
+    
+    while pending:
+        Thread.sleep(poll_interval)
+        
+        for server_name in list(pending):
+            task = tasks[server_name]
+            try:
+                state = getMBean('/ServerLifeCycleRuntimes/' + server_name).getState()
+            except:
+                state = 'UNKNOWN'
+            elapsed = time.time() - launched[server_name]
+            
+            if state == 'RUNNING':
+                print('  -> RUNNING: %s (%.1fs)' % (server_name, elapsed))
+                results[server_name] = ('STARTED', elapsed)
+                pending.remove(server_name)
+            elif not task.isRunning():
+                reason = state
+                if task.getError() is not None:
+                    reason = state + ' - ' + str(task.getError())
+                print('  -> FAILED: %s after %.1fs (%s)' % (server_name, elapsed, reason))
+                results[server_name] = ('FAILED', elapsed)
+                pending.remove(server_name)
+        
+        if pending and time.time() > deadline:
+            for server_name in pending:
+                elapsed = time.time() - launched[server_name]
+                print('  -> TIMEOUT: %s not RUNNING after %.1fs' % (server_name, elapsed))
+                results[server_name] = ('FAILED', elapsed)
+            pending = []
+    
+    if timing:
+        for server_name in servers:
+            status, elapsed = results[server_name]
+            if status != 'SKIPPED':
+                timing.add('server_start', elapsed, server_name, status == 'STARTED' and 'ok' or 'failed',
+                           launched.get(server_name))
+
+
+def start_parallel(servers):
+    """Start all servers concurrently, honouring start_groups ordering"""
+    results = {}
+    groups = build_start_groups(servers, start_groups)
+    boot_start = time.time()
+    
+    for i in range(len(groups)):
+        group = groups[i]
+        if len(groups) > 1:
+            print('Start group %d/%d: %s' % (i + 1, len(groups), ', '.join(group)))
+        start_group(group, results)
+        
+        failed = [name for name in group if results[name][0] == 'FAILED']
+        if failed and i < len(groups) - 1:
+            # Later groups depend on this one - do not launch them
+            print('  Group failed (' + ', '.join(failed) + ') - not starting later groups')
+            for later_group in groups[i + 1:]:
+                for server_name in later_group:
+                    results[server_name] = ('FAILED', None)
+            break
+    
+    print('')
+    print('Startup timings:')
+    for server_name in servers:
+        status, elapsed = results[server_name]
+        if elapsed is None:
+            print('  %-20s %s' % (server_name, status))
+        else:
+            print('  %-20s %-8s %7.1fs' % (server_name, status, elapsed))
+    print('  Host boot time: %.1fs' % (time.time() - boot_start))
+    
+    statuses = [result[0] for result in results.values()]
+    if timing:
+        timing.add('host_boot', time.time() - boot_start, None, 'FAILED' in statuses and 'failed' or 'ok',
+                   boot_start)
+    return statuses.count('STARTED'), statuses.count('SKIPPED'), statuses.count('FAILED')
+
+
+print('=' * 60)
+print('P6 EPPM Managed Server Startup')
+print('Host: ' + hostname)
+print('Servers: ' + ', '.join(managed_servers) + ' (from ' + topology_source + ')')
+print('Mode: ' + start_mode)
+print('=' * 60)
+print('')
+
+# Verify credential files exist
+if not os.path.exists(config_file):
+    print('ERROR: Credential config file not found: ' + config_file)
+    print('')
+    print('Please run store-credentials.py first to set up secure credentials.')
+    sys.exit(1)
+
+if not os.path.exists(key_file):
+    print('ERROR: Credential key file not found: ' + key_file)
+    print('')
+    print('Please run store-credentials.py first to set up secure credentials.')
+    sys.exit(1)
+
+# Wait for the Admin Server with a cheap probe, then connect exactly once
+admin_host, admin_port = admin_url.split('://')[1].split(':')
+print('Waiting for Admin Server at ' + admin_host + ':' + admin_port)
+if timing:
+    timing.begin('admin_wait')
+if not wait_for_admin_server(admin_host, int(admin_port)):
+    if timing:
+        timing.end('admin_wait', status='failed')
+        timing.finish('failed')
+    sys.exit(1)
+if timing:
+    timing.end('admin_wait')
+
+try:
+    print('Connecting to Admin Server at ' + admin_url)
+    if timing:
+        timing.begin('connect')
+    # Use encrypted credential store instead of plaintext password
+    connect(userConfigFile=config_file, userKeyFile=key_file, url=admin_url)
+    print('Connected successfully')
+    if timing:
+        timing.end('connect')
+except Exception, e:
+    print('ERROR: Could not connect to Admin Server')
+    print(str(e))
+    if timing:
+        timing.end('connect', status='failed')
+        timing.finish('failed')
+    sys.exit(1)
+
+print('')
+
+try:
+    # Navigate to domainRuntime to access ServerLifeCycleRuntimes
+    domainRuntime()
+    
+    if start_mode == 'parallel':
+        started_count, skipped_count, failed_count = start_parallel(managed_servers)
+    else:
+        started_count, skipped_count, failed_count = start_serial(managed_servers)
+    
     print('')
     print('=' * 60)
     print('Summary: Started %d, Skipped %d, Failed %d' % (started_count, skipped_count, failed_count))
@@ -122,9 +364,14 @@ try:
     
     disconnect()
     
+    if timing:
+        timing.finish(failed_count and 'failed' or 'ok', started=started_count, skipped=skipped_count,
+                      failed=failed_count)
     if failed_count > 0:
         sys.exit(1)
 
 except Exception, e:
     print('ERROR: ' + str(e))
+    if timing:
+        timing.finish('failed', error=str(e))
     sys.exit(1)
@@ -15,6 +15,8 @@
 import sys
 import os
 import socket
+import time
+from java.lang import Thread
 
 # Connection parameters
 admin_url = 't3://prmapp01:7001'
@@ -24,25 +26,205 @@ credential_dir = '/u01/app/eppm/scripts'
 config_file = credential_dir + '/wlconfig'
 key_file = credential_dir + '/wlkey'
 
+# Shutdown mode: 'graceful' drains all servers in parallel and escalates to a
+# forced shutdown only for servers that miss the drain deadline, 'force' shuts
+# servers down one at a time without draining.
+# Override on the command line with --graceful, --force or --drain-timeout=N.
+shutdown_mode = 'graceful'
+
+# Graceful shutdown settings
+# stop_overhead + drain_timeout + force_timeout must stay within
+# TimeoutStopSec of weblogic-managedservers.service (stop_timeout), or
+# systemd kills the stop mid-drain. A longer --drain-timeout is cut down to
+# fit; raise TimeoutStopSec and stop_timeout together to drain for longer.
+drain_timeout = 180     # seconds a server may spend finishing in-flight work
+force_timeout = 60      # seconds allowed for escalated forced shutdowns
+stop_timeout = 300      # TimeoutStopSec of weblogic-managedservers.service
+stop_overhead = 30      # seconds for WLST startup, connect and disconnect
+poll_interval = 2000    # milliseconds between state polls
+
+for arg in sys.argv[1:]:
+    if arg == '--graceful':
+        shutdown_mode = 'graceful'
+    elif arg == '--force':
+        shutdown_mode = 'force'
+    elif arg.startswith('--drain-timeout='):
+        drain_timeout = int(arg.split('=', 1)[1])
+
+max_drain_timeout = stop_timeout - stop_overhead - force_timeout
+if drain_timeout > max_drain_timeout:
+    print('WARNING: --drain-timeout=%d does not fit TimeoutStopSec=%d with %ds for forced '
+          'shutdowns; draining for %ds instead' % (drain_timeout, stop_timeout, force_timeout,
+                                                   max_drain_timeout))
+    drain_timeout = max_drain_timeout
+drain_timeout = max(0, drain_timeout)
+
 # Get hostname and determine which servers to manage
 hostname = socket.gethostname().split('.')[0]  # Remove domain suffix if present
 
 # Server assignments by host
+# Resolved offline from the domain's config.xml (domain_topology.py, cached);
+# this map and admin_url above are only used when config.xml is unavailable.
 server_map = {
     'prmapp01': ['p6web_ms1', 'p6ws_ms1', 'p6tm_ms1', 'p6cc_ms1'],
     'prmapp02': ['p6web_ms2', 'p6ws_ms2', 'p6tm_ms2', 'p6cc_ms2']
 }
 
-if hostname not in server_map:
-    print('ERROR: Unknown hostname: ' + hostname)
-    print('Expected: prmapp01 or prmapp02')
+try:
+    sys.path.append(credential_dir)
+    import domain_topology
+    managed_servers, admin_url, topology_source = domain_topology.resolve_host(hostname, server_map, admin_url)
+except ImportError:
+    managed_servers = server_map.get(hostname)
+    topology_source = 'built-in server map'
+
+if not managed_servers:
+    print('ERROR: No managed servers found for host: ' + hostname)
+    print('Source: ' + topology_source)
     sys.exit(1)
 
-managed_servers = server_map[hostname]
+# Phase timings are appended to the timing history (lifecycle_timing.py)
+try:
+    import lifecycle_timing
+    timing = lifecycle_timing.Recorder('stop-managed-servers', host=hostname, mode=shutdown_mode)
+except ImportError:
+    timing = None
+
+
+def stop_forced(servers):
+    """Force shutdown of servers one at a time"""
+    stopped_count = 0
+    failed_count = 0
+    skipped_count = 0
+    
+    for server_name in servers:
+        try:
+            # Check current state
+            cd('/ServerLifeCycleRuntimes/' + server_name)
+            state = cmo.getState()
+            
+            if state == 'SHUTDOWN':
+                print('Server ' + server_name + ' is already SHUTDOWN - skipping')
+                skipped_count += 1
+                continue
+            
+            print('Stopping: ' + server_name + ' (current state: ' + state + ')')
+            if timing:
+                timing.begin('server_stop', server_name)
+            shutdown(server_name, 'Server', force='true')
+            print('  -> Stopped: ' + server_name)
+            if timing:
+                timing.end('server_stop', server_name, outcome='forced')
+            stopped_count += 1
+        except Exception, e:
+            print('  -> ERROR: ' + server_name + ': ' + str(e))
+            if timing:
+                timing.end('server_stop', server_name, 'failed')
+            failed_count += 1
+    
+    return stopped_count, skipped_count, failed_count
+
+
+def wait_for_shutdown(servers, started, deadline, results, status):
+    """Poll servers together until all are SHUTDOWN or the deadline passes"""
+    pending = list(servers)
+    
+    while pending and time.time() < deadline:
+        Thread.sleep(poll_interval)
+        
+        for server_name in list(pending):
+            try:
+                state = getMBean('/ServerLifeCycleRuntimes/' + server_name).getState()
+            except:
+                state = 'UNKNOWN'
+            
+            if state == 'SHUTDOWN':
+                elapsed = time.time() - started[server_name]
+                print('  -> SHUTDOWN: %s (%.1fs)' % (server_name, elapsed))
+                results[server_name] = (status, elapsed)
+                pending.remove(server_name)
+    
+    return pending
+
+
+def stop_graceful(servers):
+    """Drain all servers in parallel, forcing only those that miss the deadline"""
+    results = {}
+    started = {}
+    draining = []
+    
+    for server_name in servers:
+        try:
+            lifecycle = getMBean('/ServerLifeCycleRuntimes/' + server_name)
+            state = lifecycle.getState()
+            
+            if state == 'SHUTDOWN':
+                print('Server ' + server_name + ' is already SHUTDOWN - skipping')
+                results[server_name] = ('SKIPPED', None)
+                continue
+            
+            print('Draining: ' + server_name + ' (current state: ' + state + ')')
+            started[server_name] = time.time()
+            # Graceful shutdown waits for in-flight work and HTTP sessions;
+            # the returned task completes in the background
+            lifecycle.shutdown(drain_timeout, False)
+            draining.append(server_name)
+        except Exception, e:
+            print('  -> ERROR: ' + server_name + ': ' + str(e))
+            if server_name in started:
+                # The graceful request failed; let the force pass handle it
+                draining.append(server_name)
+            else:
+                results[server_name] = ('FAILED', None)
+    
+    deadline = time.time() + drain_timeout
+    missed = wait_for_shutdown(draining, started, deadline, results, 'DRAINED')
+    
+    if missed:
+        print('')
+        print('Drain timeout reached - forcing: ' + ', '.join(missed))
+        forcing = []
+        for server_name in missed:
+            try:
+                getMBean('/ServerLifeCycleRuntimes/' + server_name).forceShutdown()
+                forcing.append(server_name)
+            except Exception, e:
+                print('  -> ERROR: ' + server_name + ': ' + str(e))
+                results[server_name] = ('FAILED', time.time() - started[server_name])
+        
+        deadline = time.time() + force_timeout
+        remaining = wait_for_shutdown(forcing, started, deadline, results, 'FORCED')
+        for server_name in remaining:
+            elapsed = time.time() - started[server_name]
+            print('  -> TIMEOUT: %s not SHUTDOWN after %.1fs' % (server_name, elapsed))
+            results[server_name] = ('FAILED', elapsed)
+    
+    print('')
+    print('Shutdown timings:')
+    for server_name in servers:
+        status, elapsed = results[server_name]
+        if elapsed is None:
+            print('  %-20s %s' % (server_name, status))
+        else:
+            print('  %-20s %-8s %7.1fs' % (server_name, status, elapsed))
+        if timing and status != 'SKIPPED':
+            timing.add('server_stop', elapsed, server_name, status != 'FAILED' and 'ok' or 'failed',
+                       started.get(server_name), outcome=status.lower())
+    
+    statuses = [result[0] for result in results.values()]
+    forced_count = statuses.count('FORCED')
+    if forced_count > 0:
+        print('  Forced after drain timeout: %d' % forced_count)
+    
+    stopped_count = statuses.count('DRAINED') + forced_count
+    return stopped_count, statuses.count('SKIPPED'), statuses.count('FAILED')
+
 
 print('=' * 60)
 print('P6 EPPM Managed Server Shutdown')
 print('Host: ' + hostname)
+print('Servers: ' + ', '.join(managed_servers) + ' (from ' + topology_source + ')')
+print('Mode: ' + shutdown_mode)
 print('=' * 60)
 print('')
 
@@ -61,41 +243,30 @@ if not os.path.exists(key_file):
 
 try:
     print('Connecting to Admin Server at ' + admin_url + '...')
+    if timing:
+        timing.begin('connect')
     # Use encrypted credential store instead of plaintext password
     connect(userConfigFile=config_file, userKeyFile=key_file, url=admin_url)
     print('Connected successfully')
     print('')
+    if timing:
+        timing.end('connect')
 except Exception, e:
     print('ERROR: Could not connect to Admin Server')
     print(str(e))
+    if timing:
+        timing.end('connect', status='failed')
+        timing.finish('failed')
     sys.exit(1)
 
 try:
     # Navigate to domainRuntime to access ServerLifeCycleRuntimes
     domainRuntime()
     
-    stopped_count = 0
-    failed_count = 0
-    skipped_count = 0
-    
-    for server_name in managed_servers:
-        try:
-            # Check current state
-            cd('/ServerLifeCycleRuntimes/' + server_name)
-            state = cmo.getState()
-            
-            if state == 'SHUTDOWN':
-                print('Server ' + server_name + ' is already SHUTDOWN - skipping')
-                skipped_count += 1
-                continue
-            
-            print('Stopping: ' + server_name + ' (current state: ' + state + ')')
-            shutdown(server_name, 'Server', force='true')
-            print('  -> Stopped: ' + server_name)
-            stopped_count += 1
-        except Exception, e:
-            print('  -> ERROR: ' + server_name + ': ' + str(e))
-            failed_count += 1
+    if shutdown_mode == 'graceful':
+        stopped_count, skipped_count, failed_count = stop_graceful(managed_servers)
+    else:
+        stopped_count, skipped_count, failed_count = stop_forced(managed_servers)
     
     print('')
     print('=' * 60)
@@ -104,9 +275,14 @@ try:
     
     disconnect()
     
+    if timing:
+        timing.finish(failed_count and 'failed' or 'ok', stopped=stopped_count, skipped=skipped_count,
+                      failed=failed_count)
     if failed_count > 0:
         sys.exit(1)
 
 except Exception, e:
     print('ERROR: ' + str(e))
+    if timing:
+        timing.finish('failed', error=str(e))
     sys.exit(1)
@@ -40,7 +40,10 @@ echo "Service Status:"
 echo "------------------------------------------------------------"
 check_service "weblogic-nodemanager"
 check_service "weblogic-adminserver"
+check_service "weblogic-wlst-agent"
 check_service "weblogic-managedservers"
+check_service "weblogic-metrics"
+check_service "weblogic-watchdog"
 
 echo ""
 echo "============================================================"
@@ -50,19 +53,26 @@ echo ""
 echo "Start all (prmapp01):"
 echo "  sudo systemctl start weblogic-nodemanager"
 echo "  sudo systemctl start weblogic-adminserver"
+echo "  sudo systemctl start weblogic-wlst-agent"
 echo "  sudo systemctl start weblogic-managedservers"
 echo ""
 echo "Start all (prmapp02):"
 echo "  sudo systemctl start weblogic-nodemanager"
+echo "  sudo systemctl start weblogic-wlst-agent"
 echo "  sudo systemctl start weblogic-managedservers"
 echo ""
 echo "Stop all:"
+echo "  sudo systemctl stop weblogic-watchdog"
 echo "  sudo systemctl stop weblogic-managedservers"
+echo "  sudo systemctl stop weblogic-wlst-agent"
 echo "  sudo systemctl stop weblogic-adminserver"
 echo "  sudo systemctl stop weblogic-nodemanager"
 echo ""
 echo "View logs:"
 echo "  journalctl -u weblogic-nodemanager -f"
 echo "  journalctl -u weblogic-adminserver -f"
+echo "  journalctl -u weblogic-wlst-agent -f"
 echo "  journalctl -u weblogic-managedservers -f"
+echo "  journalctl -u weblogic-metrics -f"
+echo "  journalctl -u weblogic-watchdog -f"
 echo ""
@@ -0,0 +1,87 @@
+#!/bin/bash
+# =============================================================================
+# wait-for-admin.sh
+# Wait until the WebLogic Admin Server reports ready
+#
+# Probes the Admin Server listen port (TCP connect, then GET /weblogic/ready)
+# with exponential backoff and jitter until it answers HTTP 200 or the
+# overall deadline passes. Used by the systemd units so that dependent
+# services start only once the Admin Server can actually serve requests:
+#   - weblogic-adminserver.service runs it as ExecStartPost, so the unit
+#     only becomes active (and units ordered After= it only start) when
+#     the Admin Server is RUNNING
+#   - weblogic-managedservers.service runs it as ExecStartPre, so the WLST
+#     JVM is not started until there is something to connect to
+#
+# Usage:
+#   ./wait-for-admin.sh [host] [port]
+#
+# Environment:
+#   ADMIN_HOST            Admin Server host (default: prmapp01)
+#   ADMIN_PORT            Admin Server port (default: 7001)
+#   ADMIN_WAIT_DEADLINE   Seconds to wait overall (default: 300)
+#
+# Zero to Enterprise: P6 EPPM 25.12 with SSO - Part 4
+# Integration Faces - https://integrationfaces.com
+# Benjamin Mukoro & AI Assistant
+# =============================================================================
+
+ADMIN_HOST="${1:-${ADMIN_HOST:-prmapp01}}"
+ADMIN_PORT="${2:-${ADMIN_PORT:-7001}}"
+ADMIN_WAIT_DEADLINE="${ADMIN_WAIT_DEADLINE:-300}"
+
+# Backoff settings (milliseconds)
+BACKOFF_INITIAL=1000
+BACKOFF_MAX=15000
+PROBE_TIMEOUT=3
+
+# Returns 0 when ready, otherwise prints the reason and returns 1
+probe_admin() {
+    if ! timeout "${PROBE_TIMEOUT}" bash -c "exec 3<>/dev/tcp/${ADMIN_HOST}/${ADMIN_PORT}" 2>/dev/null; then
+        echo "port closed"
+        return 1
+    fi
+
+    local http_code
+    http_code=$(curl -s -o /dev/null -w "%{http_code}" --max-time "${PROBE_TIMEOUT}" \
+        "http://${ADMIN_HOST}:${ADMIN_PORT}/weblogic/ready" 2>/dev/null)
+
+    if [[ "${http_code}" != "200" ]]; then
+        echo "HTTP ${http_code}"
+        return 1
+    fi
+    return 0
+}
+
+echo "Waiting for Admin Server at ${ADMIN_HOST}:${ADMIN_PORT} (deadline ${ADMIN_WAIT_DEADLINE}s)"
+
+start_time=$(date +%s)
+deadline=$((start_time + ADMIN_WAIT_DEADLINE))
+delay=${BACKOFF_INITIAL}
+attempt=0
+
+while true; do
+    attempt=$((attempt + 1))
+    reason=$(probe_admin)
+    if [[ $? -eq 0 ]]; then
+        echo "Admin Server ready after $(( $(date +%s) - start_time ))s (${attempt} probes)"
+        exit 0
+    fi
+
+    now=$(date +%s)
+    if [[ ${now} -ge ${deadline} ]]; then
+        echo "ERROR: Admin Server not ready after ${ADMIN_WAIT_DEADLINE}s (last probe: ${reason})"
+        exit 1
+    fi
+
+    # Full jitter: sleep a random time between delay/2 and delay
+    sleep_ms=$(( delay / 2 + RANDOM % (delay / 2 + 1) ))
+    remaining_ms=$(( (deadline - now) * 1000 ))
+    [[ ${sleep_ms} -gt ${remaining_ms} ]] && sleep_ms=${remaining_ms}
+
+    echo "  Admin Server not ready (${reason}), next probe in $((sleep_ms / 1000)).$(printf '%03d' $((sleep_ms % 1000)))s"
+    sleep "$((sleep_ms / 1000)).$(printf '%03d' $((sleep_ms % 1000)))"
+
+    delay=$((delay * 2))
+    [[ ${delay} -gt ${BACKOFF_MAX} ]] && delay=${BACKOFF_MAX}
+done
@@ -0,0 +1,502 @@
+#!/usr/bin/env python
+# =============================================================================
+# wlst-agent.py
+# Long-lived WLST agent for P6 EPPM operational commands
+#
+# Connects to the Admin Server once and then serves operations (ping, state,
+# start, stop, deploy, undeploy, set-arguments) to local clients, so that
+# repeated commands do not pay for a WLST JVM and a t3 connection each time.
+# Run by weblogic-wlst-agent.service; use wlst-client.py to talk to it.
+#
+# The JVM in use (JDK 11) has no Unix domain socket support, so the agent
+# listens on a loopback TCP port instead. Clients must present the random
+# token written to agent_state_file, which is readable by oracle only.
+#
+# Protocol: one JSON request per connection, one JSON response, each a
+# single line:
+#   {"token": "...", "op": "start", "args": {"host": "prmapp01"}}
+#   {"ok": true, "result": {...}, "elapsed_ms": 12}
+#
+# Operations are executed one at a time (WLST is not thread safe); a client
+# arriving during a long start or stop waits in the listen backlog.
+#
+# Zero to Enterprise: P6 EPPM 25.12 with SSO - Part 4
+# Integration Faces - https://integrationfaces.com
+# Benjamin Mukoro & AI Assistant
+# =============================================================================
+
+import sys
+import os
+import socket
+import time
+import json
+from java.lang import Thread
+from java.security import SecureRandom
+
+# Connection parameters
+admin_url = 't3://prmapp01:7001'
+
+# Credential store files (created by store-credentials.py)
+credential_dir = '/u01/app/eppm/scripts'
+config_file = credential_dir + '/wlconfig'
+key_file = credential_dir + '/wlkey'
+
+# Agent listener
+# agent_state_file holds the port and access token for clients (mode 0600)
+agent_host = '127.0.0.1'
+agent_port = 9799
+agent_state_file = credential_dir + '/.wlst-agent'
+request_timeout = 30            # seconds a client has to send its request
+max_request_size = 1024 * 1024  # bytes
+
+# Defaults for start and stop (same as start/stop-managed-servers.py)
+start_timeout = 480     # seconds allowed for servers to reach RUNNING
+drain_timeout = 180     # seconds allowed for a graceful shutdown
+force_timeout = 60      # seconds allowed for a forced shutdown
+stop_timeout = 300      # TimeoutStopSec of weblogic-managedservers.service
+poll_interval = 2000    # milliseconds between state polls
+
+# Server assignments by host
+# Resolved from config.xml (domain_topology.py) on each request; this map is
+# only used when config.xml is unavailable.
+server_map = {
+    'prmapp01': ['p6web_ms1', 'p6ws_ms1', 'p6tm_ms1', 'p6cc_ms1'],
+    'prmapp02': ['p6web_ms2', 'p6ws_ms2', 'p6tm_ms2', 'p6cc_ms2']
+}
+
+try:
+    sys.path.append(credential_dir)
+    import domain_topology
+except ImportError:
+    domain_topology = None
+
+try:
+    import lifecycle_timing
+except ImportError:
+    lifecycle_timing = None
+
+if domain_topology is not None:
+    try:
+        admin_url = domain_topology.admin_url(domain_topology.load_topology()) or admin_url
+    except Exception, e:
+        print('WARNING: config.xml unavailable (' + str(e) + '), using ' + admin_url)
+
+
+class OperationFailed(Exception):
+    """An operation ran but did not fully succeed; carries its result"""
+    def __init__(self, message, result):
+        Exception.__init__(self, message)
+        self.result = result
+
+
+def log(message):
+    print(time.strftime('%Y-%m-%d %H:%M:%S') + ' ' + message)
+    sys.stdout.flush()
+
+
+def connect_admin():
+    """(Re)connect to the Admin Server using the credential store"""
+    log('Connecting to Admin Server at ' + admin_url)
+    connect(userConfigFile=config_file, userKeyFile=key_file, url=admin_url)
+    log('Connected')
+
+
+def ensure_connected():
+    """Reconnect if the Admin Server was restarted since the last request"""
+    try:
+        serverConfig()
+        cd('/')
+        cmo.getName()
+    except Exception, e:
+        log('Connection lost (' + str(e) + '), reconnecting')
+        try:
+            disconnect()
+        except:
+            pass
+        connect_admin()
+
+
+def resolve_servers(args):
+    """Servers named in the request, else those of args['host'], else all"""
+    if args.get('servers'):
+        return list(args['servers'])
+    if args.get('host'):
+        host = args['host'].split('.')[0]
+        servers = None
+        if domain_topology is not None:
+            servers, url, source = domain_topology.resolve_host(host, server_map)
+        elif host in server_map:
+            servers = list(server_map[host])
+        if not servers:
+            raise ValueError('unknown host: ' + host)
+        return servers
+    host_map = server_map
+    if domain_topology is not None:
+        try:
+            host_map = domain_topology.load_topology()['hosts']
+        except Exception, e:
+            log('Using built-in server map: ' + str(e))
+    servers = []
+    for host in sorted(host_map.keys()):
+        servers.extend(host_map[host])
+    return servers
+
+
+def get_lifecycle(server_name):
+    lifecycle = getMBean('/ServerLifeCycleRuntimes/' + server_name)
+    if lifecycle is None:
+        raise ValueError('unknown server: ' + server_name)
+    return lifecycle
+
+
+def server_state(server_name):
+    try:
+        return get_lifecycle(server_name).getState()
+    except:
+        return 'UNKNOWN'
+
+
+def new_timing(operation, args, **context):
+    """Timing record of a start or stop request (lifecycle_timing.py)"""
+    if lifecycle_timing is None:
+        return None
+    host = args.get('host') and args['host'].split('.')[0] or None
+    return lifecycle_timing.Recorder(operation, host=host, via='agent', **context)
+
+
+def record_timing(timing, span, servers, results, started):
+    """Add each server's start/stop time to the record and append it"""
+    if timing is None:
+        return
+    statuses = []
+    for server_name in servers:
+        status, elapsed = results[server_name]
+        statuses.append(status)
+        if status != 'SKIPPED':
+            timing.add(span, elapsed, server_name, status != 'FAILED' and 'ok' or 'failed',
+                       started.get(server_name), outcome=status.lower())
+    timing.finish('FAILED' in statuses and 'failed' or 'ok')
+
+
+def op_ping(args):
+    return {'admin_url': admin_url, 'uptime': int(time.time() - agent_started),
+            'requests': request_count}
+
+
+def op_state(args):
+    domainRuntime()
+    if args.get('servers') or args.get('host'):
+        server_names = resolve_servers(args)
+    else:
+        # Whole domain, including the Admin Server
+        server_names = [lifecycle.getName() for lifecycle in cmo.getServerLifeCycleRuntimes()]
+    servers = []
+    for server_name in server_names:
+        servers.append({'server': server_name, 'state': server_state(server_name)})
+    result = {'servers': servers}
+
+    if args.get('applications'):
+        serverConfig()
+        cd('/')
+        applications = []
+        for app in cmo.getAppDeployments():
+            applications.append({'application': app.getName(),
+                                 'targets': [t.getName() for t in app.getTargets()]})
+        result['applications'] = applications
+    return result
+
+
+def op_start(args):
+    """Start servers with non-blocking start tasks and poll them together"""
+    timeout = int(args.get('timeout', start_timeout))
+    timing = new_timing('start-managed-servers', args, mode='parallel')
+    domainRuntime()
+    results = {}
+    tasks = {}
+    launched = {}
+    servers = resolve_servers(args)
+
+    for server_name in servers:
+        try:
+            lifecycle = get_lifecycle(server_name)
+            if lifecycle.getState() == 'RUNNING':
+                results[server_name] = ('SKIPPED', None)
+                continue
+            tasks[server_name] = lifecycle.start()
+            launched[server_name] = time.time()
+        except Exception, e:
+            log('start ' + server_name + ': ' + str(e))
+            results[server_name] = ('FAILED', None)
+
+    pending = [name for name in servers if name in tasks]
+    deadline = time.time() + timeout
+    while pending:
+        Thread.sleep(poll_interval)
+        for server_name in list(pending):
+            task = tasks[server_name]
+            state = server_state(server_name)
+            elapsed = time.time() - launched[server_name]
+            if state == 'RUNNING':
+                results[server_name] = ('STARTED', elapsed)
+            elif not task.isRunning():
+                if task.getError() is not None:
+                    log('start ' + server_name + ': ' + str(task.getError()))
+                results[server_name] = ('FAILED', elapsed)
+            elif time.time() > deadline:
+                results[server_name] = ('FAILED', elapsed)
+            else:
+                continue
+            pending.remove(server_name)
+
+    record_timing(timing, 'server_start', servers, results, launched)
+    return server_results(servers, results)
+
+
+def op_stop(args):
+    """Graceful (drain, then force stragglers) or forced shutdown"""
+    force = args.get('force', False)
+    # A stop from wlst-run.sh must finish within TimeoutStopSec
+    drain = max(0, min(int(args.get('drain_timeout', drain_timeout)), stop_timeout - force_timeout))
+    timing = new_timing('stop-managed-servers', args, mode=force and 'force' or 'graceful')
+    domainRuntime()
+    results = {}
+    started = {}
+    servers = resolve_servers(args)
+
+    for server_name in servers:
+        try:
+            lifecycle = get_lifecycle(server_name)
+            if lifecycle.getState() == 'SHUTDOWN':
+                results[server_name] = ('SKIPPED', None)
+                continue
+            started[server_name] = time.time()
+            if force:
+                lifecycle.forceShutdown()
+            else:
+                lifecycle.shutdown(drain, False)
+        except Exception, e:
+            log('stop ' + server_name + ': ' + str(e))
+            if server_name not in started:
+                results[server_name] = ('FAILED', None)
+
+    if force:
+        passes = [('FORCED', force_timeout)]
+    else:
+        passes = [('DRAINED', drain), ('FORCED', force_timeout)]
+
+    pending = [name for name in servers if name in started]
+    for status, timeout in passes:
+        if not pending:
+            break
+        if status == 'FORCED' and not force:
+            for server_name in pending:
+                try:
+                    get_lifecycle(server_name).forceShutdown()
+                except Exception, e:
+                    log('force ' + server_name + ': ' + str(e))
+        deadline = time.time() + timeout
+        while pending and time.time() < deadline:
+            Thread.sleep(poll_interval)
+            for server_name in list(pending):
+                if server_state(server_name) == 'SHUTDOWN':
+                    results[server_name] = (status, time.time() - started[server_name])
+                    pending.remove(server_name)
+
+    for server_name in pending:
+        results[server_name] = ('FAILED', time.time() - started[server_name])
+    record_timing(timing, 'server_stop', servers, results, started)
+    return server_results(servers, results)
+
+
+def server_results(servers, results):
+    """Response body for start/stop: per-server status, seconds and counts"""
+    rows = []
+    for server_name in servers:
+        status, elapsed = results[server_name]
+        if elapsed is not None:
+            elapsed = round(elapsed, 1)
+        rows.append({'server': server_name, 'status': status, 'seconds': elapsed})
+    failed = [row['server'] for row in rows if row['status'] == 'FAILED']
+    if failed:
+        raise OperationFailed('failed: ' + ', '.join(failed), {'servers': rows})
+    return {'servers': rows}
+
+
+def op_deploy(args):
+    """Deploy an application, or redeploy it in place if it is deployed
+
+    The same deploy() call as deploy_p6web_only.py: the running application
+    is not undeployed first, and the stage mode is only passed on when the
+    client asks for one, so the configured staging mode is kept otherwise.
+    """
+    app_name = args['app']
+    source_path = args['path']
+    if not os.path.exists(source_path):
+        raise ValueError('source not found: ' + source_path)
+
+    serverConfig()
+    if args.get('stage_mode'):
+        deploy(app_name, source_path, targets=args['targets'], stageMode=args['stage_mode'])
+    else:
+        deploy(app_name, source_path, targets=args['targets'])
+    return {'application': app_name, 'targets': args['targets']}
+
+
+def op_undeploy(args):
+    serverConfig()
+    undeploy(args['app'])
+    return {'application': args['app']}
+
+
+def op_set_arguments(args):
+    """Set Server Start arguments for several servers in one edit session
+
+    args['servers'] maps server name to the complete argument string.
+    Servers whose arguments are already identical are not touched.
+    """
+    wanted = args['servers']
+    serverConfig()
+    changed = []
+    for server_name in sorted(wanted.keys()):
+        cd('/Servers/' + server_name + '/ServerStart/' + server_name)
+        if ' '.join((cmo.getArguments() or '').split()) != ' '.join(wanted[server_name].split()):
+            changed.append(server_name)
+
+    if not changed:
+        return {'changed': []}
+
+    edit()
+    startEdit()
+    try:
+        for server_name in changed:
+            cd('/Servers/' + server_name + '/ServerStart/' + server_name)
+            cmo.setArguments(wanted[server_name])
+        save()
+        activate(block='true')
+    except:
+        cancelEdit('y')
+        raise
+    return {'changed': changed, 'restart_required': changed}
+
+
+operations = {
+    'ping': op_ping,
+    'state': op_state,
+    'start': op_start,
+    'stop': op_stop,
+    'deploy': op_deploy,
+    'undeploy': op_undeploy,
+    'set-arguments': op_set_arguments
+}
+
+
+def new_token():
+    random_bytes = SecureRandom().generateSeed(24)
+    return ''.join(['%02x' % (b & 0xff) for b in random_bytes])
+
+
+def write_state_file(port, token):
+    """Publish port and token for clients, readable by the owner only"""
+    temp_file = agent_state_file + '.tmp'
+    state_file = open(temp_file, 'w')
+    try:
+        json.dump({'host': agent_host, 'port': port, 'token': token,
+                   'admin_url': admin_url}, state_file)
+    finally:
+        state_file.close()
+    os.chmod(temp_file, 0600)
+    os.rename(temp_file, agent_state_file)
+
+
+def read_request(conn):
+    data = ''
+    while not data.endswith('\n'):
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+        if len(data) > max_request_size:
+            raise ValueError('request too large')
+    return json.loads(data)
+
+
+def handle(conn, token):
+    """Serve one request on an accepted connection"""
+    global request_count
+    started = time.time()
+    conn.settimeout(request_timeout)
+    try:
+        request = read_request(conn)
+    except Exception, e:
+        return {'ok': False, 'error': 'bad request: ' + str(e)}
+
+    if request.get('token') != token:
+        return {'ok': False, 'error': 'invalid token'}
+
+    op = request.get('op')
+    if op not in operations:
+        return {'ok': False, 'error': 'unknown operation: ' + str(op)}
+
+    request_count += 1
+    args = request.get('args') or {}
+    conn.settimeout(None)
+    try:
+        ensure_connected()
+        response = {'ok': True, 'result': operations[op](args)}
+    except OperationFailed, e:
+        response = {'ok': False, 'error': str(e), 'result': e.result}
+    except Exception, e:
+        response = {'ok': False, 'error': str(e)}
+
+    response['elapsed_ms'] = int((time.time() - started) * 1000)
+    log(op + ' ' + json.dumps(args) + ' -> ' + ('ok' if response['ok'] else 'FAILED: ' + response['error']) +
+        ' (' + str(response['elapsed_ms']) + ' ms)')
+    return response
+
+
+print('=' * 60)
+print('P6 EPPM WLST Agent')
+print('Listening on: ' + agent_host + ':' + str(agent_port))
+print('=' * 60)
+print('')
+
+# Verify credential files exist
+if not os.path.exists(config_file) or not os.path.exists(key_file):
+    print('ERROR: Credential files not found in ' + credential_dir)
+    print('')
+    print('Please run store-credentials.py first to set up secure credentials.')
+    sys.exit(1)
+
+try:
+    connect_admin()
+except Exception, e:
+    print('ERROR: Could not connect to Admin Server')
+    print(str(e))
+    sys.exit(1)
+
+agent_started = time.time()
+request_count = 0
+token = new_token()
+
+listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+listener.bind((agent_host, agent_port))
+listener.listen(16)
+
+# Clients treat the state file as "agent ready"
+write_state_file(agent_port, token)
+log('Ready')
+
+try:
+    while True:
+        conn, address = listener.accept()
+        try:
+            response = handle(conn, token)
+            conn.sendall(json.dumps(response) + '\n')
+        except Exception, e:
+            log('Client error: ' + str(e))
+        conn.close()
+finally:
+    if os.path.exists(agent_state_file):
+        os.remove(agent_state_file)
+    listener.close()
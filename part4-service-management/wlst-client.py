@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# =============================================================================
+# wlst-client.py
+# Thin client for the WLST agent (wlst-agent.py)
+#
+# Sends one operation to the running agent and prints the result. Starts in
+# milliseconds because there is no WLST JVM and no t3 connect - the agent
+# already holds both.
+#
+# Usage:
+#   ./wlst-client.py ping
+#   ./wlst-client.py state [--host prmapp01] [--applications] [server ...]
+#   ./wlst-client.py start [--host prmapp01] [--timeout 480] [server ...]
+#   ./wlst-client.py stop [--host prmapp01] [--force] [--drain-timeout 180] [server ...]
+#   ./wlst-client.py deploy <app> <path> <targets> [--stage-mode stage|nostage|external_stage]
+#   ./wlst-client.py undeploy <app>
+#   ./wlst-client.py set-arguments <server> <arguments>
+#
+# Add --json before the command to print the raw response.
+#
+# Exit codes:
+#   0  success (state: every server RUNNING)
+#   1  the operation failed (state: some servers not RUNNING)
+#   3  agent not available - callers fall back to wlst.sh
+#
+# Zero to Enterprise: P6 EPPM 25.12 with SSO - Part 4
+# Integration Faces - https://integrationfaces.com
+# Benjamin Mukoro & AI Assistant
+# =============================================================================
+
+import argparse
+import json
+import socket
+import sys
+import time
+
+AGENT_STATE_FILE = '/u01/app/eppm/scripts/.wlst-agent'
+EXIT_UNAVAILABLE = 3
+
+
+class AgentUnavailable(Exception):
+    pass
+
+
+def load_agent_state():
+    try:
+        with open(AGENT_STATE_FILE) as state_file:
+            return json.load(state_file)
+    except (OSError, ValueError) as e:
+        raise AgentUnavailable('agent state file not readable: %s' % e)
+
+
+def call(op, args=None, timeout=None):
+    """Send one request to the agent and return its decoded response"""
+    state = load_agent_state()
+    request = {'token': state['token'], 'op': op, 'args': args or {}}
+
+    try:
+        sock = socket.create_connection((state['host'], state['port']), timeout=5)
+    except OSError as e:
+        raise AgentUnavailable('cannot connect to agent: %s' % e)
+
+    try:
+        # Long operations (start/stop) hold the connection until they finish
+        sock.settimeout(timeout)
+        sock.sendall((json.dumps(request) + '\n').encode('utf-8'))
+        data = b''
+        while not data.endswith(b'\n'):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    finally:
+        sock.close()
+
+    if not data:
+        raise AgentUnavailable('agent closed the connection without a response')
+    response = json.loads(data.decode('utf-8'))
+    if response.get('error') == 'invalid token':
+        # The agent restarted with a new token since we read the state file
+        raise AgentUnavailable('agent rejected token')
+    return response
+
+
+def wait_for_agent(deadline):
+    """Ping until the agent answers or the deadline (seconds) passes"""
+    end = time.time() + deadline
+    while True:
+        try:
+            return call('ping', timeout=10)
+        except AgentUnavailable:
+            if time.time() >= end:
+                raise
+            time.sleep(1)
+
+
+def print_servers(result):
+    for row in result.get('servers', []):
+        if 'status' in row:
+            seconds = row.get('seconds')
+            timing = '' if seconds is None else '%7.1fs' % seconds
+            print('  %-20s %-8s %s' % (row['server'], row['status'], timing))
+        else:
+            print('  %-20s %s' % (row['server'], row['state']))
+    for app in result.get('applications', []):
+        print('  %-30s %s' % (app['application'], ', '.join(app['targets'])))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Send an operation to the WLST agent')
+    parser.add_argument('--json', action='store_true', help='print the raw JSON response')
+    parser.add_argument('--wait', type=int, default=0, metavar='SECONDS',
+                        help='wait up to SECONDS for the agent to become available')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('ping')
+
+    state = commands.add_parser('state')
+    state.add_argument('--host')
+    state.add_argument('--applications', action='store_true')
+    state.add_argument('servers', nargs='*')
+
+    start = commands.add_parser('start')
+    start.add_argument('--host')
+    start.add_argument('--timeout', type=int)
+    start.add_argument('servers', nargs='*')
+
+    stop = commands.add_parser('stop')
+    stop.add_argument('--host')
+    stop.add_argument('--force', action='store_true')
+    stop.add_argument('--drain-timeout', type=int)
+    stop.add_argument('servers', nargs='*')
+
+    deploy = commands.add_parser('deploy')
+    deploy.add_argument('app')
+    deploy.add_argument('path')
+    deploy.add_argument('targets')
+    deploy.add_argument('--stage-mode', help='default: the configured staging mode')
+
+    undeploy = commands.add_parser('undeploy')
+    undeploy.add_argument('app')
+
+    set_arguments = commands.add_parser('set-arguments')
+    set_arguments.add_argument('server')
+    set_arguments.add_argument('arguments')
+
+    options = parser.parse_args()
+    command = options.command
+
+    args = {}
+    if command in ('state', 'start', 'stop'):
+        args['servers'] = options.servers
+        if options.host:
+            args['host'] = options.host
+    if command == 'state' and options.applications:
+        args['applications'] = True
+    if command == 'start' and options.timeout:
+        args['timeout'] = options.timeout
+    if command == 'stop':
+        args['force'] = options.force
+        if options.drain_timeout:
+            args['drain_timeout'] = options.drain_timeout
+    if command == 'deploy':
+        args.update({'app': options.app, 'path': options.path, 'targets': options.targets})
+        if options.stage_mode:
+            args['stage_mode'] = options.stage_mode
+    if command == 'undeploy':
+        args['app'] = options.app
+    if command == 'set-arguments':
+        args['servers'] = {options.server: options.arguments}
+
+    try:
+        if options.wait:
+            wait_for_agent(options.wait)
+        response = call(command, args)
+    except AgentUnavailable as e:
+        print('WLST agent not available: %s' % e, file=sys.stderr)
+        return EXIT_UNAVAILABLE
+
+    if options.json:
+        print(json.dumps(response, indent=2, sort_keys=True))
+    else:
+        result = response.get('result') or {}
+        if command == 'ping':
+            print('Agent connected to %s, up %ds, %d requests served'
+                  % (result['admin_url'], result['uptime'], result['requests']))
+        print_servers(result)
+        if 'changed' in result:
+            print('  Changed: %s' % (', '.join(result['changed']) or 'none'))
+        if not response['ok']:
+            print('ERROR: %s' % response['error'])
+        print('(%d ms)' % response.get('elapsed_ms', 0))
+
+    if not response['ok']:
+        return 1
+    if command == 'state':
+        states = [row['state'] for row in response['result']['servers']]
+        return 0 if all(state == 'RUNNING' for state in states) else 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,51 @@
+#!/bin/bash
+# =============================================================================
+# wlst-run.sh
+# Start or stop this host's managed servers through the WLST agent
+#
+# Used by weblogic-managedservers.service. When the WLST agent is running
+# the operation is sent to it with wlst-client.py (no JVM startup, no t3
+# connect). When the agent is not available (exit code 3) the original
+# WLST script is run in its own JVM instead, so the unit never depends on
+# the agent being up.
+#
+# Usage:
+#   ./wlst-run.sh start [script options]
+#   ./wlst-run.sh stop [script options]
+#
+# Script options (e.g. --serial, --force) are passed to the WLST script on
+# fallback; the agent always starts in parallel and stops gracefully.
+#
+# Zero to Enterprise: P6 EPPM 25.12 with SSO - Part 4
+# Integration Faces - https://integrationfaces.com
+# Benjamin Mukoro & AI Assistant
+# =============================================================================
+
+SCRIPTS_DIR="/u01/app/eppm/scripts"
+WLST="/u01/app/weblogic/oracle_common/common/bin/wlst.sh"
+HOSTNAME="$(hostname -s)"
+
+case "$1" in
+    start)
+        client_args=(start --host "${HOSTNAME}")
+        script="start-managed-servers.py"
+        ;;
+    stop)
+        client_args=(stop --host "${HOSTNAME}")
+        script="stop-managed-servers.py"
+        ;;
+    *)
+        echo "Usage: $0 start|stop [script options]"
+        exit 2
+        ;;
+esac
+shift
+
+python3 "${SCRIPTS_DIR}/wlst-client.py" "${client_args[@]}"
+rc=$?
+if [[ ${rc} -ne 3 ]]; then
+    exit ${rc}
+fi
+
+echo "Falling back to ${script} in a new WLST JVM"
+exec "${WLST}" "${SCRIPTS_DIR}/${script}" "$@"
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+# =============================================================================
+# benchmark_endpoints.py
+# Load and latency benchmark for the P6 EPPM application endpoints
+#
+# Drives an open-loop request rate (requests are scheduled at fixed times
+# whether or not earlier ones have finished, so queueing shows up as
+# latency) or, with --rate 0, a closed loop as fast as --concurrency allows.
+# Targets the same /p6, /p6tm, /p6ws/services and /p6procloudconnect URLs
+# as check_endpoints.py and verify-deployment.sh.
+#
+# Reports throughput and p50/p95/p99/max latency per endpoint plus a latency
+# histogram. Each run can be saved as a JSON baseline and compared with an
+# earlier one, e.g. before and after a SERVER_ARGUMENTS change:
+#
+#   ./benchmark_endpoints.py --rate 40 --duration 60 --save before.json
+#   (change configure_server_args.py, restart servers)
+#   ./benchmark_endpoints.py --rate 40 --duration 60 --save after.json --compare before.json
+#
+# --stub runs against a bundled local HTTP server instead, so the harness
+# can be tried out offline:
+#   ./benchmark_endpoints.py --stub --stub-latency 15 --rate 200 --duration 10
+#
+# Exit code: 0, or 1 when --compare finds a regression beyond --threshold.
+#
+# Zero to Enterprise: P6 EPPM 25.12 with SSO - Part 5
+# Integration Faces - https://integrationfaces.com
+# =============================================================================
+
+import argparse
+import http.client
+import http.server
+import itertools
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from check_endpoints import APPLICATIONS, MANAGED_HOSTS, PASS_STATUS, Origin
+from percentiles import percentile
+
+# Defaults
+RATE = 20.0              # requests per second across all endpoints (0 = closed loop)
+CONCURRENCY = 16         # worker threads, i.e. maximum requests in flight
+DURATION = 30.0          # seconds measured
+WARMUP = 5.0             # seconds run before measuring (results discarded)
+REQUEST_TIMEOUT = 10.0   # seconds per request
+DRAIN_TIMEOUT = 30.0     # seconds to wait for queued requests after the run
+THRESHOLD = 10.0         # percent change that counts as a regression
+
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+HISTOGRAM_BOUNDS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
+
+
+def app_key(path):
+    """Short application name used by --apps: /p6ws/services -> p6ws"""
+    return path.strip('/').split('/')[0]
+
+
+def build_targets(hosts, apps):
+    """Endpoints to drive, one per application per host"""
+    targets = []
+    for group, label, port, path in APPLICATIONS:
+        if apps and app_key(path) not in apps:
+            continue
+        for host in hosts:
+            targets.append({'name': '%s - %s' % (label, host),
+                            'url': 'http://%s:%d%s' % (host, port, path)})
+    return targets
+
+
+# -----------------------------------------------------------------------------
+# Local stub server
+# -----------------------------------------------------------------------------
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    """Answers every application path like a logged-out P6 (302 to login)"""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True   # headers and body are written separately
+    latency_ms = 0.0
+
+    def do_GET(self):
+        if self.latency_ms:
+            # Exponential service time around the configured mean
+            time.sleep(random.expovariate(1.0 / self.latency_ms) / 1000.0)
+        body = b'stub'
+        if self.path.rstrip('/') in [path for group, label, port, path in APPLICATIONS]:
+            self.send_response(302)
+            self.send_header('Location', self.path + '/login')
+        else:
+            self.send_response(404)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub(latency_ms):
+    """Start the stub on a free loopback port; returns (server, port)"""
+    handler = type('ConfiguredStubHandler', (StubHandler,), {'latency_ms': latency_ms})
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, server.server_address[1]
+
+
+def stub_targets(port, apps):
+    targets = []
+    for group, label, app_port, path in APPLICATIONS:
+        if apps and app_key(path) not in apps:
+            continue
+        targets.append({'name': '%s - stub' % label,
+                        'url': 'http://127.0.0.1:%d%s' % (port, path)})
+    return targets
+
+
+# -----------------------------------------------------------------------------
+# Load generation
+# -----------------------------------------------------------------------------
+
+class Recorder(object):
+    """Thread-safe collection of latencies and errors per endpoint"""
+
+    def __init__(self, targets):
+        self.lock = threading.Lock()
+        self.latencies = dict((t['name'], []) for t in targets)
+        self.errors = dict((t['name'], {}) for t in targets)
+        self.completed = dict((t['name'], 0) for t in targets)
+
+    def success(self, name, latency_ms):
+        with self.lock:
+            self.latencies[name].append(latency_ms)
+            self.completed[name] += 1
+
+    def failure(self, name, reason):
+        with self.lock:
+            self.errors[name][reason] = self.errors[name].get(reason, 0) + 1
+
+
+def send(origins, target, timeout):
+    """Issue one request on the worker's keep-alive connection; returns error or None"""
+    parts = urlsplit(target['url'])
+    key = (parts.hostname, parts.port)
+    if key not in origins:
+        origins[key] = Origin(parts.hostname, parts.port or 80)
+    origin = origins[key]
+    try:
+        status = origin.request(parts.path or '/', timeout)
+    except (OSError, http.client.HTTPException) as e:
+        origin.close()
+        if isinstance(e, ConnectionRefusedError):
+            return 'connection refused'
+        if 'timed out' in str(e):
+            return 'timeout'
+        return e.__class__.__name__
+    if status not in PASS_STATUS:
+        return 'HTTP %d' % status
+    return None
+
+
+def run_load(targets, rate, concurrency, duration, warmup, timeout):
+    """Drive the load and return (Recorder, measured seconds, scheduled, late)
+
+    Open loop: a dispatcher schedules request i at start + i / rate and
+    workers pick requests up from a queue. Latency is measured from the
+    scheduled time, so time spent waiting for a free worker counts.
+    Closed loop (rate 0): each worker sends its next request as soon as the
+    previous one completes.
+    """
+    recorder = Recorder(targets)
+    jobs = queue.Queue()
+    next_target = itertools.cycle(targets)
+    target_lock = threading.Lock()
+    start = time.monotonic() + 0.2
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+    stats = {'scheduled': 0, 'late': 0}
+
+    def record(target, scheduled, error):
+        if scheduled < measure_from:
+            return
+        if error:
+            recorder.failure(target['name'], error)
+        else:
+            recorder.success(target['name'], (time.monotonic() - scheduled) * 1000.0)
+
+    def open_worker():
+        origins = {}
+        while True:
+            job = jobs.get()
+            if job is None:
+                break
+            target, scheduled = job
+            if time.monotonic() - stop_at > DRAIN_TIMEOUT:
+                record(target, scheduled, 'not sent (drain timeout)')
+                continue
+            record(target, scheduled, send(origins, target, timeout))
+        for origin in origins.values():
+            origin.close()
+
+    def closed_worker():
+        origins = {}
+        while time.monotonic() < start:
+            time.sleep(0.01)
+        while time.monotonic() < stop_at:
+            with target_lock:
+                target = next(next_target)
+            scheduled = time.monotonic()
+            record(target, scheduled, send(origins, target, timeout))
+        for origin in origins.values():
+            origin.close()
+
+    workers = [threading.Thread(target=open_worker if rate else closed_worker, daemon=True)
+               for _ in range(concurrency)]
+    for worker in workers:
+        worker.start()
+
+    if rate:
+        index = 0
+        while True:
+            scheduled = start + index / rate
+            if scheduled >= stop_at:
+                break
+            delay = scheduled - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            elif scheduled >= measure_from and -delay > 0.05:
+                stats['late'] += 1
+            jobs.put((next(next_target), scheduled))
+            if scheduled >= measure_from:
+                stats['scheduled'] += 1
+            index += 1
+        for _ in workers:
+            jobs.put(None)
+
+    for worker in workers:
+        worker.join()
+    return recorder, duration, stats['scheduled'], stats['late']
+
+
+# -----------------------------------------------------------------------------
+# Statistics, baselines and comparison
+# -----------------------------------------------------------------------------
+
+def histogram(values):
+    counts = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+    for value in values:
+        for index, bound in enumerate(HISTOGRAM_BOUNDS):
+            if value <= bound:
+                counts[index] += 1
+                break
+        else:
+            counts[-1] += 1
+    buckets = [{'le_ms': bound, 'count': count} for bound, count in zip(HISTOGRAM_BOUNDS, counts)]
+    buckets.append({'le_ms': None, 'count': counts[-1]})
+    return buckets
+
+
+def summarize(latencies, errors, seconds):
+    values = sorted(latencies)
+    error_count = sum(errors.values())
+    total = len(values) + error_count
+
+    def rounded(value):
+        return None if value is None else round(value, 2)
+
+    return {
+        'requests': total,
+        'ok': len(values),
+        'errors': error_count,
+        'error_rate': round(error_count / float(total), 4) if total else 0.0,
+        'error_types': errors,
+        'throughput_rps': round(len(values) / seconds, 2) if seconds else 0.0,
+        'mean_ms': rounded(sum(values) / len(values)) if values else None,
+        'p50_ms': rounded(percentile(values, 0.50)),
+        'p95_ms': rounded(percentile(values, 0.95)),
+        'p99_ms': rounded(percentile(values, 0.99)),
+        'max_ms': rounded(values[-1]) if values else None,
+        'histogram': histogram(values)
+    }
+
+
+def build_report(targets, recorder, seconds, settings, scheduled, late, label):
+    endpoints = {}
+    all_latencies = []
+    all_errors = {}
+    for target in targets:
+        name = target['name']
+        endpoints[name] = summarize(recorder.latencies[name], recorder.errors[name], seconds)
+        endpoints[name]['url'] = target['url']
+        all_latencies.extend(recorder.latencies[name])
+        for reason, count in recorder.errors[name].items():
+            all_errors[reason] = all_errors.get(reason, 0) + count
+
+    total = summarize(all_latencies, all_errors, seconds)
+    total['scheduled'] = scheduled
+    total['dispatched_late'] = late
+    return {'version': 1, 'label': label,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'settings': settings, 'total': total, 'endpoints': endpoints}
+
+
+def format_ms(value):
+    return '-' if value is None else '%.1f' % value
+
+
+def print_report(report):
+    settings = report['settings']
+    print('')
+    print('=' * 92)
+    print('P6 EPPM Endpoint Benchmark' + (' - ' + report['label'] if report['label'] else ''))
+    print('=' * 92)
+    if settings['rate']:
+        mode = 'open loop, %.1f req/s' % settings['rate']
+    else:
+        mode = 'closed loop'
+    print('Mode: %s, concurrency %d, %.0fs measured after %.0fs warmup%s'
+          % (mode, settings['concurrency'], settings['duration'], settings['warmup'],
+             ', stub server' if settings['stub'] else ''))
+    print('')
+    print('  %-28s %8s %7s %9s %8s %8s %8s %8s' %
+          ('Endpoint', 'Requests', 'Errors', 'Req/s', 'p50 ms', 'p95 ms', 'p99 ms', 'max ms'))
+    print('  ' + '-' * 90)
+    rows = sorted(report['endpoints'].items()) + [('TOTAL', report['total'])]
+    for name, stats in rows:
+        print('  %-28s %8d %7d %9.1f %8s %8s %8s %8s' %
+              (name[:28], stats['requests'], stats['errors'], stats['throughput_rps'],
+               format_ms(stats['p50_ms']), format_ms(stats['p95_ms']),
+               format_ms(stats['p99_ms']), format_ms(stats['max_ms'])))
+
+    total = report['total']
+    if total['error_types']:
+        print('')
+        print('Errors: ' + ', '.join('%s x%d' % item for item in sorted(total['error_types'].items())))
+    if total['dispatched_late']:
+        print('')
+        print('WARNING: %d requests were dispatched more than 50 ms late; the load '
+              'generator could not sustain the requested rate' % total['dispatched_late'])
+
+    print('')
+    print('Latency histogram (all endpoints):')
+    peak = max([bucket['count'] for bucket in total['histogram']] + [1])
+    lower = 0
+    for bucket in total['histogram']:
+        if bucket['le_ms'] is None:
+            label = '> %d ms' % lower
+        else:
+            label = '%d-%d ms' % (lower, bucket['le_ms'])
+            lower = bucket['le_ms']
+        if bucket['count']:
+            print('  %14s %7d %s' % (label, bucket['count'], '#' * max(1, int(50 * bucket['count'] / peak))))
+
+
+def change(new, old):
+    """Percentage change from old to new, or None if not comparable"""
+    if new is None or old in (None, 0):
+        return None
+    return (new - old) * 100.0 / old
+
+
+def compare(report, baseline, threshold):
+    """Print deltas against a baseline; returns the list of regressions"""
+    print('')
+    print('Comparison with baseline: %s (%s)' % (baseline.get('label') or '-', baseline.get('timestamp')))
+    print('  %-28s %12s %12s %12s %12s' % ('Endpoint', 'Req/s', 'p50', 'p95', 'p99'))
+    print('  ' + '-' * 80)
+
+    regressions = []
+    rows = [(name, stats, baseline['endpoints'].get(name)) for name, stats in sorted(report['endpoints'].items())]
+    rows.append(('TOTAL', report['total'], baseline['total']))
+    for name, stats, old in rows:
+        if old is None:
+            print('  %-28s (not in baseline)' % name[:28])
+            continue
+        cells = []
+        for key, higher_is_worse in (('throughput_rps', False), ('p50_ms', True),
+                                     ('p95_ms', True), ('p99_ms', True)):
+            delta = change(stats[key], old[key])
+            if delta is None:
+                cells.append('-')
+                continue
+            worse = delta > threshold if higher_is_worse else delta < -threshold
+            cells.append('%+.1f%%%s' % (delta, ' !' if worse else ''))
+            if worse:
+                regressions.append('%s %s %+.1f%%' % (name, key, delta))
+        if stats['error_rate'] > old['error_rate'] + threshold / 100.0:
+            regressions.append('%s error rate %.1f%% -> %.1f%%' %
+                               (name, old['error_rate'] * 100, stats['error_rate'] * 100))
+        print('  %-28s %12s %12s %12s %12s' % tuple([name[:28]] + cells))
+
+    print('')
+    if regressions:
+        print('REGRESSION (threshold %.0f%%):' % threshold)
+        for regression in regressions:
+            print('  ' + regression)
+    else:
+        print('No regression beyond %.0f%%' % threshold)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark P6 EPPM endpoints')
+    parser.add_argument('--rate', type=float, default=RATE,
+                        help='open-loop requests per second, 0 for closed loop (default %(default)s)')
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY,
+                        help='worker threads / maximum in flight (default %(default)s)')
+    parser.add_argument('--duration', type=float, default=DURATION,
+                        help='seconds to measure (default %(default)s)')
+    parser.add_argument('--warmup', type=float, default=WARMUP,
+                        help='seconds to run before measuring (default %(default)s)')
+    parser.add_argument('--timeout', type=float, default=REQUEST_TIMEOUT,
+                        help='seconds per request (default %(default)s)')
+    parser.add_argument('--hosts', default=','.join(MANAGED_HOSTS),
+                        help='comma-separated managed hosts (default %(default)s)')
+    parser.add_argument('--apps', default='',
+                        help='comma-separated subset of p6,p6tm,p6ws,p6procloudconnect')
+    parser.add_argument('--label', default='', help='name stored with the results')
+    parser.add_argument('--save', metavar='FILE', help='write the results as a JSON baseline')
+    parser.add_argument('--compare', metavar='FILE', help='compare with an earlier baseline')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='percent change reported as a regression (default %(default)s)')
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    parser.add_argument('--stub', action='store_true', help='benchmark the bundled local stub server')
+    parser.add_argument('--stub-latency', type=float, default=10.0,
+                        help='mean stub response time in ms (default %(default)s)')
+    options = parser.parse_args()
+
+    apps = [app for app in options.apps.split(',') if app]
+    stub = None
+    if options.stub:
+        stub, port = start_stub(options.stub_latency)
+        targets = stub_targets(port, apps)
+    else:
+        targets = build_targets([host for host in options.hosts.split(',') if host], apps)
+    if not targets:
+        print('ERROR: no endpoints selected')
+        return 2
+
+    settings = {'rate': options.rate, 'concurrency': options.concurrency,
+                'duration': options.duration, 'warmup': options.warmup,
+                'timeout': options.timeout, 'stub': options.stub,
+                'stub_latency_ms': options.stub_latency if options.stub else None,
+                'targets': [target['url'] for target in targets]}
+
+    if not options.json:
+        print('Running for %.0fs (%.0fs warmup) against %d endpoints...'
+              % (options.warmup + options.duration, options.warmup, len(targets)))
+    recorder, seconds, scheduled, late = run_load(targets, options.rate, options.concurrency,
+                                                  options.duration, options.warmup, options.timeout)
+    if stub is not None:
+        stub.shutdown()
+
+    report = build_report(targets, recorder, seconds, settings, scheduled, late, options.label)
+
+    if options.json:
+        print(json.dumps(report, indent=2, sort_keys=True))
+    else:
+        print_report(report)
+
+    if options.save:
+        with open(options.save, 'w') as baseline_file:
+            json.dump(report, baseline_file, indent=2, sort_keys=True)
+        if not options.json:
+            print('')
+            print('Saved baseline: ' + options.save)
+
+    if options.compare:
+        with open(options.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        if compare(report, baseline, options.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
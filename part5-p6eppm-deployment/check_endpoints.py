@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# =============================================================================
+# check_endpoints.py
+# Concurrent health check of P6 EPPM application endpoints
+#
+# Probes every endpoint on prmapp01 and prmapp02 at the same time. Each
+# host:port gets one worker with one keep-alive connection, reused for its
+# retries. An overall deadline bounds the run, so a host that is down costs
+# one deadline rather than a timeout per endpoint. Latency is recorded for
+# every endpoint.
+#
+# Used by verify-deployment.sh; can also be run directly as a post-deploy
+# gate or from cron:
+#   ./check_endpoints.py                     # PASS/FAIL report
+#   ./check_endpoints.py --json              # machine-readable results
+#   ./check_endpoints.py --deadline 10 --retries 1
+#   ./check_endpoints.py --hosts prmapp01    # check one host only
+#
+# Exit code: 0 if every endpoint passed, 1 otherwise.
+#
+# Zero to Enterprise: P6 EPPM 25.12 with SSO - Part 5
+# Integration Faces - https://integrationfaces.com
+# =============================================================================
+
+import argparse
+import http.client
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+# Configuration (same hosts and ports as verify-deployment.sh)
+ADMIN_HOST = 'prmapp01'
+MANAGED_HOSTS = ['prmapp01', 'prmapp02']
+ADMIN_PORT = 7001
+
+# Application endpoints: (group, label, port, path) - checked on every managed host
+APPLICATIONS = [
+    ('P6 Web Application', 'P6 Web', 7010, '/p6'),
+    ('P6 Team Member Application', 'Team Member', 7030, '/p6tm'),
+    ('P6 Web Services Application', 'Web Services', 7020, '/p6ws/services'),
+    ('P6 Professional Cloud Connect Application', 'Cloud Connect', 7040, '/p6procloudconnect')
+]
+
+# Status codes that count as healthy (login pages redirect)
+PASS_STATUS = (200, 301, 302, 307)
+
+DEADLINE = 20.0          # seconds for the whole run
+CONNECT_TIMEOUT = 5.0    # seconds per connection attempt
+REQUEST_TIMEOUT = 10.0   # seconds per request
+RETRIES = 2              # extra attempts per endpoint after a failure
+RETRY_DELAY = 0.5        # seconds between attempts
+
+GREEN = '\033[0;32m'
+RED = '\033[0;31m'
+YELLOW = '\033[1;33m'
+NC = '\033[0m'
+
+
+def build_endpoints(managed_hosts=MANAGED_HOSTS, admin_host=ADMIN_HOST):
+    """Endpoint list in report order: Admin Console, then each application per host"""
+    endpoints = []
+    if admin_host:
+        endpoints.append({'group': 'WebLogic Admin Console',
+                          'name': 'Admin Console (%s:%d)' % (admin_host, ADMIN_PORT),
+                          'url': 'http://%s:%d/console' % (admin_host, ADMIN_PORT)})
+    for group, label, port, path in APPLICATIONS:
+        for host in managed_hosts:
+            endpoints.append({'group': group,
+                              'name': '%s - %s:%d' % (label, host, port),
+                              'url': 'http://%s:%d%s' % (host, port, path)})
+    return endpoints
+
+
+class Origin(object):
+    """One keep-alive connection to a host:port, reopened after errors"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.connection = None
+
+    def request(self, path, timeout):
+        if self.connection is None:
+            self.connection = http.client.HTTPConnection(self.host, self.port,
+                                                         timeout=min(CONNECT_TIMEOUT, timeout))
+            self.connection.connect()
+        self.connection.sock.settimeout(timeout)
+        self.connection.request('GET', path, headers={'Connection': 'keep-alive'})
+        response = self.connection.getresponse()
+        response.read()
+        if response.will_close:
+            self.close()
+        return response.status
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+def check_origin(endpoints, deadline, retries):
+    """Check every endpoint of one origin in turn over a shared connection"""
+    parts = urlsplit(endpoints[0]['url'])
+    origin = Origin(parts.hostname, parts.port or 80)
+    results = []
+    try:
+        for endpoint in endpoints:
+            results.append(check_endpoint(origin, endpoint, deadline, retries))
+    finally:
+        origin.close()
+    return results
+
+
+def check_endpoint(origin, endpoint, deadline, retries):
+    parts = urlsplit(endpoint['url'])
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+
+    result = dict(endpoint, passed=False, http_code=None, latency_ms=None,
+                  attempts=0, error=None)
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            result['error'] = result['error'] or 'deadline reached'
+            return result
+
+        result['attempts'] += 1
+        started = time.monotonic()
+        try:
+            status = origin.request(path, min(REQUEST_TIMEOUT, remaining))
+            result['latency_ms'] = round((time.monotonic() - started) * 1000, 1)
+            result['http_code'] = status
+            result['error'] = None
+            if status in PASS_STATUS:
+                result['passed'] = True
+                return result
+        except (OSError, http.client.HTTPException) as e:
+            origin.close()
+            result['error'] = describe_error(e)
+
+        if result['attempts'] > retries:
+            return result
+        time.sleep(min(RETRY_DELAY, max(0, deadline - time.monotonic())))
+
+
+def describe_error(error):
+    if isinstance(error, ConnectionRefusedError):
+        return 'Connection refused'
+    if isinstance(error, TimeoutError) or 'timed out' in str(error):
+        return 'Timeout'
+    return str(error) or error.__class__.__name__
+
+
+def run_checks(endpoints, deadline_seconds=DEADLINE, retries=RETRIES):
+    """Probe all endpoints concurrently; results are returned in input order"""
+    deadline = time.monotonic() + deadline_seconds
+    by_origin = {}
+    for endpoint in endpoints:
+        parts = urlsplit(endpoint['url'])
+        by_origin.setdefault((parts.hostname, parts.port), []).append(endpoint)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(by_origin) or 1) as pool:
+        futures = [pool.submit(check_origin, group, deadline, retries) for group in by_origin.values()]
+        for future in futures:
+            for result in future.result():
+                results[result['url']] = result
+    return [results[endpoint['url']] for endpoint in endpoints]
+
+
+def print_report(results, elapsed, color):
+    green, red, yellow, nc = (GREEN, RED, YELLOW, NC) if color else ('', '', '', '')
+
+    print('')
+    print('============================================================')
+    print('P6 EPPM 25.12 Deployment Verification')
+    print('Integration Faces - Zero to Enterprise Series')
+    print('============================================================')
+    print('')
+    print('Timestamp: ' + time.strftime('%a %b %d %H:%M:%S %Z %Y'))
+    print('')
+
+    group = None
+    for result in results:
+        if result['group'] != group:
+            if group is not None:
+                print('')
+            group = result['group']
+            print(group + ':')
+            print('------------------------------------------------------------')
+        if result['passed']:
+            status = '%sPASS%s (HTTP %d, %.0f ms)' % (green, nc, result['http_code'], result['latency_ms'])
+        elif result['http_code'] is not None:
+            status = '%sFAIL%s (HTTP %d, %.0f ms)' % (red, nc, result['http_code'], result['latency_ms'])
+        else:
+            status = '%sFAIL%s (%s)' % (red, nc, result['error'])
+        if result['attempts'] > 1:
+            status += ' after %d attempts' % result['attempts']
+        print('  %-40s %s' % (result['name'], status))
+    print('')
+
+    passed = len([r for r in results if r['passed']])
+    failed = len(results) - passed
+    print('============================================================')
+    print('VERIFICATION SUMMARY')
+    print('============================================================')
+    print('')
+    print('  Total Checks:  %d' % len(results))
+    print('  Passed:        %s%d%s' % (green, passed, nc))
+    print('  Failed:        %s%d%s' % (red, failed, nc))
+    print('  Duration:      %.1fs' % elapsed)
+    print('')
+
+    if failed == 0:
+        print('%sAll P6 EPPM applications are responding correctly!%s' % (green, nc))
+        print('')
+        print('Access P6 Web at: http://%s:7010/p6' % MANAGED_HOSTS[0])
+    else:
+        print('%sSome applications are not responding. Check WebLogic server status.%s' % (yellow, nc))
+        print('')
+        print('Troubleshooting steps:')
+        print('  1. Verify managed servers are running in WebLogic Console')
+        print('  2. Check server logs: /u01/app/eppm/scripts/log_index.py query --last 30m --severity Error')
+        print('  3. Verify bootstrap configuration in each application directory')
+        print('  4. Confirm database connectivity from application hosts')
+    print('')
+    print('============================================================')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check P6 EPPM endpoints concurrently')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    parser.add_argument('--deadline', type=float, default=DEADLINE,
+                        help='overall deadline in seconds (default %(default)s)')
+    parser.add_argument('--retries', type=int, default=RETRIES,
+                        help='extra attempts per failing endpoint (default %(default)s)')
+    parser.add_argument('--hosts', default=','.join(MANAGED_HOSTS),
+                        help='comma-separated managed hosts (default %(default)s)')
+    parser.add_argument('--admin-host', default=ADMIN_HOST,
+                        help='Admin Server host, empty to skip the console check')
+    options = parser.parse_args()
+
+    endpoints = build_endpoints([h for h in options.hosts.split(',') if h], options.admin_host)
+    started = time.monotonic()
+    results = run_checks(endpoints, options.deadline, options.retries)
+    elapsed = time.monotonic() - started
+    failed = len([r for r in results if not r['passed']])
+
+    if options.json:
+        print(json.dumps({'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                          'duration_ms': round(elapsed * 1000, 1),
+                          'total': len(results), 'passed': len(results) - failed,
+                          'failed': failed, 'results': results}, indent=2))
+    else:
+        print_report(results, elapsed, sys.stdout.isatty())
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
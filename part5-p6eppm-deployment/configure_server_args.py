@@ -7,6 +7,7 @@
 # Integration Faces - https://integrationfaces.com
 # =============================================================================
 
+import os
 import sys
 
 # =============================================================================
@@ -25,9 +26,52 @@ KEY_FILE = '/u01/app/eppm/scripts/wlkey'
 
 # P6 EPPM Installation Base
 EPPM_HOME = '/u01/app/eppm'
+DOMAIN_HOME = '/u01/app/weblogic/user_projects/domains/eppm_domain'
+
+# Apply mode
+#   'diff'       - read all current Arguments in one pass, then apply only the
+#                  servers that differ in a single edit session and activation
+#   'per-server' - separate edit/activate cycle for every server
+# Override on the command line with --diff or --per-server.
+# --dry-run reports which servers would change without editing anything; in
+# either mode it only reads the current Arguments, in one pass.
+APPLY_MODE = 'diff'
+DRY_RUN = False
+
+# JVM sizing
+#   True  - replace the heap, GC, stack and metaspace options below with the
+#           values jvm_profiles.py computes for each host's memory and cores
+#   False - apply SERVER_ARGUMENTS exactly as written (--static)
+USE_JVM_PROFILES = True
+
+# GC logging (JDK 11 unified logging) to <server>/logs/gc.log, rotated after
+# GC_LOG_FILE_SIZE into GC_LOG_FILES files. Read by gc_log_analyzer.py.
+#   'keep'   - leave each server's current GC logging options as they are, so
+#              a routine run does not change (and restart) every server
+#   'add'    - add GC logging to every server (--gc-log)
+#   'remove' - remove GC logging from every server (--no-gc-log)
+GC_LOGGING = 'keep'
+GC_LOG_FILES = 10
+GC_LOG_FILE_SIZE = '20m'
+
+for arg in sys.argv[1:]:
+    if arg == '--diff':
+        APPLY_MODE = 'diff'
+    elif arg == '--per-server':
+        APPLY_MODE = 'per-server'
+    elif arg == '--dry-run':
+        DRY_RUN = True
+    elif arg == '--static':
+        USE_JVM_PROFILES = False
+    elif arg == '--gc-log':
+        GC_LOGGING = 'add'
+    elif arg == '--no-gc-log':
+        GC_LOGGING = 'remove'
 
 # Server Arguments Configuration
 # Format: (server_name, arguments)
+# With USE_JVM_PROFILES the -Xms/-Xmx/-Xmn/-Xss and GC/metaspace options here
+# are replaced; the system properties are always kept.
 SERVER_ARGUMENTS = [
     # P6 Web Servers
     ('p6web_ms1', 
@@ -58,10 +102,81 @@ SERVER_ARGUMENTS = [
      '-Dprimavera.bootstrap.home=' + EPPM_HOME + '/p6procloudconnect'),
 ]
 
+# Phase timings are appended to the timing history by lifecycle_timing.py,
+# installed with the Part 4 scripts next to the credential files
+sys.path.append(os.path.dirname(CONFIG_FILE))
+try:
+    import lifecycle_timing
+    timing = lifecycle_timing.Recorder('configure-server-args', mode=APPLY_MODE, dry_run=DRY_RUN)
+except ImportError:
+    timing = None
+
 # =============================================================================
 # FUNCTIONS
 # =============================================================================
 
+def apply_jvm_profiles():
+    """Size the JVMs per host with jvm_profiles.py; False if a host is overcommitted"""
+    global SERVER_ARGUMENTS
+    
+    print('')
+    print('=' * 60)
+    print('Computing JVM profiles')
+    print('=' * 60)
+    
+    # jvm_profiles.py (and domain_topology.py) live next to this script
+    sys.path.append(os.path.dirname(os.path.abspath(sys.argv[0])))
+    sys.path.append(os.path.dirname(CONFIG_FILE))
+    try:
+        import jvm_profiles
+    except ImportError, e:
+        print('WARNING: jvm_profiles.py not found - using SERVER_ARGUMENTS as written')
+        return True
+    
+    try:
+        SERVER_ARGUMENTS, plans = jvm_profiles.apply_profiles(SERVER_ARGUMENTS)
+    except jvm_profiles.ProfileError, e:
+        print('ERROR: ' + str(e))
+        print('Adjust HOSTS/ROLES in jvm_profiles.py, or run with --static')
+        return False
+    
+    jvm_profiles.print_plans(plans)
+    return True
+
+
+def gc_log_option(server_name):
+    """-Xlog option writing a rotated GC log to the server's logs directory"""
+    log_file = DOMAIN_HOME + '/servers/' + server_name + '/logs/gc.log'
+    return ('-Xlog:gc*,safepoint:file=' + log_file + ':time,uptime,level,tags'
+            ':filecount=' + str(GC_LOG_FILES) + ',filesize=' + GC_LOG_FILE_SIZE)
+
+
+def is_gc_log_token(token):
+    return token.startswith('-Xlog:gc') or token.startswith('-Xloggc')
+
+
+def apply_gc_logging():
+    """Add (or replace) GC logging in every server's arguments, or remove it"""
+    global SERVER_ARGUMENTS
+    
+    result = []
+    for server_name, arguments in SERVER_ARGUMENTS:
+        kept = [token for token in arguments.split() if not is_gc_log_token(token)]
+        if GC_LOGGING == 'add':
+            kept.append(gc_log_option(server_name))
+        result.append((server_name, ' '.join(kept)))
+    SERVER_ARGUMENTS = result
+
+
+def keep_gc_logging(arguments, current_args):
+    """In 'keep' mode, carry the server's current GC logging options over"""
+    if GC_LOGGING != 'keep':
+        return arguments
+    kept = [token for token in arguments.split() if not is_gc_log_token(token)]
+    return ' '.join(kept + [token for token in normalize_arguments(current_args).split()
+                            if is_gc_log_token(token)])
+
+
 def connect_to_admin():
     """Connect to WebLogic Admin Server"""
     print('')
@@ -104,6 +219,7 @@ def configure_server_arguments(server_name, arguments):
             print('  Current arguments: ' + str(current_args)[:50] + '...')
         else:
             print('  Current arguments: (none)')
+        arguments = keep_gc_logging(arguments, current_args)
         
         # Start edit session
         edit()
@@ -115,7 +231,11 @@ def configure_server_arguments(server_name, arguments):
         
         # Save and activate
         save()
+        if timing:
+            timing.begin('activate', server_name)
         activate()
+        if timing:
+            timing.end('activate', server_name)
         
         print('  New arguments configured successfully')
         print('  Arguments: ' + arguments[:60] + '...')
@@ -124,6 +244,8 @@ def configure_server_arguments(server_name, arguments):
     except Exception, e:
         print('  ERROR: Failed to configure ' + server_name)
         print('  ' + str(e))
+        if timing:
+            timing.end('activate', server_name, 'failed')
         try:
             cancelEdit('y')
         except:
@@ -131,6 +253,121 @@ def configure_server_arguments(server_name, arguments):
         return False
 
 
+def normalize_arguments(arguments):
+    """Collapse whitespace so formatting-only differences are not changes"""
+    if not arguments:
+        return ''
+    return ' '.join(str(arguments).split())
+
+
+def read_current_arguments():
+    """Read ServerStart Arguments of every configured server in one pass"""
+    print('')
+    print('=' * 60)
+    print('Reading current server arguments')
+    print('=' * 60)
+    
+    if timing:
+        timing.begin('read_arguments')
+    current = {}
+    for server_name, arguments in SERVER_ARGUMENTS:
+        try:
+            cd('/Servers/' + server_name + '/ServerStart/' + server_name)
+            current[server_name] = get('Arguments')
+        except Exception, e:
+            # Unreadable servers are left out and reported as FAILED
+            print('  ERROR: Cannot read ' + server_name + ': ' + str(e))
+    if timing:
+        timing.end('read_arguments', servers=len(current))
+    return current
+
+
+def compute_changes(current):
+    """Return (changes, results) where changes lists servers needing an update"""
+    changes = []
+    results = []
+    
+    for server_name, arguments in SERVER_ARGUMENTS:
+        if server_name not in current:
+            results.append((server_name, 'FAILED'))
+            continue
+        
+        arguments = keep_gc_logging(arguments, current[server_name])
+        if normalize_arguments(current[server_name]) == normalize_arguments(arguments):
+            print('  ' + server_name.ljust(25) + 'unchanged')
+            results.append((server_name, 'UNCHANGED'))
+        else:
+            print('  ' + server_name.ljust(25) + 'CHANGED')
+            changes.append((server_name, arguments))
+    
+    return changes, results
+
+
+def apply_changes(changes):
+    """Apply all changed arguments in one edit session with a single activation"""
+    print('')
+    print('=' * 60)
+    print('Applying ' + str(len(changes)) + ' change(s) in one edit session')
+    print('=' * 60)
+    
+    try:
+        if timing:
+            timing.begin('edit_session')
+        edit()
+        startEdit()
+        
+        for server_name, arguments in changes:
+            cd('/Servers/' + server_name + '/ServerStart/' + server_name)
+            set('Arguments', arguments)
+            print('  Set arguments: ' + server_name)
+        
+        save()
+        if timing:
+            timing.begin('activate')
+        activate(block='true')
+        if timing:
+            timing.end('activate')
+            timing.end('edit_session', servers=len(changes))
+        print('  Activated')
+        return [(server_name, 'UPDATED') for server_name, arguments in changes]
+        
+    except Exception, e:
+        print('  ERROR: Failed to apply changes - nothing was activated')
+        print('  ' + str(e))
+        if timing:
+            timing.end('activate', status='failed')
+            timing.end('edit_session', status='failed', servers=len(changes))
+        try:
+            cancelEdit('y')
+        except:
+            pass
+        return [(server_name, 'FAILED') for server_name, arguments in changes]
+
+
+def configure_changed_servers():
+    """Diff mode: read everything, then apply only what changed"""
+    current = read_current_arguments()
+    changes, results = compute_changes(current)
+    
+    if not changes:
+        print('')
+        print('All server arguments already up to date - no edit session needed')
+        return results, []
+    
+    if DRY_RUN:
+        print('')
+        print('Dry run - not applying changes')
+        applied = [(server_name, 'PENDING') for server_name, arguments in changes]
+    else:
+        applied = apply_changes(changes)
+    
+    # Report in SERVER_ARGUMENTS order
+    statuses = dict(results + applied)
+    results = [(server_name, statuses[server_name]) for server_name, arguments in SERVER_ARGUMENTS]
+    restart = [server_name for server_name, status in results if status == 'UPDATED']
+    return results, restart
+
+
 def print_summary(results):
     """Print configuration summary"""
     print('')
@@ -141,10 +378,9 @@ def print_summary(results):
     success_count = 0
     fail_count = 0
     
-    for server_name, success in results:
-        status = 'SUCCESS' if success else 'FAILED'
+    for server_name, status in results:
         print('  ' + server_name.ljust(25) + status)
-        if success:
+        if status != 'FAILED':
             success_count += 1
         else:
             fail_count += 1
@@ -169,18 +405,52 @@ def main():
     print('Integration Faces - Zero to Enterprise Series')
     print('=' * 60)
     
+    # Size the JVMs before connecting, so an overcommitted host changes nothing
+    if USE_JVM_PROFILES and not apply_jvm_profiles():
+        print('Exiting - no arguments were changed.')
+        if timing:
+            timing.finish('failed')
+        sys.exit(1)
+    if GC_LOGGING != 'keep':
+        apply_gc_logging()
+    
     # Connect to Admin Server
+    if timing:
+        timing.begin('connect')
     if not connect_to_admin():
         print('Exiting due to connection failure.')
+        if timing:
+            timing.end('connect', status='failed')
+            timing.finish('failed')
         sys.exit(1)
+    if timing:
+        timing.end('connect')
+    
+    print('Apply mode: ' + APPLY_MODE + (' (dry run)' if DRY_RUN else ''))
+    if not USE_JVM_PROFILES:
+        print('JVM sizing: static SERVER_ARGUMENTS')
+    print('GC logging: ' + {'add': 'enabled (<server>/logs/gc.log)',
+                            'remove': 'removed'}.get(GC_LOGGING, 'unchanged'))
     
     # Track results
     results = []
+    restart = []
     
-    # Configure each server
-    for server_name, arguments in SERVER_ARGUMENTS:
-        success = configure_server_arguments(server_name, arguments)
-        results.append((server_name, success))
+    if APPLY_MODE == 'diff' or DRY_RUN:
+        results, restart = configure_changed_servers()
+    else:
+        # Configure each server in its own edit session
+        for server_name, arguments in SERVER_ARGUMENTS:
+            if timing:
+                timing.begin('configure', server_name)
+            success = configure_server_arguments(server_name, arguments)
+            if timing:
+                timing.end('configure', server_name, success and 'ok' or 'failed')
+            if success:
+                results.append((server_name, 'SUCCESS'))
+                restart.append(server_name)
+            else:
+                results.append((server_name, 'FAILED'))
     
     # Disconnect
     print('')
@@ -189,12 +459,32 @@ def main():
     
     # Print summary
     all_success = print_summary(results)
+    if timing:
+        timing.finish(all_success and 'ok' or 'failed', restart=restart)
     
-    if all_success:
+    if all_success and DRY_RUN:
+        pending = [server_name for server_name, status in results if status == 'PENDING']
+        print('')
+        print('Dry run complete - no arguments were changed.')
+        print('')
+        if pending:
+            print('Would change these servers (each would require a restart):')
+            for server_name in pending:
+                print('  ' + server_name)
+        else:
+            print('No servers would change; none would require a restart.')
+        print('')
+        sys.exit(0)
+    elif all_success:
         print('')
         print('All server arguments configured successfully!')
         print('')
-        print('IMPORTANT: Restart managed servers for changes to take effect.')
+        if restart:
+            print('IMPORTANT: Restart these servers for changes to take effect:')
+            for server_name in restart:
+                print('  ' + server_name)
+        else:
+            print('No servers need a restart.')
         print('')
         sys.exit(0)
     else:
@@ -3,6 +3,14 @@
 # configure_server_args.sh
 # Wrapper script to configure P6 EPPM server Java arguments using WLST
 #
+# Usage:
+#   ./configure_server_args.sh                # apply only changed servers
+#   ./configure_server_args.sh --dry-run      # report changes, edit nothing
+#   ./configure_server_args.sh --per-server   # one activation per server
+#   ./configure_server_args.sh --static       # skip jvm_profiles.py sizing
+#   ./configure_server_args.sh --gc-log       # add GC logging to every server
+#   ./configure_server_args.sh --no-gc-log    # remove GC logging
+#
 # Zero to Enterprise: P6 EPPM 25.12 with SSO - Part 5
 # Integration Faces - https://integrationfaces.com
 # =============================================================================
@@ -64,7 +72,7 @@ echo ""
 echo "Executing WLST configuration script..."
 echo ""
 
-"${ORACLE_HOME}/oracle_common/common/bin/wlst.sh" "${WLST_SCRIPT}"
+"${ORACLE_HOME}/oracle_common/common/bin/wlst.sh" "${WLST_SCRIPT}" "$@"
 RESULT=$?
 
 echo ""
@@ -73,7 +81,7 @@ if [ ${RESULT} -eq 0 ]; then
     echo -e "${GREEN}Server arguments configured successfully!${NC}"
     echo -e "${GREEN}============================================================${NC}"
     echo ""
-    echo -e "${YELLOW}IMPORTANT: Restart all managed servers for changes to take effect.${NC}"
+    echo -e "${YELLOW}IMPORTANT: Restart the servers listed above for changes to take effect.${NC}"
     echo ""
 else
     echo -e "${RED}============================================================${NC}"
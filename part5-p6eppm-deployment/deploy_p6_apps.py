@@ -9,6 +9,13 @@
 
 import sys
 import os
+import time
+import json
+import hashlib
+import shutil
+import zipfile
+import re
+import httplib
 
 # =============================================================================
 # CONFIGURATION - Modify these values for your environment
@@ -30,6 +37,82 @@ KEY_FILE = '/u01/app/eppm/scripts/wlkey'
 # P6 EPPM Installation Base
 EPPM_HOME = '/u01/app/eppm'
 
+# Incremental Deployment
+# The manifest records a content hash, size and mtime for each artifact at
+# deploy time (for an exploded directory, also a digest of every file's
+# path, size and mtime, since rewriting a file inside it does not change the
+# directory's own). Applications whose artifact is unchanged and still
+# deployed to the same target are skipped. Use --force to redeploy everything.
+MANIFEST_FILE = EPPM_HOME + '/scripts/deploy-manifest.json'
+HASH_CHUNK_SIZE = 4 * 1024 * 1024  # bytes read per hashing step
+FORCE_REDEPLOY = False
+
+# Deployment Mode
+# 'parallel' submits every undeploy, deploy and startApplication as a
+# non-blocking WLST task and tracks the progress objects together, so the
+# run takes as long as the slowest application. 'serial' deploys, starts
+# and verifies one application at a time.
+DEPLOY_MODE = 'parallel'
+TASK_TIMEOUT = 1800      # seconds allowed for each phase of a parallel run
+POLL_INTERVAL = 5        # seconds between task status checks
+TABLE_INTERVAL = 30      # reprint the status table at least this often
+
+# Redeployment Strategy
+# 'replace' undeploys the running application before deploying the new
+# archive, so the cluster serves nothing for the whole window. 'versioned'
+# uses WebLogic production redeployment: the new archive is deployed side by
+# side as a new application version (staged, from a copy kept under
+# VERSION_ARCHIVE), new sessions go to it while existing sessions drain on
+# the old version, and the old version retires after RETIRE_TIMEOUT. If the
+# new version fails its health check the old version is reactivated and the
+# new one undeployed.
+REDEPLOY_MODE = 'replace'
+VERSION_ARCHIVE = EPPM_HOME + '/deploy-archive'
+RETIRE_TIMEOUT = 3600          # seconds existing sessions may drain on the old version
+HEALTH_CHECK_DEADLINE = 300    # seconds for a new version to pass its health check
+HEALTH_CHECK_INTERVAL = 10     # seconds between health check rounds
+HEALTH_CHECK_TIMEOUT = 10      # seconds per HTTP request
+HEALTHY_STATUS = [200, 301, 302, 307]
+
+# Health check endpoints per application: (port, path). Every member of the
+# application's target cluster is checked on its own listen address and port,
+# read from config.xml (domain_topology.py); MANAGED_HOSTS and the ports here
+# are only used when config.xml is unavailable.
+MANAGED_HOSTS = ['prmapp01', 'prmapp02']
+HEALTH_CHECK_PATHS = {
+    'p6': (7010, '/p6'),
+    'p6tm': (7030, '/p6tm'),
+    'p6ws': (7020, '/p6ws/services'),
+    'p6procloudconnect': (7040, '/p6procloudconnect')
+}
+
+# Work Manager Binding
+# Requests only run in a Part 3 Work Manager ([WORK_MANAGERS]) when the
+# application names it as its dispatch policy. Each application listed here
+# is deployed with a generated deployment plan, PLAN_DIR/<app>/plan.xml, that
+# sets wl-dispatch-policy in the weblogic.xml of every web module. The plan
+# is staged to the managed servers. Remove an entry to deploy that
+# application without a plan.
+PLAN_DIR = EPPM_HOME + '/deploy-plans'
+DISPATCH_POLICIES = {
+    'p6': 'p6web_wm',
+    'p6tm': 'p6tm_wm',
+    'p6ws': 'p6ws_wm',
+    'p6procloudconnect': 'p6cc_wm'
+}
+
+for arg in sys.argv[1:]:
+    if arg == '--force':
+        FORCE_REDEPLOY = True
+    elif arg == '--parallel':
+        DEPLOY_MODE = 'parallel'
+    elif arg == '--serial':
+        DEPLOY_MODE = 'serial'
+    elif arg == '--versioned':
+        REDEPLOY_MODE = 'versioned'
+    elif arg == '--replace':
+        REDEPLOY_MODE = 'replace'
+
 # Application Deployment Configuration
 # Format: (app_name, source_path, target_cluster, app_type)
 DEPLOYMENTS = [
@@ -54,6 +137,15 @@ DEPLOYMENTS = [
      'war')
 ]
 
+# Phase timings are appended to the timing history by lifecycle_timing.py,
+# installed with the Part 4 scripts next to the credential files
+sys.path.append(os.path.dirname(CONFIG_FILE))
+try:
+    import lifecycle_timing
+    timing = lifecycle_timing.Recorder('deploy-p6-apps', mode=DEPLOY_MODE, redeploy=REDEPLOY_MODE)
+except ImportError:
+    timing = None
+
 # =============================================================================
 # FUNCTIONS
 # =============================================================================
@@ -83,15 +175,207 @@ def connect_to_admin():
         return False
 
 
+def load_manifest():
+    """Load the deployment manifest (empty if not present)"""
+    if not os.path.exists(MANIFEST_FILE):
+        return {}
+    try:
+        manifest_file = open(MANIFEST_FILE, 'r')
+        try:
+            return json.load(manifest_file)
+        finally:
+            manifest_file.close()
+    except Exception, e:
+        print('WARNING: Ignoring unreadable manifest ' + MANIFEST_FILE + ': ' + str(e))
+        return {}
+
+
+def save_manifest(manifest):
+    """Write the manifest atomically so an interrupted run cannot corrupt it"""
+    temp_file = MANIFEST_FILE + '.tmp'
+    manifest_file = open(temp_file, 'w')
+    try:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+    finally:
+        manifest_file.close()
+    os.rename(temp_file, MANIFEST_FILE)
+
+
+def hash_file(digest, path):
+    """Feed a file into a digest in fixed-size chunks"""
+    artifact = open(path, 'rb')
+    try:
+        while True:
+            chunk = artifact.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    finally:
+        artifact.close()
+
+
+def hash_artifact(path):
+    """SHA-256 of an archive, or of every file in an exploded directory"""
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for file_name in sorted(files):
+                file_path = os.path.join(root, file_name)
+                digest.update(os.path.relpath(file_path, path))
+                hash_file(digest, file_path)
+    else:
+        hash_file(digest, path)
+    return digest.hexdigest()
+
+
+def stat_directory(path):
+    """SHA-256 of the relative path, size and mtime of every file in a directory"""
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for file_name in sorted(files):
+            file_path = os.path.join(root, file_name)
+            digest.update('%s\t%d\t%d\n' % (os.path.relpath(file_path, path),
+                                            os.path.getsize(file_path),
+                                            int(os.path.getmtime(file_path))))
+    return digest.hexdigest()
+
+
+def fingerprint_artifact(source_path, previous):
+    """Return size, mtime and hash; the hash is reused if size and mtime match.
+    For a directory the path, size and mtime of every file must match too."""
+    size = os.path.getsize(source_path)
+    mtime = int(os.path.getmtime(source_path))
+    fingerprint = {'size': size, 'mtime': mtime}
+    if os.path.isdir(source_path):
+        fingerprint['files'] = stat_directory(source_path)
+    
+    if (previous and previous.get('size') == size and previous.get('mtime') == mtime
+            and previous.get('files') == fingerprint.get('files')):
+        fingerprint['sha256'] = previous.get('sha256')
+        return fingerprint
+    
+    print('  Hashing artifact...')
+    start_time = time.time()
+    fingerprint['sha256'] = hash_artifact(source_path)
+    print('  SHA-256: %s (%.1fs)' % (fingerprint['sha256'], time.time() - start_time))
+    return fingerprint
+
+
+def is_unchanged(app_name, target_cluster, fingerprint, previous):
+    """True if the deployed application matches the artifact on disk"""
+    if FORCE_REDEPLOY or not previous:
+        return False
+    if previous.get('sha256') != fingerprint['sha256']:
+        return False
+    if previous.get('target') != target_cluster:
+        return False
+    if previous.get('dispatch_policy') != DISPATCH_POLICIES.get(app_name):
+        return False
+    return check_application_exists(app_name)
+
+
+def web_modules(source_path):
+    """Return the module names of the web modules in an EAR or WAR"""
+    if os.path.isdir(source_path):
+        if os.path.isdir(os.path.join(source_path, 'WEB-INF')):
+            return [os.path.basename(source_path)]
+        descriptor_path = os.path.join(source_path, 'META-INF', 'application.xml')
+        if os.path.exists(descriptor_path):
+            descriptor_file = open(descriptor_path, 'r')
+            try:
+                descriptor = descriptor_file.read()
+            finally:
+                descriptor_file.close()
+        else:
+            return sorted([name for name in os.listdir(source_path) if name.endswith('.war')])
+    elif source_path.endswith('.war'):
+        return [os.path.basename(source_path)]
+    else:
+        archive = zipfile.ZipFile(source_path)
+        try:
+            names = archive.namelist()
+            if 'META-INF/application.xml' not in names:
+                return sorted([name for name in names if name.endswith('.war') and '/' not in name])
+            descriptor = archive.read('META-INF/application.xml')
+        finally:
+            archive.close()
+    return re.findall(r'<web-uri>\s*([^<\s]+)\s*</web-uri>', descriptor)
+
+
+def write_dispatch_plan(app_name, source_path):
+    """Write the deployment plan binding an application to its Work Manager
+    
+    Returns the plan path, or None if the application has no dispatch policy.
+    """
+    policy = DISPATCH_POLICIES.get(app_name)
+    if not policy:
+        return None
+    modules = web_modules(source_path)
+    if not modules:
+        print('  WARNING: No web modules found in ' + source_path + ', ' + policy + ' not applied')
+        return None
+    
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<deployment-plan xmlns="http://xmlns.oracle.com/weblogic/deployment-plan" global-variables="false">',
+             '  <application-name>' + app_name + '</application-name>',
+             '  <variable-definition>',
+             '    <variable>',
+             '      <name>DispatchPolicy</name>',
+             '      <value>' + policy + '</value>',
+             '    </variable>',
+             '  </variable-definition>']
+    for module in modules:
+        lines.extend(['  <module-override>',
+                      '    <module-name>' + module + '</module-name>',
+                      '    <module-type>war</module-type>',
+                      '    <module-descriptor external="false">',
+                      '      <root-element>weblogic-web-app</root-element>',
+                      '      <uri>WEB-INF/weblogic.xml</uri>',
+                      '      <variable-assignment>',
+                      '        <name>DispatchPolicy</name>',
+                      '        <xpath>/weblogic-web-app/wl-dispatch-policy</xpath>',
+                      '      </variable-assignment>',
+                      '    </module-descriptor>',
+                      '  </module-override>'])
+    lines.append('</deployment-plan>')
+    
+    plan_dir = os.path.join(PLAN_DIR, app_name)
+    if not os.path.isdir(plan_dir):
+        os.makedirs(plan_dir)
+    plan_path = os.path.join(plan_dir, 'plan.xml')
+    plan_file = open(plan_path, 'w')
+    try:
+        plan_file.write('\n'.join(lines) + '\n')
+    finally:
+        plan_file.close()
+    print('  Dispatch policy: ' + policy + ' (' + plan_path + ')')
+    return plan_path
+
+
+def plan_options(app_name, source_path):
+    """deploy() options for the application's dispatch policy plan, if any"""
+    plan_path = write_dispatch_plan(app_name, source_path)
+    if not plan_path:
+        return {}
+    return {'planPath': plan_path, 'planStageMode': 'stage'}
+
+
+def find_app_deployments(app_name):
+    """Return the AppDeployment MBeans of every deployed version of an application"""
+    cd('/')
+    matches = []
+    for app in cmo.getAppDeployments():
+        if app.getApplicationName() == app_name:
+            matches.append(app)
+    return matches
+
+
 def check_application_exists(app_name):
     """Check if an application is already deployed"""
     try:
-        cd('/')
-        apps = cmo.getAppDeployments()
-        for app in apps:
-            if app.getName() == app_name:
-                return True
-        return False
+        return len(find_app_deployments(app_name)) > 0
     except:
         return False
 
@@ -134,13 +418,15 @@ def deploy_application(app_name, source_path, target_cluster):
     
     # Deploy the application
     try:
+        options = plan_options(app_name, source_path)
         print('  Starting deployment...')
         deploy(
             appName=app_name,
             path=source_path,
             targets=target_cluster,
             stageMode='nostage',
-            upload='false'
+            upload='false',
+            **options
         )
         print('  Deployment successful: ' + app_name)
         return True
@@ -165,15 +451,543 @@ def start_application(app_name):
 def verify_deployment(app_name, target_cluster):
     """Verify application deployment status"""
     try:
-        cd('/AppDeployments/' + app_name)
-        targets = get('Targets')
-        print('  Deployment verified - Targets: ' + str([t.getName() for t in targets]))
+        deployments = find_app_deployments(app_name)
+        if not deployments:
+            raise Exception('no AppDeployment found for ' + app_name)
+        for app in deployments:
+            targets = app.getTargets()
+            print('  Deployment verified - ' + app.getName() + ' Targets: ' + str([t.getName() for t in targets]))
         return True
     except Exception, e:
         print('  WARNING: Could not verify deployment: ' + str(e))
         return False
 
 
+def version_identifier(fingerprint):
+    """Application version identifier derived from the artifact hash"""
+    return 'v' + fingerprint['sha256'][:12]
+
+
+def archive_path(app_name, version, source_path):
+    """Location of the archived copy of an application version"""
+    return VERSION_ARCHIVE + '/' + app_name + '/' + version + '/' + os.path.basename(source_path)
+
+
+def archive_artifact(app_name, version, source_path):
+    """Copy the artifact into the version archive so later deploys cannot overwrite it"""
+    target_path = archive_path(app_name, version, source_path)
+    if not os.path.exists(target_path):
+        print('  Archiving ' + app_name + ' ' + version + ' to ' + os.path.dirname(target_path))
+        if not os.path.isdir(os.path.dirname(target_path)):
+            os.makedirs(os.path.dirname(target_path))
+        if os.path.isdir(source_path):
+            shutil.copytree(source_path, target_path)
+        else:
+            shutil.copy2(source_path, target_path)
+    return target_path
+
+
+def prune_archive(app_name, keep_versions):
+    """Remove archived versions that can no longer be rolled back to"""
+    app_dir = VERSION_ARCHIVE + '/' + app_name
+    if not os.path.isdir(app_dir):
+        return
+    for version in os.listdir(app_dir):
+        if version not in keep_versions:
+            try:
+                shutil.rmtree(app_dir + '/' + version)
+            except Exception, e:
+                print('  WARNING: Could not remove archived ' + app_name + ' ' + version + ': ' + str(e))
+
+
+def get_version_states(app_name, target_cluster):
+    """Map each deployed version of an application to (state, is_active)
+    
+    Unversioned deployments are reported under the key None.
+    """
+    app_ids = {}
+    for app in find_app_deployments(app_name):
+        app_ids[app.getVersionIdentifier()] = app.getName()
+    
+    versions = {}
+    if not app_ids:
+        return versions
+    
+    domainRuntime()
+    try:
+        runtime = getMBean('/AppRuntimeStateRuntime/AppRuntimeStateRuntime')
+        for version, app_id in app_ids.items():
+            versions[version] = (runtime.getCurrentState(app_id, target_cluster),
+                                 runtime.isActiveVersion(app_id))
+    finally:
+        serverConfig()
+    return versions
+
+
+def plan_versioned_deployment(app_name, plan, fingerprint):
+    """Prepare a side-by-side deployment of a new application version
+    
+    Sets plan['strategy'] to one of:
+      initial    - not deployed yet, deploy as the first version
+      replace    - deployed without a version identifier, undeploy it once
+      versioned  - production redeployment alongside the active version
+    Retired versions left over from earlier runs are undeployed first.
+    """
+    versions = get_version_states(app_name, plan['target'])
+    new_version = version_identifier(fingerprint)
+    if new_version in versions:
+        # Forced redeploy of identical content still needs a distinct version
+        new_version = new_version + '-' + time.strftime('%Y%m%d%H%M%S')
+    
+    retired = []
+    if not versions:
+        plan['strategy'] = 'initial'
+    elif None in versions:
+        print('  NOTE: ' + app_name + ' is deployed without a version identifier.')
+        print('        It is replaced once (with downtime); later redeploys are side by side.')
+        plan['strategy'] = 'replace'
+    else:
+        plan['strategy'] = 'initial'
+        for version, (state, is_active) in versions.items():
+            if is_active:
+                plan['strategy'] = 'versioned'
+                plan['old_version'] = version
+            elif state == 'STATE_ACTIVE':
+                raise Exception('version ' + version + ' is still retiring; '
+                                'wait for it to retire or undeploy it before redeploying')
+            else:
+                retired.append(version)
+    
+    for version in retired:
+        print('  Undeploying retired version: ' + app_name + ' ' + version)
+        undeploy(app_name, versionIdentifier=version)
+    
+    if plan['strategy'] == 'versioned':
+        old_path = archive_path(app_name, plan['old_version'], plan['source'])
+        if os.path.exists(old_path):
+            plan['old_path'] = old_path
+        else:
+            print('  WARNING: No archived copy of ' + app_name + ' ' + plan['old_version'] +
+                  ', rollback will not be possible')
+    
+    plan['new_version'] = new_version
+    plan['path'] = archive_artifact(app_name, new_version, plan['source'])
+    plan['options'] = {'stageMode': 'stage', 'versionIdentifier': new_version}
+    if plan['strategy'] == 'versioned':
+        plan['options']['retireTimeout'] = RETIRE_TIMEOUT
+    fingerprint['version'] = new_version
+    print('  ' + app_name + ': ' + plan['strategy'] + ' deployment of version ' + new_version)
+
+
+def probe_url(url):
+    """Return the HTTP status of a GET request, or None if unreachable"""
+    address, path = url[len('http://'):].split('/', 1)
+    host, port = address.split(':')
+    connection = httplib.HTTPConnection(host, int(port), timeout=HEALTH_CHECK_TIMEOUT)
+    try:
+        try:
+            connection.request('GET', '/' + path)
+            return connection.getresponse().status
+        except Exception:
+            return None
+    finally:
+        connection.close()
+
+
+def health_check_addresses(app_name):
+    """(host, port) of every member of the application's target cluster
+
+    From config.xml (domain_topology.py, next to CONFIG_FILE); None if it is
+    unavailable or does not know the cluster.
+    """
+    targets = [target for name, source, target, app_type in DEPLOYMENTS if name == app_name]
+    if not targets:
+        return None
+    try:
+        import domain_topology
+        topology = domain_topology.load_topology()
+    except Exception:
+        return None
+    cluster = topology['clusters'].get(targets[0])
+    if not cluster:
+        return None
+    addresses = []
+    for server_name in cluster['servers']:
+        server = topology['servers'][server_name]
+        host = server['listen_address'] or server['host']
+        if host:
+            addresses.append((host, server['listen_port']))
+    return addresses or None
+
+
+def health_check_urls(app_name):
+    """Health check URLs of an application on every member of its cluster"""
+    if app_name not in HEALTH_CHECK_PATHS:
+        return []
+    port, path = HEALTH_CHECK_PATHS[app_name]
+    addresses = health_check_addresses(app_name) or [(host, port) for host in MANAGED_HOSTS]
+    return ['http://' + host + ':' + str(listen_port) + path for host, listen_port in addresses]
+
+
+def check_health(app_names, status, order, display):
+    """Probe the new versions until every URL answers or the deadline passes
+    
+    Returns the set of applications that passed.
+    """
+    print('')
+    print('-' * 60)
+    print('Phase: health (' + str(len(app_names)) + ' applications)')
+    print('-' * 60)
+    
+    healthy = set()
+    pending = list(app_names)
+    urls = dict((app_name, health_check_urls(app_name)) for app_name in app_names)
+    deadline = time.time() + HEALTH_CHECK_DEADLINE
+    for app_name in pending:
+        status[app_name]['phase'] = 'health'
+        status[app_name]['state'] = 'checking'
+        status[app_name]['phase_start'] = time.time()
+    
+    while pending:
+        for app_name in list(pending):
+            entry = status[app_name]
+            failing = []
+            for url in urls[app_name]:
+                if probe_url(url) not in HEALTHY_STATUS:
+                    failing.append(url)
+            entry['failing'] = failing
+            if failing:
+                entry['state'] = str(len(failing)) + ' url(s) failing'
+                continue
+            entry['state'] = 'healthy'
+            entry['timings']['health'] = time.time() - entry['phase_start']
+            record_phase(app_name, 'health', entry, True)
+            healthy.add(app_name)
+            pending.remove(app_name)
+        
+        if pending and time.time() > deadline:
+            for app_name in pending:
+                entry = status[app_name]
+                entry['state'] = 'unhealthy'
+                entry['timings']['health'] = time.time() - entry['phase_start']
+                record_phase(app_name, 'health', entry, False)
+                print('  ERROR: ' + app_name + ' failed its health check after ' + str(HEALTH_CHECK_DEADLINE) + 's:')
+                for url in entry['failing']:
+                    print('    ' + url)
+            pending = []
+        
+        refresh_status_table(status, order, display)
+        if pending:
+            time.sleep(HEALTH_CHECK_INTERVAL)
+    
+    return healthy
+
+
+def deploy_serial(pending):
+    """Deploy, start and verify each application in turn (blocking)"""
+    outcomes = {}
+    for item in pending:
+        if REDEPLOY_MODE == 'versioned':
+            # Versioned redeployment runs through the task pipeline, one app at a time
+            outcomes.update(deploy_parallel([item]))
+            continue
+        app_name, source_path, target_cluster, fingerprint = item
+        if timing:
+            timing.begin('deploy', app_name)
+        success = deploy_application(app_name, source_path, target_cluster)
+        if timing:
+            timing.end('deploy', app_name, success and 'ok' or 'failed')
+        if success:
+            if timing:
+                timing.begin('start', app_name)
+            started = start_application(app_name)
+            if timing:
+                timing.end('start', app_name, started and 'ok' or 'failed')
+            verify_deployment(app_name, target_cluster)
+            outcomes[app_name] = 'DEPLOYED'
+        else:
+            outcomes[app_name] = 'FAILED'
+    return outcomes
+
+
+def format_seconds(value):
+    """Format a duration for the status table"""
+    if value is None:
+        return '-'
+    return '%.1fs' % value
+
+
+def print_status_table(status, order):
+    """Print the per-application task status table"""
+    now = time.time()
+    print('')
+    print('  ' + 'Application'.ljust(20) + 'Phase'.ljust(11) + 'State'.ljust(24) +
+          'Deploy'.rjust(9) + 'Start'.rjust(9) + 'Health'.rjust(9) + 'Total'.rjust(9))
+    print('  ' + '-' * 91)
+    for app_name in order:
+        entry = status[app_name]
+        if entry['finished'] is not None:
+            total = entry['finished'] - entry['submitted']
+        else:
+            total = now - entry['submitted']
+        print('  ' + app_name.ljust(20) + entry['phase'].ljust(11) + entry['state'][:23].ljust(24) +
+              format_seconds(entry['timings'].get('deploy')).rjust(9) +
+              format_seconds(entry['timings'].get('start')).rjust(9) +
+              format_seconds(entry['timings'].get('health')).rjust(9) +
+              format_seconds(total).rjust(9))
+
+
+def refresh_status_table(status, order, display):
+    """Reprint the table when any state changes, and periodically otherwise"""
+    snapshot = [(app_name, status[app_name]['phase'], status[app_name]['state']) for app_name in order]
+    if snapshot != display.get('snapshot') or time.time() - display.get('printed', 0) >= TABLE_INTERVAL:
+        print_status_table(status, order)
+        display['snapshot'] = snapshot
+        display['printed'] = time.time()
+
+
+def track_tasks(phase, tasks, status, order, display):
+    """Poll WLST progress objects together until each completes or fails
+    
+    tasks maps app_name to the WLSTProgress returned by a non-blocking
+    command. Returns the set of applications whose task completed.
+    """
+    completed = set()
+    pending = [app_name for app_name in order if app_name in tasks]
+    deadline = time.time() + TASK_TIMEOUT
+    
+    while pending:
+        for app_name in list(pending):
+            progress = tasks[app_name]
+            entry = status[app_name]
+            try:
+                if progress.isCompleted():
+                    entry['state'] = 'completed'
+                elif progress.isFailed():
+                    entry['state'] = 'failed'
+                    print('')
+                    print('  ERROR: ' + phase + ' failed for ' + app_name)
+                    progress.printStatus()
+                else:
+                    entry['state'] = str(progress.getState()).lower()
+                    continue
+            except Exception, e:
+                entry['state'] = 'failed'
+                print('  ERROR: Could not read ' + phase + ' status for ' + app_name + ': ' + str(e))
+            
+            entry['timings'][phase] = time.time() - entry['phase_start']
+            record_phase(app_name, phase, entry, entry['state'] == 'completed')
+            pending.remove(app_name)
+            if entry['state'] == 'completed':
+                completed.add(app_name)
+        
+        if pending and time.time() > deadline:
+            for app_name in pending:
+                status[app_name]['state'] = 'timed out'
+                status[app_name]['timings'][phase] = time.time() - status[app_name]['phase_start']
+                record_phase(app_name, phase, status[app_name], False)
+                print('  ERROR: ' + phase + ' of ' + app_name + ' did not finish within ' + str(TASK_TIMEOUT) + 's')
+            pending = []
+        
+        refresh_status_table(status, order, display)
+        if pending:
+            time.sleep(POLL_INTERVAL)
+    
+    return completed
+
+
+def submit_phase(phase, app_names, submit, status, order, display):
+    """Submit one non-blocking task per application and track them together"""
+    print('')
+    print('-' * 60)
+    print('Phase: ' + phase + ' (' + str(len(app_names)) + ' applications)')
+    print('-' * 60)
+    
+    tasks = {}
+    for app_name in app_names:
+        entry = status[app_name]
+        entry['phase'] = phase
+        entry['phase_start'] = time.time()
+        try:
+            tasks[app_name] = submit(app_name)
+            entry['state'] = 'submitted'
+            print('  Submitted ' + phase + ': ' + app_name)
+        except Exception, e:
+            entry['state'] = 'failed'
+            entry['timings'][phase] = time.time() - entry['phase_start']
+            record_phase(app_name, phase, entry, False)
+            print('  ERROR: Could not submit ' + phase + ' for ' + app_name + ': ' + str(e))
+    
+    if not tasks:
+        return set()
+    if timing:
+        timing.begin('phase', phase)
+    completed = track_tasks(phase, tasks, status, order, display)
+    if timing:
+        timing.end('phase', phase, len(completed) == len(tasks) and 'ok' or 'failed')
+    return completed
+
+
+def record_phase(app_name, phase, entry, ok):
+    """Add one application's phase time to the timing record"""
+    if timing:
+        timing.add(phase, entry['timings'][phase], app_name, ok and 'ok' or 'failed', entry['phase_start'])
+
+
+def start_task(app_name, version):
+    """Submit a non-blocking startApplication for an application or version"""
+    if version:
+        return startApplication(app_name, versionIdentifier=version, block='false')
+    return startApplication(app_name, block='false')
+
+
+def deploy_parallel(pending):
+    """Deploy and start all applications as concurrent WLST tasks
+    
+    Each phase (undeploy, deploy, start) is submitted for every application
+    at once with block='false'. In versioned mode the new versions are then
+    health checked together and failures rolled back. A failure only removes
+    that application from the later phases; the others carry on.
+    
+    Returns a map of app_name to DEPLOYED, ROLLED BACK or FAILED.
+    """
+    order = [item[0] for item in pending]
+    plans = {}
+    fingerprints = {}
+    status = {}
+    outcomes = {}
+    display = {}
+    run_start = time.time()
+    
+    for app_name, source_path, target_cluster, fingerprint in pending:
+        plans[app_name] = {'source': source_path, 'target': target_cluster, 'path': source_path,
+                           'strategy': 'replace', 'new_version': None,
+                           'old_version': None, 'old_path': None,
+                           'options': {'stageMode': 'nostage', 'upload': 'false'}}
+        fingerprints[app_name] = fingerprint
+        status[app_name] = {'phase': 'queued', 'state': 'waiting',
+                            'submitted': run_start, 'finished': None,
+                            'phase_start': run_start, 'timings': {}}
+        outcomes[app_name] = 'FAILED'
+    
+    ready = []
+    for app_name in order:
+        plan = plans[app_name]
+        if not os.path.exists(plan['source']):
+            print('  ERROR: Source file not found: ' + plan['source'])
+            status[app_name]['state'] = 'source missing'
+            status[app_name]['finished'] = time.time()
+            continue
+        if REDEPLOY_MODE == 'versioned':
+            try:
+                plan_versioned_deployment(app_name, plan, fingerprints[app_name])
+            except Exception, e:
+                print('  ERROR: Cannot redeploy ' + app_name + ': ' + str(e))
+                status[app_name]['state'] = 'not redeployable'
+                status[app_name]['finished'] = time.time()
+                continue
+        try:
+            plan['options'].update(plan_options(app_name, plan['source']))
+        except Exception, e:
+            print('  ERROR: Cannot write deployment plan for ' + app_name + ': ' + str(e))
+            status[app_name]['state'] = 'plan failed'
+            status[app_name]['finished'] = time.time()
+            continue
+        ready.append(app_name)
+    
+    # Phase 1: remove previous versions that cannot run side by side
+    existing = [app_name for app_name in ready
+                if plans[app_name]['strategy'] == 'replace' and check_application_exists(app_name)]
+    if existing:
+        undeployed = submit_phase('undeploy', existing,
+                                  lambda app_name: undeploy(app_name, block='false'),
+                                  status, order, display)
+        for app_name in existing:
+            if app_name not in undeployed:
+                # Same as serial mode: warn and let deploy report the outcome
+                print('  WARNING: Could not undeploy ' + app_name + ', attempting deploy anyway')
+    
+    # Phase 2: deploy to every cluster at once
+    deployed = submit_phase('deploy', ready,
+                            lambda app_name: deploy(appName=app_name,
+                                                    path=plans[app_name]['path'],
+                                                    targets=plans[app_name]['target'],
+                                                    block='false',
+                                                    **plans[app_name]['options']),
+                            status, order, display)
+    for app_name in ready:
+        if app_name not in deployed:
+            status[app_name]['finished'] = time.time()
+            if plans[app_name]['new_version']:
+                prune_archive(app_name, [plans[app_name]['old_version']])
+    
+    # Phase 3: start every deployed application; a production redeployment
+    # activates the new version itself
+    to_start = [app_name for app_name in order
+                if app_name in deployed and plans[app_name]['strategy'] != 'versioned']
+    started = submit_phase('start', to_start,
+                           lambda app_name: start_task(app_name, plans[app_name]['new_version']),
+                           status, order, display)
+    for app_name in to_start:
+        if app_name not in started:
+            # Same as serial mode: a failed start does not fail the deployment
+            print('  WARNING: Could not start ' + app_name)
+    
+    # Phase 4: health check new versions, rolling back those that fail
+    succeeded = [app_name for app_name in order if app_name in deployed]
+    if REDEPLOY_MODE == 'versioned' and succeeded:
+        healthy = check_health(succeeded, status, order, display)
+        unhealthy = [app_name for app_name in succeeded if app_name not in healthy]
+        rollback = [app_name for app_name in unhealthy if plans[app_name]['old_path']]
+        for app_name in unhealthy:
+            if app_name not in rollback:
+                print('  ERROR: ' + app_name + ' ' + plans[app_name]['new_version'] +
+                      ' is unhealthy and there is no previous version to roll back to')
+        
+        if rollback:
+            reactivated = submit_phase('rollback', rollback,
+                                       lambda app_name: redeploy(app_name,
+                                                                 appPath=plans[app_name]['old_path'],
+                                                                 versionIdentifier=plans[app_name]['old_version'],
+                                                                 block='false'),
+                                       status, order, display)
+            removed = submit_phase('remove', [app_name for app_name in rollback if app_name in reactivated],
+                                   lambda app_name: undeploy(app_name,
+                                                             versionIdentifier=plans[app_name]['new_version'],
+                                                             block='false'),
+                                   status, order, display)
+            for app_name in reactivated:
+                outcomes[app_name] = 'ROLLED BACK'
+                prune_archive(app_name, [plans[app_name]['old_version']])
+                if app_name not in removed:
+                    print('  WARNING: ' + app_name + ' ' + plans[app_name]['new_version'] +
+                          ' is retiring but could not be undeployed')
+        succeeded = [app_name for app_name in succeeded if app_name in healthy]
+    
+    for app_name in order:
+        if status[app_name]['finished'] is None:
+            status[app_name]['finished'] = time.time()
+    
+    for app_name in succeeded:
+        status[app_name]['phase'] = 'done'
+        print('')
+        print('Verifying: ' + app_name)
+        verify_deployment(app_name, plans[app_name]['target'])
+        if plans[app_name]['new_version']:
+            prune_archive(app_name, [plans[app_name]['new_version'], plans[app_name]['old_version']])
+            if plans[app_name]['old_version']:
+                print('  ' + plans[app_name]['old_version'] + ' is retiring (timeout ' + str(RETIRE_TIMEOUT) + 's)')
+        outcomes[app_name] = 'DEPLOYED'
+    
+    print('')
+    print('Deployment timings:')
+    print_status_table(status, order)
+    print('')
+    print('  Wall clock: %.1fs' % (time.time() - run_start))
+    
+    return outcomes
+
+
 def print_summary(results):
     """Print deployment summary"""
     print('')
@@ -184,10 +998,9 @@ def print_summary(results):
     success_count = 0
     fail_count = 0
     
-    for app_name, success in results:
-        status = 'SUCCESS' if success else 'FAILED'
+    for app_name, status in results:
         print('  ' + app_name.ljust(30) + status)
-        if success:
+        if status not in ('FAILED', 'ROLLED BACK'):
             success_count += 1
         else:
             fail_count += 1
@@ -213,22 +1026,64 @@ def main():
     print('=' * 60)
     
     # Connect to Admin Server
+    if timing:
+        timing.begin('connect')
     if not connect_to_admin():
         print('Exiting due to connection failure.')
+        if timing:
+            timing.end('connect', status='failed')
+            timing.finish('failed')
         sys.exit(1)
+    if timing:
+        timing.end('connect')
     
     # Track results
     results = []
+    manifest = load_manifest()
     
-    # Deploy each application
+    # Work out which applications need deploying
+    pending = []
     for app_name, source_path, target_cluster, app_type in DEPLOYMENTS:
-        success = deploy_application(app_name, source_path, target_cluster)
+        previous = manifest.get(app_name)
+        fingerprint = None
         
-        if success:
-            start_application(app_name)
-            verify_deployment(app_name, target_cluster)
+        if os.path.exists(source_path):
+            if timing:
+                timing.begin('fingerprint', app_name)
+            fingerprint = fingerprint_artifact(source_path, previous)
+            if timing:
+                timing.end('fingerprint', app_name)
+            if is_unchanged(app_name, target_cluster, fingerprint, previous):
+                print('')
+                print('Unchanged: ' + app_name + ' (' + fingerprint['sha256'][:12] + ') - skipping redeploy')
+                continue
         
-        results.append((app_name, success))
+        pending.append((app_name, source_path, target_cluster, fingerprint))
+    
+    # Deploy the changed applications
+    if not pending:
+        outcomes = {}
+    elif DEPLOY_MODE == 'parallel':
+        print('')
+        print('Deploying ' + str(len(pending)) + ' applications in parallel')
+        outcomes = deploy_parallel(pending)
+    else:
+        outcomes = deploy_serial(pending)
+    
+    # Record what is now deployed
+    for app_name, source_path, target_cluster, fingerprint in pending:
+        if outcomes.get(app_name) == 'DEPLOYED':
+            fingerprint['source'] = source_path
+            fingerprint['target'] = target_cluster
+            fingerprint['dispatch_policy'] = DISPATCH_POLICIES.get(app_name)
+            fingerprint['deployed'] = time.strftime('%Y-%m-%d %H:%M:%S')
+            manifest[app_name] = fingerprint
+    if outcomes:
+        save_manifest(manifest)
+    
+    # Report in DEPLOYMENTS order
+    for app_name, source_path, target_cluster, app_type in DEPLOYMENTS:
+        results.append((app_name, outcomes.get(app_name, 'UNCHANGED')))
     
     # Disconnect
     print('')
@@ -237,6 +1092,9 @@ def main():
     
     # Print summary
     all_success = print_summary(results)
+    if timing:
+        timing.finish(all_success and 'ok' or 'failed',
+                      deployed=[app_name for app_name, status in results if status == 'DEPLOYED'])
     
     if all_success:
         print('')
@@ -3,6 +3,12 @@
 # deploy_p6_apps.sh
 # Wrapper script to deploy P6 EPPM applications using WLST
 #
+# Usage:
+#   ./deploy_p6_apps.sh           # redeploy only changed applications
+#   ./deploy_p6_apps.sh --force   # redeploy every application
+#   ./deploy_p6_apps.sh --serial  # deploy one application at a time
+#   ./deploy_p6_apps.sh --versioned  # zero-downtime production redeployment
+#
 # Zero to Enterprise: P6 EPPM 25.12 with SSO - Part 5
 # Integration Faces - https://integrationfaces.com
 # =============================================================================
@@ -68,7 +74,7 @@ echo ""
 echo "Executing WLST deployment script..."
 echo ""
 
-"${ORACLE_HOME}/oracle_common/common/bin/wlst.sh" "${WLST_SCRIPT}"
+"${ORACLE_HOME}/oracle_common/common/bin/wlst.sh" "${WLST_SCRIPT}" "$@"
 RESULT=$?
 
 echo ""
@@ -10,8 +10,7 @@
 SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
 DOMAIN_HOME="/u01/app/weblogic/user_projects/domains/eppm_domain"
 
-# Set environment
-source "${DOMAIN_HOME}/bin/setDomainEnv.sh"
+AGENT_CLIENT="/u01/app/eppm/scripts/wlst-client.py"
 
 echo ""
 echo "============================================================"
@@ -20,6 +19,22 @@ echo "Integration Faces - Zero to Enterprise Series"
 echo "============================================================"
 echo ""
 
+# Use the WLST agent (Part 4) when it is running - no JVM startup or connect.
+# It makes the same deploy() call as deploy_p6web_only.py.
+# Exit code 3 means the agent is not available.
+if [[ -f "${AGENT_CLIENT}" ]]; then
+    python3 "${AGENT_CLIENT}" deploy p6 /u01/app/eppm/p6/p6.ear p6web_cluster
+    rc=$?
+    if [[ ${rc} -ne 3 ]]; then
+        echo ""
+        echo "Deploy script completed."
+        exit ${rc}
+    fi
+fi
+
+# Set environment
+source "${DOMAIN_HOME}/bin/setDomainEnv.sh"
+
 # Run WLST script
 java weblogic.WLST "${SCRIPT_DIR}/deploy_p6web_only.py"
 
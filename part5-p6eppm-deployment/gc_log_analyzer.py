@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+# =============================================================================
+# gc_log_analyzer.py
+# Incremental GC log analysis for the P6 EPPM managed servers
+#
+# Reads the JDK 11 unified GC logs that configure_server_args.py enables
+# (-Xlog:gc*...:file=<server>/logs/gc.log, rotated to gc.log.0, gc.log.1...)
+# under $DOMAIN_HOME/servers/*/logs. Files are streamed line by line from
+# the offset reached on the previous run, tracked per inode so rotation and
+# JVM restarts are followed without re-reading old data. Parsed GC events are
+# kept (up to MAX_EVENTS per server) in a state file, so each run reports on
+# the recent history and not just on what was appended since the last run.
+#
+# Per server it reports:
+#   - pause count and p50/p95/p99/max pause time, Full GC count
+#   - GC throughput (share of JVM uptime not spent in pauses)
+#   - allocation rate and old-generation promotion rate (MB/s)
+#   - heap after GC: last, maximum and trend (MB/hour, least squares)
+#
+# Usage:
+#   ./gc_log_analyzer.py                      # update and report
+#   ./gc_log_analyzer.py --since 1h           # only events from the last hour
+#   ./gc_log_analyzer.py --server p6web_ms1 --json
+#   ./gc_log_analyzer.py --follow             # print pauses as they happen
+#   ./gc_log_analyzer.py --reset              # forget offsets and history
+#
+# Zero to Enterprise: P6 EPPM 25.12 with SSO - Part 5
+# Integration Faces - https://integrationfaces.com
+# =============================================================================
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from percentiles import percentile
+
+DOMAIN_HOME = '/u01/app/weblogic/user_projects/domains/eppm_domain'
+LOG_GLOB = 'servers/*/logs/gc.log*'
+STATE_FILE = '/u01/app/eppm/scripts/.gc-analyzer-state.json'
+STATE_VERSION = 1
+
+MAX_EVENTS = 20000          # GC events kept per server in the state file
+FOLLOW_INTERVAL = 2.0       # seconds between reads in --follow mode
+LONG_PAUSE_MS = 500         # pauses flagged in the report and --follow output
+MIN_THROUGHPUT = 95.0       # GC throughput (%) below which a server is flagged
+TREND_WARN_MB_PER_HOUR = 50.0
+TREND_MIN_HOURS = 1.0       # heap trend only over at least this much time
+
+# Event fields, stored as compact lists in the state file
+FIELDS = ('epoch', 'uptime', 'gc_id', 'kind', 'pause_ms', 'before_mb', 'after_mb',
+          'capacity_mb', 'old_before_mb', 'old_after_mb')
+
+# [2025-01-10T10:15:02.123+0000][1234.567s][info][gc] GC(42) ...
+DECORATION = re.compile(r'\[([^\]]*)\]')
+PAUSE = re.compile(r'GC\((\d+)\) Pause (.+?)(?: (\d+)([KMG])->(\d+)([KMG])\((\d+)([KMG])\))? '
+                   r'(\d+(?:\.\d+)?)ms$')
+PARALLEL_GEN = re.compile(r'GC\((\d+)\) (PSYoungGen|ParOldGen): (\d+)([KMG])->(\d+)([KMG])\(')
+G1_OLD_REGIONS = re.compile(r'GC\((\d+)\) Old regions: (\d+)->(\d+)')
+G1_REGION_SIZE = re.compile(r'Heap region size: (\d+)([KMG])')
+
+UNIT_MB = {'K': 1.0 / 1024, 'M': 1.0, 'G': 1024.0}
+
+
+class ServerLog(object):
+    """Parser state and retained events for one managed server"""
+
+    def __init__(self, name, saved=None):
+        saved = saved or {}
+        self.name = name
+        self.events = [dict(zip(FIELDS, values)) for values in saved.get('events', [])]
+        self.region_mb = saved.get('region_mb', 1.0)
+        # Generation sizes logged before the pause line, keyed by GC id
+        self.pending = dict((int(k), v) for k, v in saved.get('pending', {}).items())
+        self.new_events = []
+
+    def to_state(self):
+        events = self.events[-MAX_EVENTS:]
+        return {'events': [[event[field] for field in FIELDS] for event in events],
+                'region_mb': self.region_mb,
+                'pending': dict((str(k), v) for k, v in list(self.pending.items())[-20:])}
+
+    def parse_line(self, line):
+        decorations = []
+        position = 0
+        while True:
+            match = DECORATION.match(line, position)
+            if not match:
+                break
+            decorations.append(match.group(1))
+            position = match.end()
+        message = line[position:].strip()
+        if not message:
+            return
+
+        epoch = None
+        uptime = None
+        for decoration in decorations:
+            if decoration.endswith('s') and decoration[:-1].replace('.', '', 1).isdigit():
+                uptime = float(decoration[:-1])
+            elif 'T' in decoration and decoration[:4].isdigit():
+                epoch = parse_time(decoration)
+
+        match = G1_REGION_SIZE.search(message)
+        if match:
+            self.region_mb = int(match.group(1)) * UNIT_MB[match.group(2)]
+            return
+        match = PARALLEL_GEN.match(message)
+        if match:
+            if match.group(2) == 'ParOldGen':
+                gc_id = int(match.group(1))
+                self.pending[gc_id] = [to_mb(match.group(3), match.group(4)),
+                                       to_mb(match.group(5), match.group(6))]
+            return
+        match = G1_OLD_REGIONS.match(message)
+        if match:
+            self.pending[int(match.group(1))] = [int(match.group(2)) * self.region_mb,
+                                                 int(match.group(3)) * self.region_mb]
+            return
+        match = PAUSE.match(message)
+        if match:
+            gc_id = int(match.group(1))
+            old = self.pending.pop(gc_id, [None, None])
+            event = {'epoch': epoch, 'uptime': uptime, 'gc_id': gc_id,
+                     'kind': pause_kind(match.group(2)),
+                     'pause_ms': float(match.group(9)),
+                     'before_mb': None, 'after_mb': None, 'capacity_mb': None,
+                     'old_before_mb': old[0], 'old_after_mb': old[1]}
+            if match.group(3):
+                event['before_mb'] = to_mb(match.group(3), match.group(4))
+                event['after_mb'] = to_mb(match.group(5), match.group(6))
+                event['capacity_mb'] = to_mb(match.group(7), match.group(8))
+            self.events.append(event)
+            self.new_events.append(event)
+
+
+def parse_time(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f%z').timestamp()
+    except ValueError:
+        return None
+
+
+def to_mb(value, unit):
+    return round(int(value) * UNIT_MB[unit], 3)
+
+
+def pause_kind(description):
+    """Young, Mixed, Full, Remark, Cleanup or the ZGC phase name"""
+    words = description.split()
+    if words[0] in ('Young', 'Full', 'Remark', 'Cleanup'):
+        if words[0] == 'Young' and '(Mixed)' in description:
+            return 'Mixed'
+        return words[0]
+    return ' '.join(words[:2])
+
+
+# -----------------------------------------------------------------------------
+# Incremental reading
+# -----------------------------------------------------------------------------
+
+def load_state(state_file):
+    try:
+        with open(state_file) as f:
+            state = json.load(f)
+        if state.get('version') == STATE_VERSION:
+            return state
+    except (OSError, ValueError):
+        pass
+    return {'version': STATE_VERSION, 'files': {}, 'servers': {}}
+
+
+def save_state(state_file, state):
+    temp_file = state_file + '.tmp'
+    with open(temp_file, 'w') as f:
+        json.dump(state, f)
+    os.rename(temp_file, state_file)
+
+
+def log_files(domain_home):
+    """{server: [paths oldest first]} for every server with GC logs"""
+    servers = {}
+    for path in glob.glob(os.path.join(domain_home, LOG_GLOB)):
+        if path.endswith('.lck'):
+            continue
+        server = path.split(os.sep)[-3]
+        servers.setdefault(server, []).append(path)
+    for paths in servers.values():
+        paths.sort(key=lambda path: os.stat(path).st_mtime)
+    return servers
+
+
+def read_new_lines(path, position):
+    """Yield complete lines after byte offset position; returns via StopIteration"""
+    with open(path, 'rb') as f:
+        f.seek(position)
+        for raw in f:
+            if not raw.endswith(b'\n'):
+                break       # partial line still being written
+            position += len(raw)
+            yield raw.decode('utf-8', 'replace'), position
+
+
+def update(state, domain_home, servers_filter=None):
+    """Read everything appended since the last run; returns {server: ServerLog}"""
+    offsets = state['files']        # inode -> {'offset', 'path'}
+    seen = set()
+    logs = {}
+    read_bytes = 0
+
+    for server, paths in sorted(log_files(domain_home).items()):
+        if servers_filter and server not in servers_filter:
+            continue
+        log = ServerLog(server, state['servers'].get(server))
+        logs[server] = log
+        for path in paths:
+            stat = os.stat(path)
+            inode = '%d:%d' % (stat.st_dev, stat.st_ino)
+            seen.add(inode)
+            start = offsets.get(inode, {}).get('offset', 0)
+            if stat.st_size < start:
+                start = 0       # file was truncated or replaced in place
+            position = start
+            for line, position in read_new_lines(path, start):
+                log.parse_line(line)
+            offsets[inode] = {'offset': position, 'path': path}
+            read_bytes += position - start
+        state['servers'][server] = log.to_state()
+
+    # Forget rotated-away files of the servers that were read
+    for inode in list(offsets.keys()):
+        server = offsets[inode]['path'].split(os.sep)[-3]
+        if inode not in seen and (not servers_filter or server in servers_filter):
+            del offsets[inode]
+    return logs, read_bytes
+
+
+# -----------------------------------------------------------------------------
+# Analysis
+# -----------------------------------------------------------------------------
+
+def segments(events):
+    """Split events into JVM runs (uptime goes backwards after a restart)"""
+    runs = []
+    current = []
+    for event in events:
+        if event['uptime'] is None:
+            continue
+        if current and event['uptime'] < current[-1]['uptime']:
+            runs.append(current)
+            current = []
+        current.append(event)
+    if current:
+        runs.append(current)
+    return runs
+
+
+def trend(points):
+    """Least-squares slope of (hours, MB) points, in MB/hour
+
+    None for fewer than 3 points or a span shorter than TREND_MIN_HOURS,
+    where a few collections would be extrapolated into a rate.
+    """
+    if len(points) < 3:
+        return None
+    hours = [x for x, y in points]
+    if max(hours) - min(hours) < TREND_MIN_HOURS:
+        return None
+    n = float(len(points))
+    mean_x = sum(x for x, y in points) / n
+    mean_y = sum(y for x, y in points) / n
+    variance = sum((x - mean_x) ** 2 for x, y in points)
+    if variance == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def analyze(events):
+    pauses = sorted(event['pause_ms'] for event in events)
+    kinds = {}
+    for event in events:
+        kinds[event['kind']] = kinds.get(event['kind'], 0) + 1
+
+    elapsed = 0.0
+    allocated = 0.0
+    alloc_time = 0.0
+    promoted = 0.0
+    heap_points = []
+    for run in segments(events):
+        elapsed += run[-1]['uptime'] - run[0]['uptime']
+        previous = None
+        for event in run:
+            if event['after_mb'] is None:
+                continue
+            if previous is not None and event['uptime'] > previous['uptime']:
+                allocated += max(0.0, event['before_mb'] - previous['after_mb'])
+                alloc_time += event['uptime'] - previous['uptime']
+            if event['kind'] in ('Young', 'Mixed') and event['old_before_mb'] is not None:
+                promoted += max(0.0, event['old_after_mb'] - event['old_before_mb'])
+            if event['kind'] in ('Young', 'Mixed', 'Full'):
+                heap_points.append(((event['epoch'] or event['uptime']) / 3600.0, event['after_mb']))
+            previous = event
+
+    pause_total = sum(pauses) / 1000.0
+    after = [event['after_mb'] for event in events if event['after_mb'] is not None]
+    slope = trend(heap_points)
+
+    def rounded(value, digits=1):
+        return None if value is None else round(value, digits)
+
+    return {
+        'pauses': len(pauses),
+        'kinds': kinds,
+        'full_gcs': kinds.get('Full', 0),
+        'p50_ms': rounded(percentile(pauses, 0.50)),
+        'p95_ms': rounded(percentile(pauses, 0.95)),
+        'p99_ms': rounded(percentile(pauses, 0.99)),
+        'max_ms': rounded(pauses[-1] if pauses else None),
+        'pause_total_s': round(pause_total, 2),
+        'elapsed_s': round(elapsed, 1),
+        'throughput_pct': rounded(100.0 * (1 - pause_total / elapsed), 2) if elapsed > 0 else None,
+        'allocation_mb_s': rounded(allocated / alloc_time, 2) if alloc_time > 0 else None,
+        'promotion_mb_s': rounded(promoted / elapsed, 3) if elapsed > 0 else None,
+        'heap_after_last_mb': rounded(after[-1] if after else None),
+        'heap_after_max_mb': rounded(max(after) if after else None),
+        'heap_capacity_mb': rounded(events[-1]['capacity_mb'] if events else None),
+        'heap_trend_mb_h': rounded(slope)
+    }
+
+
+def window(events, since_seconds):
+    if not since_seconds:
+        return events
+    cutoff = time.time() - since_seconds
+    return [event for event in events if event['epoch'] is None or event['epoch'] >= cutoff]
+
+
+def parse_duration(value):
+    """'90s', '30m', '6h', '2d' -> seconds"""
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    if value[-1] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
+
+
+def format_value(value, pattern='%.1f'):
+    return '-' if value is None else pattern % value
+
+
+def print_report(results, read_bytes):
+    print('')
+    print('=' * 118)
+    print('GC Log Analysis - %s (%.1f MB read this run)' % (time.strftime('%Y-%m-%d %H:%M:%S'),
+                                                           read_bytes / 1048576.0))
+    print('=' * 118)
+    print('  %-14s %7s %7s %7s %7s %8s %5s %8s %10s %10s %16s %8s'
+          % ('Server', 'Pauses', 'p50 ms', 'p95 ms', 'p99 ms', 'max ms', 'Full', 'GC thr%',
+             'Alloc MB/s', 'Promo MB/s', 'Heap after MB', 'MB/hour'))
+    print('  ' + '-' * 116)
+    warnings = []
+    for server in sorted(results.keys()):
+        stats = results[server]
+        heap = '%s / %s' % (format_value(stats['heap_after_last_mb'], '%.0f'),
+                            format_value(stats['heap_capacity_mb'], '%.0f'))
+        print('  %-14s %7d %7s %7s %7s %8s %5d %8s %10s %10s %16s %8s'
+              % (server[:14], stats['pauses'], format_value(stats['p50_ms']),
+                 format_value(stats['p95_ms']), format_value(stats['p99_ms']),
+                 format_value(stats['max_ms']), stats['full_gcs'],
+                 format_value(stats['throughput_pct'], '%.2f'),
+                 format_value(stats['allocation_mb_s']), format_value(stats['promotion_mb_s'], '%.2f'),
+                 heap, format_value(stats['heap_trend_mb_h'], '%+.0f')))
+        if stats['full_gcs']:
+            warnings.append('%s: %d Full GC(s)' % (server, stats['full_gcs']))
+        if stats['max_ms'] is not None and stats['max_ms'] >= LONG_PAUSE_MS:
+            warnings.append('%s: longest pause %.0f ms' % (server, stats['max_ms']))
+        if stats['throughput_pct'] is not None and stats['throughput_pct'] < MIN_THROUGHPUT:
+            warnings.append('%s: GC throughput %.2f%% is below %.0f%%'
+                            % (server, stats['throughput_pct'], MIN_THROUGHPUT))
+        if stats['heap_trend_mb_h'] is not None and stats['heap_trend_mb_h'] > TREND_WARN_MB_PER_HOUR:
+            warnings.append('%s: heap after GC rising %.0f MB/hour - possible leak or growing live set'
+                            % (server, stats['heap_trend_mb_h']))
+    if warnings:
+        print('')
+        print('Attention:')
+        for warning in warnings:
+            print('  ' + warning)
+    print('')
+
+
+def follow(state, domain_home, state_file, servers_filter):
+    """Print each new pause as it is logged until interrupted"""
+    print('Following GC logs under %s (Ctrl-C to stop)...' % domain_home)
+    try:
+        while True:
+            logs, read_bytes = update(state, domain_home, servers_filter)
+            for server, log in sorted(logs.items()):
+                for event in log.new_events:
+                    marker = '  <-- long pause' if event['pause_ms'] >= LONG_PAUSE_MS else ''
+                    stamp = time.strftime('%H:%M:%S', time.localtime(event['epoch'])) \
+                        if event['epoch'] else '%.1fs' % (event['uptime'] or 0)
+                    heap = ''
+                    if event['after_mb'] is not None:
+                        heap = ' %.0fM->%.0fM(%.0fM)' % (event['before_mb'], event['after_mb'],
+                                                          event['capacity_mb'])
+                    print('%s %-14s %-14s %9.1f ms%s%s' % (stamp, server, event['kind'],
+                                                           event['pause_ms'], heap, marker))
+            if state_file:
+                save_state(state_file, state)
+            time.sleep(FOLLOW_INTERVAL)
+    except KeyboardInterrupt:
+        print('')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Analyze WebLogic managed server GC logs')
+    parser.add_argument('--domain-home', default=DOMAIN_HOME)
+    parser.add_argument('--state', default=STATE_FILE, help='offset/history file (default %(default)s)')
+    parser.add_argument('--no-state', action='store_true', help='read everything, save nothing')
+    parser.add_argument('--reset', action='store_true', help='forget saved offsets and history')
+    parser.add_argument('--server', action='append', help='only this server (repeatable)')
+    parser.add_argument('--since', help='only report events from the last 30m, 6h, 2d...')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    parser.add_argument('--follow', action='store_true', help='print pauses as they are logged')
+    options = parser.parse_args()
+
+    state_file = None if options.no_state else options.state
+    state = load_state(state_file) if state_file and not options.reset else load_state('')
+
+    if options.follow:
+        # Catch up silently first so only new pauses are printed
+        update(state, options.domain_home, options.server)
+        follow(state, options.domain_home, state_file, options.server)
+
+    logs, read_bytes = update(state, options.domain_home, options.server)
+    if state_file:
+        try:
+            save_state(state_file, state)
+        except OSError as e:
+            print('WARNING: cannot save state to %s: %s' % (state_file, e), file=sys.stderr)
+
+    if not logs:
+        print('No GC logs found under %s/%s' % (options.domain_home, LOG_GLOB))
+        print('Enable them with configure_server_args.sh --gc-log and restart the servers.')
+        return 1
+
+    since = parse_duration(options.since) if options.since else None
+    results = dict((server, analyze(window(log.events, since))) for server, log in logs.items())
+
+    if options.json:
+        print(json.dumps({'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                          'bytes_read': read_bytes, 'servers': results}, indent=2, sort_keys=True))
+    else:
+        print_report(results, read_bytes)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,446 @@
+#!/usr/bin/env python
+# =============================================================================
+# jvm_profiles.py
+# Host-aware JVM heap and GC sizing for the P6 EPPM managed servers
+#
+# Sizes all managed servers on a host together, so the four JVMs
+# (p6web, p6ws, p6tm, p6cc) fit the host's memory with room for the OS,
+# Node Manager and, on the admin host, the Admin Server.
+#
+# Per-role rules (ROLES) give each component a heap weight, heap limits, a
+# preferred garbage collector, an estimated thread count and stack size, and
+# a metaspace limit. Per-host facts (HOSTS) give memory and cores. For every
+# host the engine:
+#   1. subtracts the reserve and each JVM's non-heap footprint (metaspace,
+#      code cache, thread stacks, native overhead) from physical memory
+#   2. shares the rest between the heaps by weight, within each role's
+#      min/max, allowing for the collector's own overhead
+#   3. picks the collector: Parallel for small heaps or when the JVM's share
+#      of the cores is too small for concurrent marking, the role's
+#      preference otherwise; ZGC only when ALLOW_ZGC is set (experimental
+#      on JDK 11) and the heap is large
+#   4. splits the cores between the JVMs for GC worker threads
+# A host whose JVMs cannot all get their minimum heap is rejected with
+# ProfileError rather than overcommitted.
+#
+# Used by configure_server_args.py, which replaces the heap and GC options
+# in SERVER_ARGUMENTS with the computed ones and keeps everything else.
+# Works under both WLST (Jython 2.7) and python3. Preview from the shell:
+#   python3 jvm_profiles.py                       # every host
+#   python3 jvm_profiles.py --host prmapp02 --memory 24576 --cores 4
+#   python3 jvm_profiles.py --detect              # this host's memory/cores
+#
+# Zero to Enterprise: P6 EPPM 25.12 with SSO - Part 5
+# Integration Faces - https://integrationfaces.com
+# =============================================================================
+
+from __future__ import print_function
+
+import os
+import sys
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+ADMIN_HOST = 'prmapp01'
+
+# Physical memory (MB) and cores of each application host
+HOSTS = {
+    'prmapp01': {'memory_mb': 32768, 'cores': 8},
+    'prmapp02': {'memory_mb': 32768, 'cores': 8},
+}
+
+# Managed servers per host, used when config.xml (domain_topology) is not
+# available
+HOST_SERVERS = {
+    'prmapp01': ['p6web_ms1', 'p6tm_ms1', 'p6ws_ms1', 'p6cc_ms1'],
+    'prmapp02': ['p6web_ms2', 'p6tm_ms2', 'p6ws_ms2', 'p6cc_ms2'],
+}
+
+RESERVED_MB = 2048            # OS, page cache floor, Node Manager, agents
+ADMIN_SERVER_MB = 2048        # Admin Server JVM on ADMIN_HOST
+OTHER_SERVER_MB = 2048        # any other managed server on the host (no role)
+
+CODE_CACHE_MB = 256           # -XX:ReservedCodeCacheSize
+NATIVE_OVERHEAD_MB = 256      # direct buffers, JIT, class data, malloc arenas
+HEAP_ROUND_MB = 128
+
+# Heap and young generation limits for the collectors
+G1_MIN_HEAP_MB = 2048         # below this Parallel is used instead of G1
+G1_MIN_CORE_SHARE = 1.0       # cores per JVM G1/ZGC need for concurrent marking
+ZGC_MIN_HEAP_MB = 16384
+ALLOW_ZGC = False             # ZGC is experimental on JDK 11
+
+# Extra native memory each collector needs, as a fraction of the heap
+GC_OVERHEAD = {'Parallel': 0.03, 'G1': 0.10, 'ZGC': 0.15}
+
+# Component rules, selected by the server name prefix
+ROLES = {
+    'web': {'prefix': 'p6web_', 'weight': 4.0, 'min_heap_mb': 2048, 'max_heap_mb': 16384,
+            'gc': 'G1', 'max_pause_ms': 200, 'young_percent': 33,
+            'threads': 400, 'stack_kb': 1024, 'metaspace_mb': 512},
+    'ws': {'prefix': 'p6ws_', 'weight': 2.0, 'min_heap_mb': 1024, 'max_heap_mb': 8192,
+           'gc': 'Parallel', 'max_pause_ms': 500, 'young_percent': 33,
+           'threads': 200, 'stack_kb': 1024, 'metaspace_mb': 384},
+    'tm': {'prefix': 'p6tm_', 'weight': 1.5, 'min_heap_mb': 1024, 'max_heap_mb': 4096,
+           'gc': 'G1', 'max_pause_ms': 200, 'young_percent': 33,
+           'threads': 200, 'stack_kb': 512, 'metaspace_mb': 256},
+    'cc': {'prefix': 'p6cc_', 'weight': 1.0, 'min_heap_mb': 512, 'max_heap_mb': 2048,
+           'gc': 'Parallel', 'max_pause_ms': 500, 'young_percent': 25,
+           'threads': 100, 'stack_kb': 512, 'metaspace_mb': 256},
+}
+
+# Fixed settings for individual servers, e.g. {'p6web_ms1': {'heap_mb': 8192, 'gc': 'G1'}}
+OVERRIDES = {}
+
+# Options owned by this module; they are removed from the static arguments
+MANAGED_XX_OPTIONS = (
+    'UseParallelGC', 'UseParallelOldGC', 'UseG1GC', 'UseZGC', 'UseConcMarkSweepGC',
+    'UnlockExperimentalVMOptions', 'GCTimeRatio', 'NewSize', 'MaxNewSize', 'NewRatio',
+    'SurvivorRatio', 'MaxGCPauseMillis', 'ParallelGCThreads', 'ConcGCThreads',
+    'MetaspaceSize', 'MaxMetaspaceSize', 'ReservedCodeCacheSize'
+)
+MANAGED_X_PREFIXES = ('-Xms', '-Xmx', '-Xmn', '-Xss')
+
+
+class ProfileError(Exception):
+    """The requested servers do not fit the host"""
+    pass
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+def server_role(server_name):
+    for role, rules in ROLES.items():
+        if server_name.startswith(rules['prefix']):
+            return role
+    return None
+
+
+def load_host_servers():
+    """Host -> managed servers from config.xml if readable, else HOST_SERVERS"""
+    try:
+        import domain_topology
+        hosts = domain_topology.load_topology()['hosts']
+        if hosts:
+            return hosts, 'config.xml'
+    except Exception:
+        pass
+    return HOST_SERVERS, 'built-in host map'
+
+
+def non_heap_mb(rules, override):
+    """Memory a JVM uses outside the heap (before GC overhead)"""
+    metaspace = override.get('metaspace_mb', rules['metaspace_mb'])
+    stacks = rules['threads'] * override.get('stack_kb', rules['stack_kb']) // 1024
+    return metaspace + CODE_CACHE_MB + stacks + NATIVE_OVERHEAD_MB
+
+
+def round_down(value, step):
+    return int(value) // step * step
+
+
+def choose_gc(rules, override, heap_mb, core_share):
+    if 'gc' in override:
+        return override['gc']
+    gc = rules['gc']
+    if gc != 'Parallel' and (heap_mb < G1_MIN_HEAP_MB or core_share < G1_MIN_CORE_SHARE):
+        return 'Parallel'
+    if gc == 'G1' and ALLOW_ZGC and heap_mb >= ZGC_MIN_HEAP_MB:
+        return 'ZGC'
+    return gc
+
+
+def share_heaps(jvms, available_mb):
+    """Split available_mb between the heaps by weight within min/max
+
+    Each JVM costs heap * (1 + GC overhead). JVMs whose share falls below
+    their minimum, or reaches their maximum, are fixed there and the rest is
+    shared again among the others. The result can exceed available_mb only
+    when the minimums alone do not fit.
+    """
+    heaps = {}
+    for jvm in jvms:
+        if 'heap_mb' in jvm['override']:
+            heaps[jvm['server']] = jvm['override']['heap_mb']
+
+    while True:
+        free = [jvm for jvm in jvms if jvm['server'] not in heaps]
+        if not free:
+            break
+        fixed_cost = sum([heaps[jvm['server']] * jvm['factor'] for jvm in jvms if jvm['server'] in heaps])
+        scale = (available_mb - fixed_cost) / sum([jvm['weight'] * jvm['factor'] for jvm in free])
+        floored = [jvm for jvm in free if jvm['weight'] * scale < jvm['min_heap_mb']]
+        capped = [jvm for jvm in free if jvm['weight'] * scale >= jvm['max_heap_mb']]
+        if floored:
+            for jvm in floored:
+                heaps[jvm['server']] = jvm['min_heap_mb']
+        elif capped:
+            for jvm in capped:
+                heaps[jvm['server']] = jvm['max_heap_mb']
+        else:
+            for jvm in free:
+                heaps[jvm['server']] = round_down(jvm['weight'] * scale, HEAP_ROUND_MB)
+            break
+    return heaps
+
+
+def plan_host(host, servers, spec, overrides=None):
+    """Size every server on one host; raises ProfileError if they do not fit"""
+    overrides = overrides or OVERRIDES
+    reserve = RESERVED_MB + (ADMIN_SERVER_MB if host == ADMIN_HOST else 0)
+
+    jvms = []
+    others = []
+    for server in servers:
+        role = server_role(server)
+        if role is None:
+            others.append(server)
+            continue
+        rules = ROLES[role]
+        override = overrides.get(server, {})
+        jvms.append({'server': server, 'role': role, 'rules': rules, 'override': override,
+                     'weight': rules['weight'], 'min_heap_mb': rules['min_heap_mb'],
+                     'max_heap_mb': rules['max_heap_mb'],
+                     'non_heap_mb': non_heap_mb(rules, override),
+                     'factor': 1.0 + GC_OVERHEAD[override.get('gc', rules['gc'])]})
+    reserve += OTHER_SERVER_MB * len(others)
+
+    budget = spec['memory_mb'] - reserve
+    available = budget - sum([jvm['non_heap_mb'] for jvm in jvms])
+    if not jvms:
+        return {'host': host, 'memory_mb': spec['memory_mb'], 'cores': spec['cores'],
+                'reserved_mb': reserve, 'budget_mb': budget, 'committed_mb': 0,
+                'servers': [], 'others': others}
+    if available <= 0:
+        raise ProfileError('%s: %d MB is not enough for %d JVMs (reserve %d MB, '
+                           'non-heap %d MB)' % (host, spec['memory_mb'], len(jvms), reserve,
+                                               budget - available))
+
+    total_weight = sum([jvm['weight'] for jvm in jvms])
+    heaps = share_heaps(jvms, available)
+    # The collector depends on the heap size, and the heaps on the collector
+    # overhead. Share again with the larger overhead until no chosen collector
+    # needs more than its heap was sized for. Overheads only grow, so this ends.
+    while True:
+        gcs = {}
+        grown = []
+        for jvm in jvms:
+            core_share = spec['cores'] * jvm['weight'] / total_weight
+            gc = choose_gc(jvm['rules'], jvm['override'], heaps[jvm['server']], core_share)
+            gcs[jvm['server']] = gc
+            if 1.0 + GC_OVERHEAD[gc] > jvm['factor']:
+                jvm['factor'] = 1.0 + GC_OVERHEAD[gc]
+                grown.append(jvm)
+        if not grown:
+            break
+        heaps = share_heaps(jvms, available)
+    needed = sum([heaps[jvm['server']] * jvm['factor'] for jvm in jvms])
+    if needed > available:
+        raise ProfileError('%s: the minimum heaps need %d MB but only %d MB is left after the '
+                           '%d MB reserve and non-heap memory; add memory or move a server to '
+                           'another host' % (host, needed, available, reserve))
+
+    profiles = []
+    for jvm in jvms:
+        rules = jvm['rules']
+        override = jvm['override']
+        heap = heaps[jvm['server']]
+
+        core_share = spec['cores'] * jvm['weight'] / total_weight
+        gc = gcs[jvm['server']]
+        if spec['cores'] >= 2:
+            gc_threads = max(2, min(spec['cores'], int(round(core_share))))
+        else:
+            gc_threads = 1
+        stack_kb = override.get('stack_kb', rules['stack_kb'])
+        metaspace = override.get('metaspace_mb', rules['metaspace_mb'])
+        young = None
+        if gc == 'Parallel':
+            young = round_down(heap * rules['young_percent'] // 100, 64)
+
+        profiles.append({
+            'server': jvm['server'], 'role': jvm['role'], 'host': host,
+            'heap_mb': heap, 'young_mb': young, 'gc': gc,
+            'gc_threads': gc_threads, 'conc_gc_threads': max(1, gc_threads // 4),
+            'max_pause_ms': rules['max_pause_ms'], 'stack_kb': stack_kb,
+            'metaspace_mb': metaspace,
+            'footprint_mb': int(heap * (1 + GC_OVERHEAD[gc]) + jvm['non_heap_mb'])
+        })
+
+    committed = sum([profile['footprint_mb'] for profile in profiles])
+    if committed > budget:
+        raise ProfileError('%s: JVMs need %d MB but only %d MB is available after the '
+                           '%d MB reserve' % (host, committed, budget, reserve))
+    return {'host': host, 'memory_mb': spec['memory_mb'], 'cores': spec['cores'],
+            'reserved_mb': reserve, 'budget_mb': budget, 'committed_mb': committed,
+            'servers': profiles, 'others': others}
+
+
+def plan_all(host_servers=None, hosts=None, overrides=None):
+    """Plans for every host that runs managed servers"""
+    if host_servers is None:
+        host_servers, source = load_host_servers()
+    hosts = hosts or HOSTS
+    plans = []
+    for host in sorted(host_servers.keys()):
+        if host not in hosts:
+            raise ProfileError('%s: memory and cores unknown - add it to HOSTS in jvm_profiles.py' % host)
+        plans.append(plan_host(host, host_servers[host], hosts[host], overrides))
+    return plans
+
+
+def jvm_options(profile):
+    """Heap, GC, stack and metaspace options for one server"""
+    options = ['-Xms%dm' % profile['heap_mb'], '-Xmx%dm' % profile['heap_mb']]
+    gc = profile['gc']
+    if gc == 'Parallel':
+        options += ['-XX:+UseParallelGC', '-XX:GCTimeRatio=19',
+                    '-Xmn%dm' % profile['young_mb'], '-XX:SurvivorRatio=8',
+                    '-XX:ParallelGCThreads=%d' % profile['gc_threads']]
+    elif gc == 'G1':
+        options += ['-XX:+UseG1GC', '-XX:MaxGCPauseMillis=%d' % profile['max_pause_ms'],
+                    '-XX:ParallelGCThreads=%d' % profile['gc_threads'],
+                    '-XX:ConcGCThreads=%d' % profile['conc_gc_threads']]
+    elif gc == 'ZGC':
+        options += ['-XX:+UnlockExperimentalVMOptions', '-XX:+UseZGC',
+                    '-XX:ParallelGCThreads=%d' % profile['gc_threads'],
+                    '-XX:ConcGCThreads=%d' % profile['conc_gc_threads']]
+    else:
+        raise ProfileError('%s: unknown collector %s' % (profile['server'], gc))
+    options += ['-Xss%dk' % profile['stack_kb'],
+                '-XX:MetaspaceSize=%dm' % (profile['metaspace_mb'] // 2),
+                '-XX:MaxMetaspaceSize=%dm' % profile['metaspace_mb'],
+                '-XX:ReservedCodeCacheSize=%dm' % CODE_CACHE_MB]
+    return options
+
+
+def is_managed_option(token):
+    if token.startswith(MANAGED_X_PREFIXES):
+        return True
+    if token.startswith('-XX:'):
+        name = token[4:].lstrip('+-').split('=')[0]
+        return name in MANAGED_XX_OPTIONS
+    return False
+
+
+def merge_arguments(arguments, profile):
+    """Static arguments without their heap/GC options, plus the computed ones"""
+    kept = [token for token in arguments.split() if not is_managed_option(token)]
+    return ' '.join(kept + jvm_options(profile))
+
+
+def apply_profiles(server_arguments, host_servers=None, hosts=None, overrides=None):
+    """Return (server_arguments with computed JVM options, plans)
+
+    server_arguments is the (server_name, arguments) list from
+    configure_server_args.py; servers without a role keep their arguments.
+    """
+    plans = plan_all(host_servers, hosts, overrides)
+    profiles = {}
+    for plan in plans:
+        for profile in plan['servers']:
+            profiles[profile['server']] = profile
+
+    result = []
+    for server_name, arguments in server_arguments:
+        if server_name in profiles:
+            result.append((server_name, merge_arguments(arguments, profiles[server_name])))
+        elif server_role(server_name) is not None:
+            raise ProfileError('%s: not found on any host - check HOST_SERVERS' % server_name)
+        else:
+            result.append((server_name, arguments))
+    return result, plans
+
+
+def print_plans(plans):
+    for plan in plans:
+        print('')
+        print('%s: %d MB, %d cores, %d MB reserved, %d of %d MB committed to JVMs'
+              % (plan['host'], plan['memory_mb'], plan['cores'], plan['reserved_mb'],
+                 plan['committed_mb'], plan['budget_mb']))
+        print('  %-12s %-5s %8s %8s %-9s %8s %6s %9s %10s'
+              % ('Server', 'Role', 'Heap', 'Young', 'GC', 'Threads', 'Stack', 'Metaspace', 'Footprint'))
+        for profile in plan['servers']:
+            young = '-' if profile['young_mb'] is None else '%dm' % profile['young_mb']
+            print('  %-12s %-5s %7dm %8s %-9s %8d %5dk %8dm %9dm'
+                  % (profile['server'], profile['role'], profile['heap_mb'], young, profile['gc'],
+                     profile['gc_threads'], profile['stack_kb'], profile['metaspace_mb'],
+                     profile['footprint_mb']))
+        for server in plan['others']:
+            print('  %-12s (no role, %d MB reserved)' % (server, OTHER_SERVER_MB))
+
+
+def detect_local():
+    """Memory (MB) and core count of the host this runs on"""
+    memory_mb = None
+    meminfo = open('/proc/meminfo')
+    try:
+        for line in meminfo:
+            if line.startswith('MemTotal:'):
+                memory_mb = int(line.split()[1]) // 1024
+                break
+    finally:
+        meminfo.close()
+    try:
+        cores = os.cpu_count()
+    except AttributeError:
+        try:
+            from java.lang import Runtime
+            cores = Runtime.getRuntime().availableProcessors()
+        except ImportError:
+            import multiprocessing
+            cores = multiprocessing.cpu_count()
+    return {'memory_mb': memory_mb, 'cores': cores}
+
+
+def main(argv):
+    hosts = dict(HOSTS)
+    host = None
+    memory_mb = None
+    cores = None
+    detect = False
+
+    args = list(argv)
+    while args:
+        arg = args.pop(0)
+        if arg == '--host':
+            host = args.pop(0)
+        elif arg == '--memory':
+            memory_mb = int(args.pop(0))
+        elif arg == '--cores':
+            cores = int(args.pop(0))
+        elif arg == '--detect':
+            detect = True
+        else:
+            print('Usage: jvm_profiles.py [--host H] [--memory MB] [--cores N] [--detect]')
+            return 2
+
+    host_servers, source = load_host_servers()
+    if detect:
+        import socket
+        host = host or socket.gethostname().split('.')[0]
+        hosts[host] = detect_local()
+    if host:
+        spec = dict(hosts.get(host, {}))
+        if memory_mb:
+            spec['memory_mb'] = memory_mb
+        if cores:
+            spec['cores'] = cores
+        hosts[host] = spec
+        host_servers = {host: host_servers.get(host, [])}
+
+    print('Servers per host from ' + source)
+    try:
+        print_plans(plan_all(host_servers, hosts))
+    except (ProfileError, KeyError) as e:
+        print('ERROR: ' + str(e))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+# =============================================================================
+# percentiles.py
+# Nearest-rank percentiles shared by the Part 5 measurement tools
+#
+# The p-th percentile of n sorted values is the value at rank ceil(p * n),
+# so p50 of 10 values is the 5th and p99 of 100 values is the 99th.
+# Used by benchmark_endpoints.py (request latency) and gc_log_analyzer.py
+# (GC pauses), so both report percentiles the same way.
+#
+# Zero to Enterprise: P6 EPPM 25.12 with SSO - Part 5
+# Integration Faces - https://integrationfaces.com
+# =============================================================================
+
+import math
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list (None when empty)"""
+    if not sorted_values:
+        return None
+    index = max(0, int(math.ceil(fraction * len(sorted_values))) - 1)
+    return sorted_values[index]
@@ -0,0 +1,24 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import benchmark_endpoints  # noqa: E402
+
+
+def test_percentile_of_ten_values_is_the_nearest_rank():
+    values = list(range(1, 11))
+    assert benchmark_endpoints.percentile(values, 0.50) == 5
+    assert benchmark_endpoints.percentile(values, 0.95) == 10
+    assert benchmark_endpoints.percentile(values, 0.99) == 10
+
+
+def test_percentile_of_a_hundred_values_is_the_nearest_rank():
+    values = list(range(1, 101))
+    assert benchmark_endpoints.percentile(values, 0.50) == 50
+    assert benchmark_endpoints.percentile(values, 0.95) == 95
+    assert benchmark_endpoints.percentile(values, 0.99) == 99
+
+
+def test_percentile_of_no_values_is_none():
+    assert benchmark_endpoints.percentile([], 0.50) is None
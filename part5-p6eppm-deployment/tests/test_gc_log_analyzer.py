@@ -0,0 +1,42 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gc_log_analyzer  # noqa: E402
+
+
+def pause_events(pauses):
+    return [{'epoch': None, 'uptime': float(number), 'gc_id': number, 'kind': 'Young',
+             'pause_ms': float(pause), 'before_mb': None, 'after_mb': None,
+             'capacity_mb': None, 'old_before_mb': None, 'old_after_mb': None}
+            for number, pause in enumerate(pauses)]
+
+
+def test_pause_percentiles_use_the_nearest_rank():
+    result = gc_log_analyzer.analyze(pause_events(range(10, 0, -1)))
+    assert result['p50_ms'] == 5
+    assert result['p95_ms'] == 10
+    assert result['p99_ms'] == 10
+
+    result = gc_log_analyzer.analyze(pause_events(range(1, 101)))
+    assert result['p50_ms'] == 50
+    assert result['p95_ms'] == 95
+    assert result['p99_ms'] == 99
+    assert result['max_ms'] == 100
+
+
+def heap_events(seconds, count, start_mb=500.0):
+    events = pause_events([5] * count)
+    for number, event in enumerate(events):
+        event['uptime'] = seconds * number / (count - 1.0)
+        event['after_mb'] = start_mb + number
+        event['before_mb'] = event['after_mb'] + 100
+    return events
+
+
+def test_heap_trend_needs_a_minimum_span():
+    assert gc_log_analyzer.analyze(heap_events(30, 30))['heap_trend_mb_h'] is None
+
+    result = gc_log_analyzer.analyze(heap_events(2 * 3600, 30))
+    assert result['heap_trend_mb_h'] == 14.5
@@ -0,0 +1,49 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jvm_profiles  # noqa: E402
+
+
+def test_small_host_pins_heaps_at_their_minimum():
+    # 12000 MB leaves room for every minimum heap, but not for a plain
+    # weighted share: p6tm_ms2 alone would get 896 MB
+    servers = jvm_profiles.HOST_SERVERS['prmapp02']
+    plan = jvm_profiles.plan_host('prmapp02', servers, {'memory_mb': 12000, 'cores': 2}, {})
+
+    heaps = dict((profile['server'], profile['heap_mb']) for profile in plan['servers'])
+    for server in servers:
+        rules = jvm_profiles.ROLES[jvm_profiles.server_role(server)]
+        assert rules['min_heap_mb'] <= heaps[server] <= rules['max_heap_mb']
+    assert heaps['p6tm_ms2'] == 1024
+    assert plan['committed_mb'] <= plan['budget_mb']
+
+
+def test_host_without_room_for_the_minimums_is_rejected():
+    servers = jvm_profiles.HOST_SERVERS['prmapp02']
+    with pytest.raises(jvm_profiles.ProfileError) as error:
+        jvm_profiles.plan_host('prmapp02', servers, {'memory_mb': 8000, 'cores': 2}, {})
+    assert 'minimum heaps need' in str(error.value)
+
+
+def test_large_host_caps_heaps_at_their_maximum():
+    servers = jvm_profiles.HOST_SERVERS['prmapp02']
+    plan = jvm_profiles.plan_host('prmapp02', servers, {'memory_mb': 65536, 'cores': 16}, {})
+
+    heaps = dict((profile['server'], profile['heap_mb']) for profile in plan['servers'])
+    assert heaps['p6tm_ms2'] == jvm_profiles.ROLES['tm']['max_heap_mb']
+    assert heaps['p6cc_ms2'] == jvm_profiles.ROLES['cc']['max_heap_mb']
+    assert plan['committed_mb'] <= plan['budget_mb']
+
+
+def test_heaps_are_sized_for_the_collector_chosen(monkeypatch):
+    # Sized with G1's overhead p6web_ms2 reaches 16384 MB, which selects ZGC;
+    # with ZGC's larger overhead that heap would exceed the budget
+    monkeypatch.setattr(jvm_profiles, 'ALLOW_ZGC', True)
+    servers = jvm_profiles.HOST_SERVERS['prmapp02']
+    plan = jvm_profiles.plan_host('prmapp02', servers, {'memory_mb': 39500, 'cores': 8}, {})
+
+    assert plan['committed_mb'] <= plan['budget_mb']
@@ -11,8 +11,7 @@ SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
 ORACLE_HOME="/u01/app/weblogic"
 DOMAIN_HOME="/u01/app/weblogic/user_projects/domains/eppm_domain"
 
-# Set environment
-source "${DOMAIN_HOME}/bin/setDomainEnv.sh"
+AGENT_CLIENT="/u01/app/eppm/scripts/wlst-client.py"
 
 echo ""
 echo "============================================================"
@@ -21,6 +20,21 @@ echo "Integration Faces - Zero to Enterprise Series"
 echo "============================================================"
 echo ""
 
+# Use the WLST agent (Part 4) when it is running - no JVM startup or connect.
+# Exit code 3 means the agent is not available.
+if [[ -f "${AGENT_CLIENT}" ]] && python3 "${AGENT_CLIENT}" ping > /dev/null 2>&1; then
+    for app_name in p6 p6tm p6ws p6procloudconnect; do
+        echo "Undeploying: ${app_name}"
+        python3 "${AGENT_CLIENT}" undeploy "${app_name}" || echo "  SKIPPED: ${app_name} (may not be deployed)"
+        echo ""
+    done
+    echo "Undeploy script completed."
+    exit 0
+fi
+
+# Set environment
+source "${DOMAIN_HOME}/bin/setDomainEnv.sh"
+
 # Run WLST script
 java weblogic.WLST "${SCRIPT_DIR}/undeploy_all_apps.py"
 
@@ -3,6 +3,14 @@
 # verify-deployment.sh
 # Verify P6 EPPM 25.12 Application Deployment Health
 #
+# Runs check_endpoints.py (concurrent checks with an overall deadline,
+# retries and latency) when python3 is available, and falls back to the
+# sequential curl checks below otherwise. Options such as --json and
+# --deadline are passed through to check_endpoints.py.
+#
+# Usage:
+#   ./verify-deployment.sh [--json] [--deadline SECONDS] [--retries N]
+#
 # Zero to Enterprise: P6 EPPM 25.12 with SSO - Part 5
 # Integration Faces - https://integrationfaces.com
 # =============================================================================
@@ -17,6 +25,13 @@ P6TM_PORT=7030
 P6WS_PORT=7020
 P6CC_PORT=7040
 
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+
+# Concurrent checker (all endpoints at once, bounded by a deadline)
+if command -v python3 > /dev/null 2>&1 && [ -f "${SCRIPT_DIR}/check_endpoints.py" ]; then
+    exec python3 "${SCRIPT_DIR}/check_endpoints.py" --hosts "${PRMAPP01},${PRMAPP02}" --admin-host "${PRMAPP01}" "$@"
+fi
+
 # Colors
 RED='\033[0;31m'
 GREEN='\033[0;32m'
@@ -134,7 +149,7 @@ else
     echo ""
     echo "Troubleshooting steps:"
     echo "  1. Verify managed servers are running in WebLogic Console"
-    echo "  2. Check server logs: \$DOMAIN_HOME/servers/<server>/logs/"
+    echo "  2. Check server logs: /u01/app/eppm/scripts/log_index.py query --last 30m --severity Error"
     echo "  3. Verify bootstrap configuration in each application directory"
     echo "  4. Confirm database connectivity from application hosts"
     EXIT_CODE=1